@@ -0,0 +1,77 @@
+"""Synthetic OpenAPI specs used by benchmarks."""
+
+
+def make_oas2(operations=5000):
+    """Generate an OAS 2 spec with a given number of operations."""
+
+    paths = {}
+    methods = ["get", "post", "put", "delete", "patch"]
+
+    for i in range(operations):
+        path = paths.setdefault(
+            "/resources%d/{id}" % (i // len(methods)),
+            {
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "type": "string"}
+                ]
+            },
+        )
+        path[methods[i % len(methods)]] = {
+            "tags": ["tag%d" % (i % 10)],
+            "summary": "Operation #%d" % i,
+            "description": "A description of the operation #%d." % i,
+            "operationId": "operation%d" % i,
+            "produces": ["application/json"],
+            "parameters": [
+                {"name": "limit", "in": "query", "type": "integer", "format": "int32"},
+                {
+                    "name": "tags",
+                    "in": "query",
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "collectionFormat": "csv",
+                },
+                {"name": "X-Token", "in": "header", "type": "string"},
+                {
+                    "name": "body",
+                    "in": "body",
+                    "schema": {"$ref": "#/definitions/Resource"},
+                },
+            ],
+            "responses": {
+                "200": {
+                    "description": "A resource.",
+                    "schema": {"$ref": "#/definitions/Resource"},
+                    "headers": {"ETag": {"type": "string", "description": "An ETag."}},
+                },
+                "404": {"description": "Not found."},
+            },
+        }
+
+    return {
+        "swagger": "2.0",
+        "info": {"title": "Synthetic API", "version": "1.0"},
+        "host": "example.com",
+        "basePath": "/v1",
+        "schemes": ["https"],
+        "paths": paths,
+        "definitions": {
+            "Resource": {
+                "type": "object",
+                "required": ["id"],
+                "properties": {
+                    "id": {"type": "string", "description": "An identifier."},
+                    "name": {"type": "string", "description": "A name."},
+                    "created": {"type": "string", "format": "date-time"},
+                    "labels": {"type": "array", "items": {"type": "string"}},
+                    "owner": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer", "format": "int64"},
+                            "email": {"type": "string", "format": "email"},
+                        },
+                    },
+                },
+            },
+        },
+    }
@@ -0,0 +1,78 @@
+"""Measure rendering of huge schemas with and without budgets.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_budget.py
+"""
+
+import argparse
+import copy
+import time
+
+from sphinxcontrib.openapi import renderers, utils
+
+
+def make_spec(properties):
+    enum = list(range(5000))
+    schema = {
+        "type": "object",
+        "properties": {
+            f"property{i}": {
+                "type": "object",
+                "properties": {
+                    "values": {
+                        "type": "array",
+                        "minItems": 50,
+                        "items": {"type": "string", "enum": enum},
+                    },
+                },
+            }
+            for i in range(properties)
+        },
+    }
+    content = {"application/json": {"schema": schema}}
+
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Huge schemas", "version": "1.0"},
+        "paths": {
+            "/resources": {
+                "post": {
+                    "requestBody": {"content": content},
+                    "responses": {"200": {"description": "OK", "content": content}},
+                },
+            },
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-p", "--properties", type=int, default=2000)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = make_spec(args.properties)
+    utils.normalize_spec(spec)
+    options = {"markup": "restructuredtext", "generate-examples-from-schemas": True}
+    budgets = {
+        "unlimited": {},
+        "budget": {"max-properties": 50, "max-items": 3, "max-example-bytes": 4096},
+    }
+
+    for name, budget in budgets.items():
+        renderer = renderers.HttpdomainRenderer(None, dict(options, **budget))
+        best = float("Inf")
+
+        for _ in range(args.repeat):
+            # Rendering modifies path items in-place, so each run gets a copy.
+            paths = copy.deepcopy(spec["paths"])
+            started_at = time.perf_counter()
+            lines = list(renderer.render_paths(paths))
+            best = min(best, time.perf_counter() - started_at)
+
+        print(f"{name:>10}: {best:.3f}s, {len(lines)} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measure diffing of two large specs that differ in a few operations.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_diff.py
+"""
+
+import argparse
+import copy
+import json
+import time
+
+from sphinxcontrib.openapi import _diff, _hashing, _lib2to3 as lib2to3, utils
+
+from _specs import make_oas2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--operations", type=int, default=20000)
+    args = parser.parse_args()
+
+    old = lib2to3.convert(utils.normalize_spec(make_oas2(args.operations)))
+    new = copy.deepcopy(old)
+    for i in range(3):
+        new["paths"]["/resources%d/{id}" % i]["get"]["summary"] = "Changed"
+
+    started_at = time.perf_counter()
+    json.loads(json.dumps(new))
+    loaded_at = time.perf_counter()
+    old_hashes, new_hashes = _hashing.hash_spec(old), _hashing.hash_spec(new)
+    hashed_at = time.perf_counter()
+    changes = _diff.diff_specs(old, new, old_hashes, new_hashes)
+    finished_at = time.perf_counter()
+
+    print(
+        "%d operations, %d changed: json round trip %.3fs, hashing %.3fs, "
+        "diff %.3fs"
+        % (
+            args.operations,
+            len(changes.operations.changed),
+            loaded_at - started_at,
+            hashed_at - loaded_at,
+            finished_at - hashed_at,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
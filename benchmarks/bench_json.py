@@ -0,0 +1,71 @@
+"""Measure serialization of JSON examples into indented lines.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_json.py
+"""
+
+import argparse
+import json
+import time
+
+from sphinxcontrib.openapi import _json, utils
+
+
+def make_example(items):
+    return [
+        {
+            "id": i,
+            "name": f"resource {i}",
+            "tags": ["a", "b", "c"],
+            "price": i * 1.5,
+            "owner": {"id": i, "email": f"user{i}@example.com", "active": True},
+        }
+        for i in range(items)
+    ]
+
+
+def _splitlines(example):
+    writer = utils.MarkupWriter()
+    with writer.indented(), writer.indented():
+        writer.writelines(json.dumps(example, indent=2).splitlines())
+    return writer.lines
+
+
+def _getlines(example):
+    # Serialized examples are cached, so each run gets a fresh copy in order
+    # to measure serialization itself.
+    example = list(example)
+    writer = utils.MarkupWriter()
+    with writer.indented(), writer.indented():
+        writer.writeraw(_json.getlines(example, 2, writer.prefix))
+    return writer.lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--items", type=int, default=20000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    example = make_example(args.items)
+    benchmarks = {
+        "splitlines": ("json", _splitlines),
+        "json": ("json", _getlines),
+        "orjson": ("orjson", _getlines),
+    }
+
+    for name, (backend, serialize) in benchmarks.items():
+        _json.set_backend(backend)
+        best = float("Inf")
+
+        for _ in range(args.repeat):
+            started_at = time.perf_counter()
+            serialize(example)
+            best = min(best, time.perf_counter() - started_at)
+
+        print(f"{name:>10}: {best:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Measure OAS 2 to OAS 3 conversion throughput.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_lib2to3.py
+"""
+
+import argparse
+import timeit
+
+from sphinxcontrib.openapi import _lib2to3 as lib2to3, utils
+
+from _specs import make_oas2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--operations", type=int, default=5000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = make_oas2(args.operations)
+    utils.normalize_spec(spec)
+
+    # The module level 'convert()' caches results, hence the converter class
+    # is used directly in order to measure the conversion itself.
+    timings = timeit.repeat(
+        lambda: lib2to3.Lib2to3().convert(spec), number=1, repeat=args.repeat
+    )
+    best = min(timings)
+
+    print(
+        "lib2to3: %d operations in %.3fs (%.0f operations/s)"
+        % (args.operations, best, args.operations / best)
+    )
+
+
+if __name__ == "__main__":
+    main()
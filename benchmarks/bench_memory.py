@@ -0,0 +1,66 @@
+"""Measure peak memory of loading and normalizing a large spec.
+
+Each loading mode is measured in a separate process, so peak RSS of one
+doesn't affect the other. Run it from the repository root:
+
+    $ python benchmarks/bench_memory.py
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+import yaml
+
+from sphinxcontrib.openapi import _partial, utils
+
+from _specs import make_oas2
+
+
+def _load(path, compact):
+    with open(path, "rt", encoding="utf-8") as stream:
+        spec = _partial.load(stream, compact=compact)
+    utils.normalize_spec(spec, uri="file://%s" % path)
+
+    # On Linux, maximum resident set size is reported in kilobytes.
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _measure(path, compact):
+    args = [sys.executable, __file__, "--load", path]
+    if compact:
+        args.append("--compact")
+    return int(subprocess.check_output(args))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--operations", type=int, default=5000)
+    parser.add_argument("--load", help=argparse.SUPPRESS)
+    parser.add_argument("--compact", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        _load(args.load, args.compact)
+        return
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "spec.yml")
+        with open(path, "wt", encoding="utf-8") as stream:
+            yaml.safe_dump(make_oas2(args.operations), stream)
+
+        size = os.path.getsize(path)
+        regular = _measure(path, compact=False)
+        compact = _measure(path, compact=True)
+
+    print(
+        "load %.1f MB spec: peak RSS regular %.1f MB, compact %.1f MB (%.0f%%)"
+        % (size / 1024 / 1024, regular / 1024, compact / 1024, compact / regular * 100)
+    )
+
+
+if __name__ == "__main__":
+    main()
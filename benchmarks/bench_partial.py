@@ -0,0 +1,43 @@
+"""Measure loading of a few path items from a large spec.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_partial.py
+"""
+
+import argparse
+import io
+import time
+
+import yaml
+
+from sphinxcontrib.openapi import _partial
+
+from _specs import make_oas2
+
+
+def _measure(text, is_selected):
+    started_at = time.perf_counter()
+    _partial.load(io.StringIO(text), is_selected)
+    return time.perf_counter() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--operations", type=int, default=2000)
+    args = parser.parse_args()
+
+    text = yaml.safe_dump(make_oas2(args.operations))
+    is_selected = _partial.get_path_selector({"paths": ["/resources0/{id}"]})
+
+    full = _measure(text, None)
+    partial = _measure(text, is_selected)
+
+    print(
+        "load %.1f MB spec: full %.3fs, one path item %.3fs (%.1fx)"
+        % (len(text) / 1024 / 1024, full, partial, full / partial)
+    )
+
+
+if __name__ == "__main__":
+    main()
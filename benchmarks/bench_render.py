@@ -0,0 +1,52 @@
+"""Measure markup rendering throughput of both renderer families.
+
+Run it from the repository root:
+
+    $ python benchmarks/bench_render.py
+"""
+
+import argparse
+import copy
+import time
+
+from sphinxcontrib.openapi import _lib2to3 as lib2to3, openapi30, renderers, utils
+
+from _specs import make_oas2
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--operations", type=int, default=5000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    spec = make_oas2(args.operations)
+    utils.normalize_spec(spec)
+    spec = lib2to3.convert(spec)
+
+    renderer = renderers.HttpdomainRenderer(None, {"markup": "restructuredtext"})
+    benchmarks = {
+        "httpdomain": renderer.render_paths,
+        "httpdomain:old": lambda paths: openapi30.openapihttpdomain(
+            dict(spec, paths=paths)
+        ),
+    }
+
+    for name, render in benchmarks.items():
+        best = float("Inf")
+
+        for _ in range(args.repeat):
+            # Rendering modifies path items in-place, so each run gets a copy.
+            paths = copy.deepcopy(spec["paths"])
+
+            started_at = time.perf_counter()
+            lines = sum(1 for _ in render(paths))
+            best = min(best, time.perf_counter() - started_at)
+
+        print(
+            "%s: %d lines in %.3fs (%.0f lines/s)" % (name, lines, best, lines / best)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+def pytest_addoption(parser):
+    parser.addoption(
+        "--time-tolerance",
+        type=float,
+        default=None,
+        help="allowed relative increase of time over the baseline",
+    )
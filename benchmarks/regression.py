@@ -0,0 +1,248 @@
+"""Guard rendering pipeline stages against performance regressions.
+
+A fixed set of benchmarks covers loading, normalizing, converting and
+rendering of both the test specs and a synthetic one. Besides time, each
+benchmark counts work that doesn't depend on how busy a machine is: lines
+emitted, pipeline counters (references resolved, operations converted and
+written, etc.) and peak memory a stage allocates. Counters must match the
+baseline exactly, and memory may grow a bit. Time is measured relative to a
+fixed pure Python workload, so a baseline recorded on one machine makes
+sense on another one, yet it's checked only for benchmarks that take long
+enough for timings to be stable.
+
+Results are compared against ``baseline.json`` by ``test_regression.py``:
+
+    $ tox -e bench
+
+Once a change makes things faster (or slower on purpose), record a new
+baseline and commit it. Run it from the repository root:
+
+    $ python benchmarks/regression.py --update
+"""
+
+import argparse
+import copy
+import gc
+import json
+import os
+import pathlib
+import tempfile
+import time
+import tracemalloc
+
+from sphinxcontrib.openapi import (
+    _instrumentation,
+    _lib2to3 as lib2to3,
+    _partial,
+    renderers,
+    utils,
+)
+
+from _specs import make_oas2
+
+BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+
+# Specs of the test suite, which exercise most of the features.
+TESTSPECS = sorted(
+    pathlib.Path(__file__).parent.parent.joinpath("tests", "testspecs").glob("*/*")
+)
+
+# Parsing is done by pure Python YAML loader and takes ~20s for 5k operations,
+# so loading is measured on a smaller synthetic spec.
+SYNTHETIC_OPERATIONS = 5000
+SYNTHETIC_LOAD_OPERATIONS = 500
+
+# Allowed relative increase of each metric, unless set by the baseline.
+TOLERANCES = {
+    "time": 1.0,
+    "memory": 0.1,
+}
+DEFAULT_TOLERANCE = 0.0
+
+
+def _load(path):
+    with open(path, "rt", encoding="utf-8") as stream:
+        return _partial.load(stream, None, str(path))
+
+
+def _normalize(path):
+    return utils.normalize_spec(_load(path), uri=pathlib.Path(path).as_uri())
+
+
+def _is_oas2(spec):
+    return spec.get("swagger", "").startswith("2.")
+
+
+def _render(specs):
+    lines = []
+    for spec in specs:
+        # Rendering examples is supported for OpenAPI v3 only.
+        options = {} if _is_oas2(spec) else {"examples": True}
+        renderer = renderers.HttpdomainOldRenderer(None, options)
+        lines.extend(renderer.render_restructuredtext_markup(spec))
+    return lines
+
+
+def _write_synthetic(directory, operations):
+    path = os.path.join(directory, "synthetic-%d.json" % operations)
+    if not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump(make_oas2(operations), stream)
+    return path
+
+
+def _get_synthetic(operations):
+    spec = make_oas2(operations)
+    return utils.normalize_spec(spec)
+
+
+# Benchmarks are pairs of a setup, which is not measured, and a run that
+# takes whatever the setup returns. Runs return lists of results, and the
+# number of lines of rendering results is counted.
+BENCHMARKS = {
+    "load-testspecs": (
+        lambda directory: TESTSPECS,
+        lambda paths: [_load(path) for path in paths],
+    ),
+    "normalize-testspecs": (
+        lambda directory: [(path, _load(path)) for path in TESTSPECS],
+        lambda specs: [
+            utils.normalize_spec(spec, uri=path.as_uri()) for path, spec in specs
+        ],
+    ),
+    "convert-testspecs": (
+        lambda directory: [
+            spec for spec in map(_normalize, TESTSPECS) if _is_oas2(spec)
+        ],
+        # The module level 'convert()' caches results, hence the converter
+        # class is used directly.
+        lambda specs: [lib2to3.Lib2to3().convert(spec) for spec in specs],
+    ),
+    "render-testspecs": (
+        lambda directory: [_normalize(path) for path in TESTSPECS],
+        _render,
+    ),
+    "load-synthetic": (
+        lambda directory: _write_synthetic(directory, SYNTHETIC_LOAD_OPERATIONS),
+        lambda path: [_load(path)],
+    ),
+    "normalize-synthetic": (
+        lambda directory: make_oas2(SYNTHETIC_OPERATIONS),
+        lambda spec: [utils.normalize_spec(spec)],
+    ),
+    "convert-synthetic": (
+        lambda directory: _get_synthetic(SYNTHETIC_OPERATIONS),
+        lambda spec: [lib2to3.Lib2to3().convert(spec)],
+    ),
+    "render-synthetic": (
+        lambda directory: [_get_synthetic(SYNTHETIC_OPERATIONS)],
+        _render,
+    ),
+}
+
+# Benchmarks of the test specs take less than 100ms, and their timings jitter
+# way too much to tell a regression, so only their counters are checked.
+TIMED = {name for name in BENCHMARKS if name.endswith("-synthetic")}
+
+
+def calibrate(repeat=10):
+    """Return time of a fixed pure Python workload, in seconds."""
+
+    spec = make_oas2(1000)
+    best = float("Inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            json.dumps(copy.deepcopy(spec), sort_keys=True)
+            best = min(best, time.perf_counter() - started_at)
+    finally:
+        gc.enable()
+    return best
+
+
+def measure(name, calibration, directory, repeat=5):
+    """Run a benchmark, and return its metrics."""
+
+    setup, run = BENCHMARKS[name]
+    best = float("Inf")
+
+    for i in range(repeat + 1):
+        arg = setup(directory)
+        gc.collect()
+        _instrumentation.reset()
+
+        # Tracing memory slows things down, so the first run is traced and
+        # the rest are timed. Peak memory is what the run allocates on top
+        # of what's there already, so it's never negative.
+        traced = i == 0
+        if traced:
+            tracemalloc.start()
+
+        # The collector kicks in at different moments depending on what has
+        # been run before, which makes timings and peak memory of large specs
+        # jitter a lot.
+        gc.disable()
+        try:
+            started_at = time.perf_counter()
+            results = run(arg)
+            elapsed = time.perf_counter() - started_at
+        finally:
+            gc.enable()
+
+        if traced:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            metrics = dict(_instrumentation.counters, memory=peak // 1024)
+            if name.startswith("render-"):
+                metrics["lines"] = len(results)
+        else:
+            best = min(best, elapsed)
+        del results, arg
+
+    if name in TIMED:
+        metrics["time"] = round(best / calibration, 3)
+    return metrics
+
+
+def compare(metrics, baseline, tolerances=None):
+    """Return messages on metrics that exceed the baseline."""
+
+    tolerances = dict(TOLERANCES, **(tolerances or {}))
+    messages = []
+
+    for metric, value in sorted(metrics.items()):
+        expected = baseline.get(metric, 0)
+        limit = expected + abs(expected) * tolerances.get(metric, DEFAULT_TOLERANCE)
+        if value > limit:
+            messages.append(
+                "%s: %s exceeds the baseline of %s (limit: %s)"
+                % (metric, value, expected, round(limit, 2))
+            )
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-u", "--update", action="store_true", help="record a new baseline"
+    )
+    args = parser.parse_args()
+
+    calibration = calibrate()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name in BENCHMARKS:
+            results[name] = measure(name, calibration, directory)
+            print("%s: %s" % (name, json.dumps(results[name], sort_keys=True)))
+
+    if args.update:
+        baseline = {"tolerances": TOLERANCES, "benchmarks": results}
+        BASELINE.write_text(
+            json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Compare the rendering pipeline performance against the baseline.
+
+See ``regression.py`` for details. Run it from the repository root:
+
+    $ python -m pytest benchmarks/test_regression.py
+"""
+
+import json
+
+import pytest
+
+import regression
+
+BASELINE = json.loads(regression.BASELINE.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def calibration():
+    return regression.calibrate()
+
+
+@pytest.fixture(scope="module")
+def directory(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("regression"))
+
+
+@pytest.mark.parametrize("name", list(regression.BENCHMARKS))
+def test_regression(request, calibration, directory, name):
+    tolerances = dict(BASELINE["tolerances"])
+    if request.config.getoption("--time-tolerance") is not None:
+        tolerances["time"] = request.config.getoption("--time-tolerance")
+
+    metrics = regression.measure(name, calibration, directory)
+    messages = regression.compare(metrics, BASELINE["benchmarks"][name], tolerances)
+
+    assert not messages, "%s regressed:\n%s" % (name, "\n".join(messages))
@@ -11,7 +11,18 @@
 
 from importlib.metadata import distribution, PackageNotFoundError
 
-from sphinxcontrib.openapi import renderers, directive
+from sphinxcontrib.openapi import (
+    _dependencies,
+    _fetch,
+    _instrumentation,
+    _json,
+    _search,
+    _split,
+    _validate,
+    renderers,
+    directive,
+    schema_utils,
+)
 
 try:
     __version__ = distribution(__name__).version
@@ -52,9 +63,27 @@ def _register_rendering_directives(app, conf):
     )
 
 
+def _configure_examples(app, conf):
+    """Configure generation of examples based on effective configuration."""
+
+    schema_utils.set_example_datetime(conf.openapi_example_datetime)
+    _json.set_backend(conf.openapi_json_serializer)
+
+
 def setup(app):
     app.add_config_value("openapi_default_renderer", _DEFAULT_RENDERER_NAME, "html")
     app.add_config_value("openapi_renderers", {}, "html")
+    app.add_config_value("openapi_render_workers", 0, "html")
+    app.add_config_value("openapi_render_executor", "thread", "html")
+    app.add_config_value("openapi_example_datetime", None, "html")
+    app.add_config_value("openapi_json_serializer", "json", "html")
+    app.add_config_value("openapi_max_properties", None, "html")
+    app.add_config_value("openapi_max_depth", None, "html")
+    app.add_config_value("openapi_max_items", None, "html")
+    app.add_config_value("openapi_max_example_bytes", None, "html")
+    app.add_config_value("openapi_max_example_lines", None, "html")
+    app.add_config_value("openapi_partial_loading", False, "html")
+    app.add_config_value("openapi_compact_loading", False, "html")
 
     from sphinxcontrib import httpdomain
 
@@ -78,6 +107,14 @@ def setup(app):
             )
 
     app.setup_extension("sphinxcontrib.httpdomain")
+    _dependencies.setup(app)
+    _fetch.setup(app)
+    _instrumentation.setup(app)
+    _search.setup(app)
+    _split.setup(app)
+    _validate.setup(app)
+    app.add_directive("openapi-changelog", directive.ChangelogDirective)
     app.connect("config-inited", _register_rendering_directives)
+    app.connect("config-inited", _configure_examples)
 
     return {"version": __version__, "parallel_read_safe": True}
@@ -1,10 +1,148 @@
 import argparse
+import functools
+import json
 import logging
+import os.path
+import sys
+import time
 
-from sphinxcontrib.openapi import directive, renderers
+from sphinxcontrib.openapi import _analyze, _diff, _watch, directive, renderers, utils
 
 
-def main():
+def changelog(argv):
+    parser = argparse.ArgumentParser(
+        prog='oas2rst changelog',
+        description='Export changes between two OpenAPI Specification files \
+            to reStructuredText files')
+    parser.add_argument(
+        "-e", "--encoding",
+        action='store',
+        default="UTF-8",
+        dest='encoding',
+        help="Source files encoding")
+    parser.add_argument(
+        "-o", "--output",
+        type=argparse.FileType('w'),
+        required=True,
+        dest='output',
+        help="Output file")
+    parser.add_argument(
+        "old",
+        help="Old version of the spec")
+    parser.add_argument(
+        "new",
+        help="New version of the spec")
+
+    options = parser.parse_args(argv)
+
+    old, new = (
+        utils.normalize_spec(
+            directive._get_spec(path, options.encoding),
+            uri='file://%s' % os.path.abspath(path))
+        for path in (options.old, options.new))
+    renderer = renderers.HttpdomainRenderer(None, {})
+
+    for line in _diff.render_changelog(renderer, old, new):
+        options.output.write(line+'\n')
+
+
+def analyze(argv):
+    parser = argparse.ArgumentParser(
+        prog='oas2rst analyze',
+        description='Report what makes rendering an OpenAPI Specification \
+            file expensive, as JSON')
+    parser.add_argument(
+        "-e", "--encoding",
+        action='store',
+        default="UTF-8",
+        dest='encoding',
+        help="Source file encoding")
+    parser.add_argument(
+        "-x", "--examples",
+        action='store_true',
+        dest='examples',
+        help="Render examples")
+    parser.add_argument(
+        "-n", "--top",
+        type=int,
+        default=10,
+        dest='top',
+        help="Number of entries of each ranking")
+    parser.add_argument(
+        "-o", "--output",
+        type=argparse.FileType('w'),
+        default=sys.stdout,
+        dest='output',
+        help="Output file, standard output by default")
+    parser.add_argument(
+        "input",
+        help="Input file")
+
+    options = parser.parse_args(argv)
+
+    openapi_options = {}
+    if options.examples:
+        openapi_options['examples'] = True
+
+    path = os.path.abspath(options.input)
+    raw = utils.load_file(path, options.encoding)
+    spec = utils.normalize_spec(
+        utils.load_file(path, options.encoding), uri='file://%s' % path)
+
+    report = _analyze.analyze(raw, spec, top=options.top, **openapi_options)
+    json.dump(report, options.output, indent=2)
+    options.output.write('\n')
+
+
+def _render_changes(options, openapi_options, state):
+    started_at = time.perf_counter()
+
+    # The renderer, along with markup of operations it has rendered, is kept
+    # between renders, so only changed operations are rendered again.
+    renderer = state.get('renderer')
+    if renderer is None:
+        renderer = state['renderer'] = renderers.HttpdomainOldRenderer(
+            None, openapi_options)
+        renderer.render_cache = utils.RenderCache()
+
+    # Parsed files are cached until they are changed, so only changed files
+    # are parsed again, while the rest are merely copied.
+    spec = utils.load_file(os.path.abspath(options.input), options.encoding)
+    hits, misses = renderer.render_cache.hits, renderer.render_cache.misses
+    text = ''.join(
+        line + '\n' for line in renderer.render_restructuredtext_markup(spec))
+    renderer.render_cache.collect()
+
+    if text != state.get('text'):
+        state['text'] = text
+        if options.output.seekable():
+            options.output.seek(0)
+            options.output.truncate()
+        options.output.write(text)
+        options.output.flush()
+
+    logging.info(
+        'Rendered %s in %.3fs (%d operations rendered, %d reused)',
+        options.input,
+        time.perf_counter() - started_at,
+        renderer.render_cache.misses - misses,
+        renderer.render_cache.hits - hits)
+    return [options.input] + utils.get_local_files(spec)
+
+
+# Subcommands that are run as 'oas2rst <command> ...'. Without a subcommand,
+# a spec is exported as a whole.
+_COMMANDS = {
+    'analyze': analyze,
+    'changelog': changelog,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in _COMMANDS:
+        return _COMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
         prog='oas2rst',
         description='Export OpenAPI Specification files to reStructuredText \
@@ -47,8 +185,14 @@ def main():
         required=True,
         dest='output',
         help="Output file")
+    parser.add_argument(
+        "-w", "--watch",
+        action='store_true',
+        dest='watch',
+        help="Render the input file again each time it or files it refers "
+             "to are changed")
 
-    options = parser.parse_args()
+    options = parser.parse_args(argv)
     logging.getLogger().setLevel(options.level)
 
     openapi_options = {}
@@ -60,6 +204,18 @@ def main():
         openapi_options['group'] = True
 
     openapi_options.setdefault('uri', 'file://%s' % options.input)
+
+    if options.watch:
+        logging.basicConfig(format='%(message)s')
+        try:
+            _watch.watch(
+                functools.partial(
+                    _render_changes, options, openapi_options, {}),
+                paths=[options.input])
+        except KeyboardInterrupt:
+            pass
+        return
+
     spec = directive._get_spec(options.input, options.encoding)
     renderer = renderers.HttpdomainOldRenderer(None, openapi_options)
 
@@ -0,0 +1,380 @@
+"""Cost analysis of specs.
+
+Rendering cost of a spec is mostly a matter of how large it becomes once its
+references are resolved, since every referenced schema is described in place
+of each reference to it. The analysis relates the raw spec to the resolved
+one, points out references and schemas that blow it up, and renders the spec
+operation by operation to tell which operations dominate rendering time.
+"""
+
+import collections
+import time
+
+from sphinxcontrib.openapi import _json, renderers, schema_utils, utils
+
+__all__ = [
+    "analyze",
+]
+
+# Keywords of JSON schemas that contain subschemas, either directly or as
+# values of a mapping or items of a list.
+_SUBSCHEMA = {"items", "additionalProperties", "not"}
+_SUBSCHEMA_MAPPINGS = {"properties", "patternProperties"}
+_SUBSCHEMA_LISTS = {"allOf", "anyOf", "oneOf", "prefixItems"}
+
+
+def _iteroperations(spec):
+    for endpoint, path in spec.get("paths", {}).items():
+        for method, operation in path.items():
+            if method.lower() in utils.HTTP_METHODS:
+                yield endpoint, method, operation
+
+
+def _get_operation_name(endpoint, method):
+    return f"{method.upper()} {endpoint}"
+
+
+def _escape(token):
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _get_owner(pointer):
+    """Return a pointer to a reusable object a given local pointer is in.
+
+    References often point inside of reusable objects, e.g. to a property of
+    a schema, and yet they depend on the whole object.
+    """
+
+    tokens = pointer.lstrip("#/").split("/")
+    if tokens[0] == "components":
+        return "#/" + "/".join(tokens[:3])
+    elif tokens[0] in {"definitions", "parameters", "responses"}:
+        return "#/" + "/".join(tokens[:2])
+    return None
+
+
+def _count_nodes(node):
+    """Return a number of nodes of a tree, without looking into shared ones."""
+
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return count
+
+
+def _count_inlined_nodes(node, memo):
+    """Return a number of nodes of a tree as if shared nodes were inlined.
+
+    Resolved references are shared nodes, so the number grows exponentially
+    with nesting of references, while each node is visited once.
+    """
+
+    if isinstance(node, dict):
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return 1
+
+    count = memo.get(id(node))
+    if count is None:
+        count = 1 + sum(_count_inlined_nodes(child, memo) for child in children)
+        memo[id(node)] = count
+    return count
+
+
+def _get_schema_depth(schema, memo):
+    """Return a number of nested schemas of a resolved schema."""
+
+    if not isinstance(schema, dict):
+        return 0
+
+    depth = memo.get(id(schema))
+    if depth is None:
+        subschemas = []
+        for keyword, value in schema.items():
+            if keyword in _SUBSCHEMA:
+                subschemas.append(value)
+            elif keyword in _SUBSCHEMA_MAPPINGS and isinstance(value, dict):
+                subschemas.extend(value.values())
+            elif keyword in _SUBSCHEMA_LISTS and isinstance(value, list):
+                subschemas.extend(value)
+        depth = 1 + max(
+            (_get_schema_depth(subschema, memo) for subschema in subschemas),
+            default=0,
+        )
+        memo[id(schema)] = depth
+    return depth
+
+
+def _iterschemas(node):
+    """Yield schemas of a resolved operation."""
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "schema" and isinstance(value, dict):
+                    yield value
+                else:
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def _iterbodies(operation):
+    """Yield schemas of request and response bodies of a resolved operation.
+
+    Both OpenAPI v2 bodies (body parameters and response schemas) and
+    OpenAPI v3 ones (media types of request bodies and responses) are
+    yielded along with a status code (or 'request') and a media type.
+    Bodies with examples provided by the spec are skipped since nothing is
+    generated for them.
+    """
+
+    for parameter in operation.get("parameters", []):
+        if parameter.get("in") == "body" and "schema" in parameter:
+            yield "request", None, parameter["schema"]
+
+    bodies = [("request", operation.get("requestBody", {}))]
+    bodies.extend(operation.get("responses", {}).items())
+
+    for status, body in bodies:
+        if "schema" in body and not body.get("examples"):
+            yield str(status), None, body["schema"]
+
+        for media_type, content in body.get("content", {}).items():
+            if "schema" in content and not (
+                "example" in content or "examples" in content
+            ):
+                yield str(status), media_type, content["schema"]
+
+
+def _iterrefs(node, pointer):
+    """Yield pointers of nodes with references, along with the references."""
+
+    stack = [(node, pointer)]
+    while stack:
+        node, pointer = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                yield pointer, ref
+            stack.extend(
+                (value, f"{pointer}/{_escape(key)}") for key, value in node.items()
+            )
+        elif isinstance(node, list):
+            stack.extend(
+                (value, f"{pointer}/{index}") for index, value in enumerate(node)
+            )
+
+
+def _get_referrer(pointer):
+    """Return a name of an operation or a reusable object a pointer is in."""
+
+    tokens = pointer.lstrip("#/").split("/")
+    if tokens[0] == "paths" and len(tokens) >= 3:
+        endpoint = tokens[1].replace("~1", "/").replace("~0", "~")
+        if tokens[2].lower() in utils.HTTP_METHODS:
+            return _get_operation_name(endpoint, tokens[2])
+        return endpoint
+    return _get_owner(pointer)
+
+
+def _find_cycles(graph):
+    """Return nodes of a directed graph that are on cycles.
+
+    It's Tarjan's algorithm for strongly connected components, which is
+    iterative since reference chains of large specs may be long.
+    """
+
+    indices, lowlinks, on_stack = {}, {}, set()
+    stack, cyclic = [], set()
+
+    for root in graph:
+        if root in indices:
+            continue
+
+        work = [(root, iter(graph.get(root, ())))]
+        indices[root] = lowlinks[root] = len(indices)
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in indices:
+                    indices[successor] = lowlinks[successor] = len(indices)
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph.get(successor, ()))))
+                    break
+                elif successor in on_stack:
+                    lowlinks[node] = min(lowlinks[node], indices[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlinks[parent] = min(lowlinks[parent], lowlinks[node])
+                if lowlinks[node] == indices[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        cyclic.update(component)
+    return cyclic
+
+
+class _Profiler:
+    """Writes operations one by one, measuring each of them.
+
+    It's passed to the renderer in place of a render cache, which is what
+    operations are written through.
+    """
+
+    def __init__(self):
+        self.operations = {}
+
+    def write(self, writer, write, endpoint, method, operation, *args, **kwargs):
+        lines = len(writer.lines)
+        started_at = time.perf_counter()
+        write(writer, endpoint, method, operation, *args, **kwargs)
+        self.operations[endpoint, method] = (
+            len(writer.lines) - lines,
+            time.perf_counter() - started_at,
+        )
+
+
+def _analyze_refs(raw, top):
+    fan_in = collections.Counter()
+    fan_out = collections.Counter()
+    graph = collections.defaultdict(set)
+
+    for pointer, ref in _iterrefs(raw, "#"):
+        fan_in[ref] += 1
+        referrer = _get_referrer(pointer)
+        if referrer is not None:
+            fan_out[referrer] += 1
+
+        owner = _get_owner(pointer)
+        if owner is not None and ref.startswith("#/"):
+            target = _get_owner(ref)
+            if target is not None:
+                graph[owner].add(target)
+
+    return {
+        "total": sum(fan_in.values()),
+        "fan_in": [
+            {"ref": ref, "count": count} for ref, count in fan_in.most_common(top)
+        ],
+        "fan_out": [
+            {"referrer": referrer, "count": count}
+            for referrer, count in fan_out.most_common(top)
+        ],
+    }, sorted(_find_cycles(graph))
+
+
+def analyze(raw, spec, top=10, **options):
+    """Return a cost report of a spec.
+
+    Both a raw spec and a normalized one are required, since the former is
+    what references are counted in, while the latter is what gets rendered.
+    The report consists of plain values, so it can be serialized as JSON.
+    Operations are rendered with given renderer options, so line counts and
+    timings reflect them, e.g. rendering examples costs a lot more.
+    """
+
+    refs, recursive = _analyze_refs(raw, top)
+
+    raw_nodes = _count_nodes(raw)
+    memo = {}
+    resolved_nodes = 1 + sum(
+        _count_inlined_nodes(value, memo) for value in spec.values()
+    )
+
+    budget = schema_utils.Budget.from_options(options)
+    depths = {}
+    examples = []
+    max_depth = {"depth": 0, "operation": None}
+
+    for endpoint, method, operation in _iteroperations(spec):
+        name = _get_operation_name(endpoint, method)
+
+        depth = max(
+            (_get_schema_depth(schema, depths) for schema in _iterschemas(operation)),
+            default=0,
+        )
+        if depth > max_depth["depth"]:
+            max_depth = {"depth": depth, "operation": name}
+
+        for status, media_type, schema in _iterbodies(operation):
+            example = schema_utils.example_from_schema(schema, budget)
+            examples.append(
+                {
+                    "operation": name,
+                    "status": status,
+                    "media_type": media_type,
+                    "bytes": len(_json.dumps(example, 2).encode("utf-8")),
+                }
+            )
+
+    profiler = _Profiler()
+    renderer = renderers.HttpdomainOldRenderer(None, options)
+    renderer.render_cache = profiler
+    started_at = time.perf_counter()
+    lines = sum(1 for _ in renderer.render_restructuredtext_markup(spec))
+    seconds = time.perf_counter() - started_at
+
+    tags = {}
+    operations = []
+    for endpoint, method, operation in _iteroperations(spec):
+        op_lines, op_seconds = profiler.operations.get((endpoint, method), (0, 0.0))
+        tag = tags.setdefault(
+            (operation.get("tags") or ["default"])[0],
+            {"operations": 0, "lines": 0, "seconds": 0.0},
+        )
+        tag["operations"] += 1
+        tag["lines"] += op_lines
+        tag["seconds"] += op_seconds
+        operations.append(
+            {
+                "operation": _get_operation_name(endpoint, method),
+                "lines": op_lines,
+                "seconds": op_seconds,
+                "share": op_seconds / seconds if seconds else 0.0,
+            }
+        )
+
+    return {
+        "operations": len(operations),
+        "nodes": {
+            "raw": raw_nodes,
+            "resolved": resolved_nodes,
+            "blowup": resolved_nodes / raw_nodes,
+        },
+        "refs": refs,
+        "recursive_schemas": recursive,
+        "max_schema_depth": max_depth,
+        "largest_examples": sorted(examples, key=lambda e: e["bytes"], reverse=True)[
+            :top
+        ],
+        "render": {
+            "lines": lines,
+            "seconds": seconds,
+            "tags": tags,
+            "slowest": sorted(operations, key=lambda o: o["seconds"], reverse=True)[
+                :top
+            ],
+        },
+    }
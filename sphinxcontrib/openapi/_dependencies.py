@@ -0,0 +1,89 @@
+"""Content based tracking of spec dependencies.
+
+Sphinx considers a document outdated if any of its dependencies has been
+modified since the document was read, and it relies on modification time to
+tell so. Specs, however, are often generated, and generators tend to rewrite
+them even when nothing has changed, which invalidates every document that
+renders them. When content based tracking is on, specs are not reported to
+Sphinx as dependencies. Instead, their digests are stored in the environment
+and documents are reported as outdated only if a digest has changed.
+"""
+
+import hashlib
+import os
+
+__all__ = [
+    "note_dependency",
+    "setup",
+]
+
+
+def _get_file_digest(path):
+    """Return a digest of a given file content, or 'None' if it's missing."""
+
+    hash_ = hashlib.sha256()
+
+    try:
+        with open(path, "rb") as stream:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                hash_.update(chunk)
+    except OSError:
+        return None
+    return hash_.hexdigest()
+
+
+def _get_digests(env):
+    if not hasattr(env, "openapi_spec_digests"):
+        env.openapi_spec_digests = {}
+    return env.openapi_spec_digests
+
+
+def note_dependency(env, path):
+    """Note a given spec file as a dependency of the current document."""
+
+    if env.config.openapi_dependency_check != "content":
+        env.note_dependency(path)
+        return
+
+    path = os.path.join(env.srcdir, path)
+    _get_digests(env).setdefault(env.docname, {})[path] = _get_file_digest(path)
+
+
+def _purge_doc(app, env, docname):
+    _get_digests(env).pop(docname, None)
+
+
+def _merge_info(app, env, docnames, other):
+    digests = _get_digests(env)
+
+    for docname, dependencies in _get_digests(other).items():
+        if docname in docnames:
+            digests[docname] = dependencies
+
+
+def _get_outdated(app, env, added, changed, removed):
+    # The same spec is usually rendered by more than one document, so let's
+    # compute each digest only once.
+    current = {}
+    outdated = []
+
+    for docname, dependencies in _get_digests(env).items():
+        if docname in removed:
+            continue
+
+        for path, digest in dependencies.items():
+            if path not in current:
+                current[path] = _get_file_digest(path)
+
+            if current[path] != digest:
+                outdated.append(docname)
+                break
+
+    return outdated
+
+
+def setup(app):
+    app.add_config_value("openapi_dependency_check", "mtime", "env")
+    app.connect("env-purge-doc", _purge_doc)
+    app.connect("env-merge-info", _merge_info)
+    app.connect("env-get-outdated", _get_outdated)
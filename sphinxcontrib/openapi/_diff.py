@@ -0,0 +1,275 @@
+"""Structural diff of specs.
+
+Two versions of a spec are compared top-down, and any subtree whose content
+hash is the same in both versions is skipped without looking inside. Each
+spec is hashed in one pass, with shared nodes hashed once, and comparing
+hashes costs nothing, so the rest of the diff depends on the number of
+changes rather than on the size of specs.
+
+Both specs are expected to be normalized. OpenAPI v2 specs are converted to
+OpenAPI v3 first, so specs of different versions can be compared as well.
+"""
+
+import dataclasses
+
+from sphinxcontrib.openapi import _hashing, _lib2to3 as lib2to3, utils
+
+__all__ = [
+    "Changes",
+    "OperationChanges",
+    "SpecChanges",
+    "diff_specs",
+    "render_changelog",
+]
+
+# Operation properties that are diffed on their own.
+_OPERATION_PARTS = {"parameters", "requestBody", "responses"}
+
+
+@dataclasses.dataclass(frozen=True)
+class Changes:
+    """Keys that are added, removed or changed between two mappings."""
+
+    added: tuple = ()
+    removed: tuple = ()
+    changed: tuple = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclasses.dataclass(frozen=True)
+class OperationChanges:
+    """Changes of a single operation."""
+
+    parameters: Changes = Changes()
+    responses: Changes = Changes()
+    request_body: bool = False
+    properties: tuple = ()
+
+
+@dataclasses.dataclass(frozen=True)
+class SpecChanges:
+    """Changes between two versions of a spec.
+
+    Operations are keyed by endpoint and HTTP method, parameters by name and
+    location, and schemas by name.
+    """
+
+    operations: Changes = Changes()
+    operation_changes: dict = dataclasses.field(default_factory=dict)
+    schemas: Changes = Changes()
+
+    def __bool__(self):
+        return bool(self.operations or self.schemas)
+
+
+class _Differ:
+    def __init__(self, old_hashes=None, new_hashes=None):
+        self._old_hashes = old_hashes or _hashing.Hashes()
+        self._new_hashes = new_hashes or _hashing.Hashes()
+
+    def is_equal(self, old, new):
+        return old is new or (
+            self._old_hashes.digest(old) == self._new_hashes.digest(new)
+        )
+
+    def diff_mappings(self, old, new):
+        return Changes(
+            added=tuple(key for key in new if key not in old),
+            removed=tuple(key for key in old if key not in new),
+            changed=tuple(
+                key
+                for key in new
+                if key in old and not self.is_equal(old[key], new[key])
+            ),
+        )
+
+    def diff_operation(self, old, new):
+        properties = self.diff_mappings(
+            {key: value for key, value in old.items() if key not in _OPERATION_PARTS},
+            {key: value for key, value in new.items() if key not in _OPERATION_PARTS},
+        )
+
+        return OperationChanges(
+            parameters=self.diff_mappings(
+                _get_parameters(old.get("parameters", [])),
+                _get_parameters(new.get("parameters", [])),
+            ),
+            responses=self.diff_mappings(
+                old.get("responses", {}), new.get("responses", {})
+            ),
+            request_body=not self.is_equal(
+                old.get("requestBody", {}), new.get("requestBody", {})
+            ),
+            properties=properties.added + properties.removed + properties.changed,
+        )
+
+
+def _get_parameters(parameters):
+    return {(parameter["name"], parameter["in"]): parameter for parameter in parameters}
+
+
+def _get_operations(paths):
+    return {
+        (endpoint, method): operation
+        for endpoint, path in paths.items()
+        for method, operation in path.items()
+        if method.lower() in utils.HTTP_METHODS
+    }
+
+
+def _get_schemas(spec):
+    return spec.get("components", {}).get("schemas", {})
+
+
+def _convert(spec):
+    if spec.get("swagger") == "2.0":
+        return lib2to3.convert(spec)
+    return spec
+
+
+def diff_specs(old, new, old_hashes=None, new_hashes=None):
+    """Compute changes between two versions of a normalized spec.
+
+    Hashing is the most expensive part of a diff, so hashes computed in
+    advance (e.g. by :func:`~sphinxcontrib.openapi._hashing.hash_spec`) may
+    be passed in to be reused.
+    """
+
+    old, new = _convert(old), _convert(new)
+    differ = _Differ(old_hashes, new_hashes)
+
+    operations = Changes()
+    operation_changes = {}
+    old_paths, new_paths = old.get("paths", {}), new.get("paths", {})
+
+    if not differ.is_equal(old_paths, new_paths):
+        old_operations = _get_operations(old_paths)
+        new_operations = _get_operations(new_paths)
+
+        operations = differ.diff_mappings(old_operations, new_operations)
+        operation_changes = {
+            key: differ.diff_operation(old_operations[key], new_operations[key])
+            for key in operations.changed
+        }
+
+    schemas = Changes()
+    old_schemas, new_schemas = _get_schemas(old), _get_schemas(new)
+
+    if not differ.is_equal(old_schemas, new_schemas):
+        schemas = differ.diff_mappings(old_schemas, new_schemas)
+
+    return SpecChanges(
+        operations=operations, operation_changes=operation_changes, schemas=schemas
+    )
+
+
+def _format_operation(key):
+    endpoint, method = key
+    return f"``{method.upper()} {endpoint}``"
+
+
+def _format_parameter(key):
+    name, in_ = key
+    return f"``{name}`` ({in_})"
+
+
+def _format_key(key):
+    return f"``{key}``"
+
+
+def _write_list(writer, title, keys, format_key=_format_key):
+    if keys:
+        writer.write(f"* {title}: {', '.join(format_key(key) for key in keys)}")
+
+
+def _write_operations(writer, renderer, operations, keys):
+    for endpoint, method in keys:
+        lines = list(
+            renderer.render_operation(endpoint, method, operations[endpoint, method])
+        )
+
+        # Operations are documented elsewhere, and a changelog merely shows
+        # them, so they must neither be indexed nor be cross-referenced.
+        writer.writelines(lines[:1] + ["   :noindex:"] + lines[1:])
+        writer.write()
+
+
+def _write_changelog(writer, renderer, old, new):
+    old, new = _convert(old), _convert(new)
+    changes = diff_specs(old, new)
+
+    if not changes:
+        writer.write("No changes.")
+        writer.write()
+        return
+
+    if changes.operations.added:
+        writer.write(".. rubric:: Added operations")
+        writer.write()
+        _write_operations(
+            writer,
+            renderer,
+            _get_operations(new.get("paths", {})),
+            changes.operations.added,
+        )
+
+    if changes.operations.removed:
+        old_operations = _get_operations(old.get("paths", {}))
+
+        writer.write(".. rubric:: Removed operations")
+        writer.write()
+        for key in changes.operations.removed:
+            summary = old_operations[key].get("summary")
+            writer.write(
+                f"* {_format_operation(key)}" + (f" -- {summary}" if summary else "")
+            )
+        writer.write()
+
+    if changes.operations.changed:
+        new_operations = _get_operations(new.get("paths", {}))
+
+        writer.write(".. rubric:: Changed operations")
+        writer.write()
+        for key in changes.operations.changed:
+            changed = changes.operation_changes[key]
+
+            writer.write(f"{_format_operation(key)}:")
+            writer.write()
+            for title, keys, format_key in [
+                ("Added parameters", changed.parameters.added, _format_parameter),
+                ("Removed parameters", changed.parameters.removed, _format_parameter),
+                ("Changed parameters", changed.parameters.changed, _format_parameter),
+                ("Added responses", changed.responses.added, _format_key),
+                ("Removed responses", changed.responses.removed, _format_key),
+                ("Changed responses", changed.responses.changed, _format_key),
+                ("Changed properties", changed.properties, _format_key),
+            ]:
+                _write_list(writer, title, keys, format_key)
+            if changed.request_body:
+                writer.write("* Changed request body")
+            writer.write()
+
+            _write_operations(writer, renderer, new_operations, [key])
+
+    if changes.schemas:
+        writer.write(".. rubric:: Schemas")
+        writer.write()
+        _write_list(writer, "Added", changes.schemas.added)
+        _write_list(writer, "Removed", changes.schemas.removed)
+        _write_list(writer, "Changed", changes.schemas.changed)
+        writer.write()
+
+
+def render_changelog(renderer, old, new):
+    """Render changes between two versions of a normalized spec.
+
+    Added and changed operations are rendered by a given renderer, which
+    must be capable of rendering a single operation (e.g.
+    :class:`~sphinxcontrib.openapi.renderers.HttpdomainRenderer`).
+    """
+
+    writer = utils.MarkupWriter()
+    _write_changelog(writer, renderer, old, new)
+    return writer.lines
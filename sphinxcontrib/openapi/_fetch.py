@@ -0,0 +1,174 @@
+"""Concurrent fetching of remote documents.
+
+Specs may refer to remote documents, either via JSON references or via
+``externalValue`` of examples, and fetching them one at a time in the middle
+of rendering makes a build as slow as the sum of round trips. Instead, URLs
+are collected upfront and fetched concurrently by an asyncio event loop,
+with a limited number of connections per host and with retries of failures
+that may be temporary.
+
+HTTP clients are blocking (``requests`` if installed, ``urllib`` otherwise)
+and are run in threads, which keeps the extension free of asynchronous HTTP
+dependencies. A client is a callable that takes a URL and returns a text of
+a document, so it can be replaced with any other one.
+
+Synchronous code drives fetching via :func:`fetch_all` (or :func:`fetch`
+for a single URL), which runs an event loop till all URLs are fetched.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import urllib.error
+import urllib.parse
+import urllib.request
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+__all__ = [
+    "Fetcher",
+    "configure",
+    "fetch",
+    "fetch_all",
+    "setup",
+]
+
+
+def _get_with_requests(url, timeout):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+
+def _get_with_urllib(url, timeout):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        charset = response.headers.get_content_charset() or "utf-8"
+        return response.read().decode(charset)
+
+
+def _get(url, timeout=30):
+    if requests is not None:
+        return _get_with_requests(url, timeout)
+    return _get_with_urllib(url, timeout)
+
+
+def _is_retriable(exc):
+    """Return 'True' if a given error may go away once a request is retried."""
+
+    # Client errors (e.g. 404 Not Found) are there to stay, while server
+    # errors and connection failures are often temporary.
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(exc, urllib.error.HTTPError):
+        status = exc.code
+    return status is None or status >= 500
+
+
+class Fetcher:
+    """Fetches URLs concurrently, with limits and retries.
+
+    At most 'connections_per_host' requests are made to a host at a time,
+    and failed requests are retried up to 'retries' times, waiting for
+    'backoff' seconds before the first retry and twice as long before each
+    next one.
+    """
+
+    def __init__(self, get=_get, connections_per_host=4, retries=2, backoff=0.1):
+        self._get = get
+        self._connections_per_host = connections_per_host
+        self._retries = retries
+        self._backoff = backoff
+        self._semaphores = collections.defaultdict(
+            lambda: asyncio.Semaphore(self._connections_per_host)
+        )
+
+    async def fetch(self, url):
+        """Return a text of a document at a given URL."""
+
+        semaphore = self._semaphores[urllib.parse.urlsplit(url).netloc]
+        delay = self._backoff
+
+        for attempt in range(self._retries + 1):
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(self._get, url)
+                except Exception as exc:
+                    if attempt == self._retries or not _is_retriable(exc):
+                        raise
+
+            # The connection is released while waiting, so other requests
+            # to the same host are not held back by a failing one.
+            await asyncio.sleep(delay)
+            delay *= 2
+
+    async def fetch_all(self, urls):
+        """Return texts of documents at given URLs, keyed by URLs.
+
+        A URL that cannot be fetched is mapped to the error it failed with,
+        so one failure doesn't prevent other URLs from being fetched.
+        """
+
+        urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *(self.fetch(url) for url in urls), return_exceptions=True
+        )
+        return dict(zip(urls, results))
+
+
+_settings = {}
+
+
+def configure(**settings):
+    """Set default settings of fetchers, see :class:`Fetcher` for details."""
+
+    _settings.clear()
+    _settings.update(settings)
+
+
+def _run(coroutine):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    # An event loop cannot be nested, so if there's one running in this
+    # thread already, the coroutine is run by another one in a new thread.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
+def fetch_all(urls, **settings):
+    """Fetch given URLs concurrently, and return the results keyed by URLs.
+
+    Results are either texts of documents or errors. Settings, if passed,
+    take precedence over the ones set by :func:`configure`.
+    """
+
+    urls = list(urls)
+    if not urls:
+        return {}
+    return _run(Fetcher(**dict(_settings, **settings)).fetch_all(urls))
+
+
+def fetch(url, **settings):
+    """Return a text of a document at a given URL."""
+
+    result = fetch_all([url], **settings)[url]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def _config_inited(app, conf):
+    configure(
+        connections_per_host=conf.openapi_fetch_connections_per_host,
+        retries=conf.openapi_fetch_retries,
+    )
+
+
+def setup(app):
+    app.add_config_value("openapi_fetch_connections_per_host", 4, "")
+    app.add_config_value("openapi_fetch_retries", 2, "")
+    app.connect("config-inited", _config_inited)
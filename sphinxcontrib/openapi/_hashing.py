@@ -0,0 +1,159 @@
+"""Content hashing of spec subtrees.
+
+Hashes are computed bottom-up: a container is hashed from its keys and the
+hashes of its children, and every container is hashed at most once no matter
+how many times it's referenced from the tree. That's important because
+resolved JSON references are shared nodes, and naively serializing such a
+tree may cost as much as the fully inlined spec would.
+
+Keys order is a part of content since it affects rendering order. Scalars
+are hashed along with their types, so ``1``, ``1.0``, ``True`` and ``"1"``
+are all different.
+
+Recursive structures are legit in Python, and a child that refers back to
+one of its ancestors is hashed as a reference to an ancestor so many levels
+up. Hashes of nodes within a cycle thus depend on where the cycle is entered
+from, so they are memoized only for nodes the cycle is entered at. For a
+given spec, that's always the same node, hence hashes are stable across
+builds.
+"""
+
+import collections.abc
+import hashlib
+
+__all__ = [
+    "Hashes",
+    "hash_spec",
+]
+
+_SCALAR_TYPES = {str, int, float, bool, type(None)}
+
+
+def _get_kind(node):
+    # Specs consist of plain dicts, lists and scalars, so checking exact
+    # types first saves a lot of time on large specs.
+    type_ = type(node)
+    if type_ is dict:
+        return b"m"
+    elif type_ is list:
+        return b"l"
+    elif type_ in _SCALAR_TYPES:
+        return None
+    elif isinstance(node, collections.abc.Mapping):
+        return b"m"
+    elif isinstance(node, (list, tuple)):
+        return b"l"
+    return None
+
+
+class Hashes:
+    """Memoized content hashes of spec nodes.
+
+    Nodes are pinned for as long as their hashes are memoized, so their
+    identities are not reused by other objects.
+    """
+
+    def __init__(self):
+        self._hashes = {}
+        # Digests aren't stored along with nodes in tuples, since millions of
+        # tuples keep the garbage collector busy for nothing.
+        self._nodes = []
+        self._scalars = {}
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, node):
+        return id(node) in self._hashes
+
+    def _encode_scalar(self, value):
+        # Keys and many values (e.g. types and formats) are repeated all over
+        # a spec, so let's encode each of them once. Types are a part of the
+        # key since, for instance, 1 and True are equal.
+        key = (type(value), value)
+        try:
+            return self._scalars[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable scalars are fine, they are just not cached.
+            key = None
+
+        # A representation of a scalar never contains a raw null character,
+        # so the latter is safe to terminate it with.
+        encoded = b"%s:%s\0" % (type(value).__name__.encode(), repr(value).encode())
+        if key is not None:
+            self._scalars[key] = encoded
+        return encoded
+
+    def digest(self, node):
+        """Return a hex digest of a given node content."""
+
+        memoized = self._hashes.get(id(node))
+        if memoized is not None:
+            return memoized.hex()
+
+        if _get_kind(node) is None:
+            return hashlib.sha1(self._encode_scalar(node)).hexdigest()
+        return self._digest(node, {})[0].hex()
+
+    def _digest(self, node, ancestors):
+        """Hash a container, returning its digest along with the lowest
+        ancestor its subtree refers back to."""
+
+        depth = len(ancestors)
+        ancestors[id(node)] = depth
+        lowest = depth
+
+        kind = _get_kind(node)
+        items = node.items() if kind == b"m" else enumerate(node)
+        hashes = self._hashes
+        encode_scalar = self._encode_scalar
+        scalars = self._scalars
+        parts = [kind]
+
+        for key, value in items:
+            parts.append(scalars.get((type(key), key)) or encode_scalar(key))
+
+            value_type = type(value)
+            if value_type in _SCALAR_TYPES:
+                parts.append(b"v")
+                parts.append(scalars.get((value_type, value)) or encode_scalar(value))
+                continue
+
+            value_id = id(value)
+            memoized = hashes.get(value_id)
+
+            if memoized is not None:
+                parts.append(b"c" + memoized)
+            elif value_id in ancestors:
+                parts.append(b"r%d\0" % (depth - ancestors[value_id]))
+                lowest = min(lowest, ancestors[value_id])
+            elif _get_kind(value) is None:
+                parts.append(b"v" + encode_scalar(value))
+            else:
+                digest, value_lowest = self._digest(value, ancestors)
+                parts.append(b"c" + digest)
+                lowest = min(lowest, value_lowest)
+
+        del ancestors[id(node)]
+        digest = hashlib.sha1(b"".join(parts)).digest()
+
+        # A node that refers back to any of its ancestors is hashed relative
+        # to them, hence its hash is of no use elsewhere.
+        if lowest == depth:
+            hashes[id(node)] = digest
+            self._nodes.append(node)
+        return digest, lowest
+
+
+def hash_spec(spec):
+    """Hash a given spec in one pass.
+
+    Returns memoized hashes of every spec node, so looking up hashes of its
+    subtrees afterwards costs nothing.
+    """
+
+    hashes = Hashes()
+    hashes.digest(spec)
+    return hashes
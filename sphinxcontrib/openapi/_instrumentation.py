@@ -0,0 +1,229 @@
+"""Lightweight instrumentation of the rendering pipeline.
+
+Counters track the amount of work done by the pipeline stages, so it can be
+verified that expensive stages aren't executed more often than needed.
+Counters are process-wide and are never reset by the extension itself.
+
+Memory usage of pipeline phases is traced by ``tracemalloc`` when it's on
+(see ``openapi_trace_memory``), which tells which of the phases is to blame
+for a build that runs out of memory. Phases are nested, e.g. normalization
+of a spec happens as its markup is generated, and each phase accounts for
+phases nested into it.
+"""
+
+import collections
+import dataclasses
+import itertools
+import tracemalloc
+
+from sphinx.util import logging
+
+__all__ = [
+    "PhaseMemory",
+    "counters",
+    "count",
+    "log_memory",
+    "phase",
+    "pop_memory",
+    "reset",
+    "setup",
+    "start_tracing",
+    "stop_tracing",
+]
+
+logger = logging.getLogger(__name__)
+
+
+counters = collections.Counter()
+
+
+def count(name, value=1):
+    """Increase a counter with a given name."""
+
+    counters[name] += value
+
+
+def reset():
+    """Reset all counters."""
+
+    counters.clear()
+
+
+@dataclasses.dataclass(frozen=True)
+class PhaseMemory:
+    """Memory used by a pipeline phase.
+
+    'peak' is the highest amount of memory allocated during the phase, and
+    'retained' is the amount of memory it hasn't freed, both in bytes and
+    relative to the amount allocated when the phase began. 'sites' are lines
+    of code that retained the most, if requested.
+    """
+
+    spec: str
+    name: str
+    depth: int
+    peak: int
+    retained: int
+    sites: tuple = ()
+
+
+# Phases that are in progress, outermost first, and memory used by phases
+# that are over along with the order they began in.
+_phases = []
+_memory = []
+_order = itertools.count()
+
+# A number of allocation sites to report per phase, or 'None' if memory is
+# not traced.
+_top_sites = None
+
+# Memory allocated by tracemalloc itself is not what the pipeline uses.
+_SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+
+class phase:
+    """Trace memory used by a pipeline phase till the end of a 'with' block.
+
+    Nested phases belong to the same spec as their outer phase, unless it's
+    passed explicitly. It's a no-op unless memory tracing is started.
+    """
+
+    def __init__(self, name, spec=None):
+        self._name = name
+        self._spec = spec
+        self._tracing = False
+
+    def __enter__(self):
+        if _top_sites is None or not tracemalloc.is_tracing():
+            return self
+
+        self._tracing = True
+        self._snapshot = None
+        if _top_sites:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                _SNAPSHOT_FILTERS
+            )
+
+        # The peak is reset, so the outer phase has to remember its own peak
+        # before it's lost.
+        current, peak = tracemalloc.get_traced_memory()
+        if _phases:
+            _phases[-1]._peak = max(_phases[-1]._peak, peak)
+            if self._spec is None:
+                self._spec = _phases[-1]._spec
+        tracemalloc.reset_peak()
+
+        self._start = self._peak = current
+        self._order = next(_order)
+        _phases.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        if not self._tracing:
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        _phases.pop()
+
+        sites = ()
+        if self._snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            sites = tuple(
+                (str(stat.traceback), stat.size_diff)
+                for stat in snapshot.compare_to(self._snapshot, "lineno")[:_top_sites]
+            )
+            self._snapshot = None
+
+        _memory.append(
+            (
+                self._order,
+                PhaseMemory(
+                    spec=self._spec,
+                    name=self._name,
+                    depth=len(_phases),
+                    peak=max(self._peak, peak) - self._start,
+                    retained=current - self._start,
+                    sites=sites,
+                ),
+            )
+        )
+
+
+def pop_memory():
+    """Return memory used by phases that are over, and forget about it.
+
+    Phases are returned in the order they began in, i.e. outer phases come
+    before phases nested into them.
+    """
+
+    memory = [memory for _, memory in sorted(_memory, key=lambda item: item[0])]
+    del _memory[:]
+    return memory
+
+
+def _format_size(size):
+    if abs(size) < 1024 * 1024:
+        return "%.1f KiB" % (size / 1024)
+    return "%.1f MiB" % (size / 1024 / 1024)
+
+
+def log_memory(location=None):
+    """Log memory used by phases that are over, and forget about it."""
+
+    for memory in pop_memory():
+        logger.info(
+            "[openapi] memory of %s: %s%s: peak %s, retained %s",
+            memory.spec,
+            "  " * memory.depth,
+            memory.name,
+            _format_size(memory.peak),
+            _format_size(memory.retained),
+            location=location,
+        )
+        for site, size in memory.sites:
+            logger.info(
+                "[openapi]     %s: %s", site, _format_size(size), location=location
+            )
+
+
+def start_tracing(top_sites=0):
+    """Start tracing memory used by phases.
+
+    If 'top_sites' is passed, that many lines of code that retained the most
+    are reported per phase, which is way slower though.
+    """
+
+    global _top_sites
+
+    _top_sites = top_sites
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def stop_tracing():
+    """Stop tracing memory used by phases."""
+
+    global _top_sites
+
+    _top_sites = None
+    tracemalloc.stop()
+    del _memory[:]
+
+
+def _builder_inited(app):
+    trace_memory = app.config.openapi_trace_memory
+    if trace_memory is False or trace_memory is None:
+        return
+
+    # 'True' is a number too, but it means no allocation sites.
+    start_tracing(0 if trace_memory is True else int(trace_memory))
+    app.connect("build-finished", _build_finished)
+
+
+def _build_finished(app, exception):
+    stop_tracing()
+
+
+def setup(app):
+    app.add_config_value("openapi_trace_memory", False, "")
+    app.connect("builder-inited", _builder_inited)
@@ -0,0 +1,123 @@
+"""Serialization of JSON examples.
+
+Examples are serialized either by the standard library, or by a faster
+backend if configured and installed. Serialized examples are emitted as
+lines already indented to where they are going to be written. Examples of
+a spec are cached per example object since the same spec is usually rendered
+by a few directives, while generated ones are new objects every time and are
+not worth caching.
+"""
+
+import collections
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+__all__ = [
+    "dumps",
+    "getlines",
+    "set_backend",
+]
+
+
+def _dumps_json(value, indent):
+    return json.dumps(value, indent=indent, separators=(",", ": "))
+
+
+def _dumps_orjson(value, indent):
+    try:
+        dumped = orjson.dumps(
+            value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    except TypeError:
+        # The standard library is more forgiving (e.g. to integers that
+        # don't fit into 64 bits), so let it try before giving up.
+        return _dumps_json(value, indent)
+
+    if indent == 2:
+        return dumped
+
+    # The only indentation orjson supports is two spaces. Since indentation
+    # is the only whitespace at the beginning of serialized lines, it's safe
+    # to scale it to whatever is needed.
+    lines = dumped.split("\n")
+    for i, line in enumerate(lines):
+        stripped = line.lstrip(" ")
+        lines[i] = " " * ((len(line) - len(stripped)) // 2 * indent) + stripped
+    return "\n".join(lines)
+
+
+_BACKENDS = {
+    "json": _dumps_json,
+    "orjson": _dumps_orjson if orjson is not None else _dumps_json,
+}
+
+_dumps = _dumps_json
+
+# Serialized examples, keyed by example identity along with serialization
+# parameters. Examples are kept in the cache to ensure their identities are
+# not reused by other objects while they are cached.
+_CACHE_SIZE = 1024
+_cache = collections.OrderedDict()
+
+
+def set_backend(backend):
+    """Set a backend to serialize examples with.
+
+    The backend is either a name of a known backend, i.e. ``json`` or
+    ``orjson``, or a callable that accepts a value along with indentation
+    and returns a string. If orjson isn't installed, the standard library is
+    used instead.
+    """
+
+    global _dumps
+
+    if isinstance(backend, str):
+        if backend not in _BACKENDS:
+            raise ValueError(
+                "invalid JSON serializer: '%s', must be one of: %s"
+                % (backend, ", ".join(_BACKENDS))
+            )
+        backend = _BACKENDS[backend]
+
+    _dumps = backend
+    _cache.clear()
+
+
+def dumps(value, indent):
+    """Serialize a given value into JSON."""
+
+    return _dumps(value, indent)
+
+
+def getlines(value, indent, prefix="", cache=True):
+    """Return lines of a given value serialized into JSON.
+
+    Each line is prefixed by 'prefix', so the lines can be written as they
+    are at any indentation level. Lines are cached unless 'cache' is false,
+    which is the case for values that are not going to be serialized again,
+    e.g. generated examples.
+    """
+
+    key = (id(value), indent, prefix)
+    if cache:
+        try:
+            _cache.move_to_end(key)
+            return _cache[key][1]
+        except KeyError:
+            pass
+
+    # JSON is serialized with no empty lines, hence it's safe to indent the
+    # lines by means of replacing line breaks in one go.
+    lines = (prefix + _dumps(value, indent).replace("\n", "\n" + prefix)).split("\n")
+    if not cache:
+        return lines
+
+    _cache[key] = (value, lines)
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return lines
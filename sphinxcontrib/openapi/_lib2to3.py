@@ -1,19 +1,50 @@
 """Partial OpenAPI v2.x (fka Swagger) to OpenAPI v3.x converter."""
 
+import collections
 import functools
 import urllib
 
-import picobox
+from sphinxcontrib.openapi import _instrumentation, utils
 
 __all__ = [
     "convert",
 ]
 
 
-def convert(spec):
-    """Convert a given OAS 2 spec to OAS 3."""
+# Converted specs are cached by their content digest, since conversion is
+# requested by each directive while the spec they render is usually the same.
+# The cache is bounded because specs are large and a documentation build may
+# refer to a bunch of them.
+_converted = collections.OrderedDict()
+_converted_maxsize = 32
 
-    return Lib2to3().convert(spec)
+
+def convert(spec, *, paths=None):
+    """Convert a given OAS 2 spec to OAS 3.
+
+    If 'paths' are passed, only these path items are converted while the rest
+    are left out. Please note, in this case OAS 3 'servers' are built using
+    'schemes' of selected operations only.
+
+    Converted specs are cached, and so the same one is returned to every
+    caller converting the same spec. Callers must not change it.
+    """
+
+    if paths is not None:
+        paths = tuple(paths)
+
+    key = (utils.get_digest(spec), paths)
+    if key in _converted:
+        _converted.move_to_end(key)
+        return _converted[key]
+
+    with _instrumentation.phase("lib2to3"):
+        converted = Lib2to3().convert(spec, paths=paths)
+
+    _converted[key] = converted
+    if len(_converted) > _converted_maxsize:
+        _converted.popitem(last=False)
+    return converted
 
 
 def _is_vendor_extension(key):
@@ -86,33 +117,65 @@ def _items_wo_vendor_extensions(node):
         yield key, value
 
 
-class Lib2to3:
-    _target_version = "3.0.3"
-    _injector = picobox.Stack()
+_missing = object()
+
+
+def _insert_into_context(name):
+    """Make a passed node available to nested converters under a given name."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, node, *args, **kwargs):
+            context = self._context
+            previous = context.get(name, _missing)
+            context[name] = node
+
+            try:
+                return fn(self, node, *args, **kwargs)
+            finally:
+                if previous is _missing:
+                    del context[name]
+                else:
+                    context[name] = previous
 
-    def _insert_into_injector(name):
-        def decorator(fn):
-            @functools.wraps(fn)
-            def wrapper(self, node, *args, **kwargs):
-                with Lib2to3._injector.push(picobox.Box(), chain=True) as box:
-                    box.put(name, factory=lambda: node, scope=picobox.threadlocal)
-                    return fn(self, node, *args, **kwargs)
+        return wrapper
 
-            return wrapper
+    return decorator
 
-        return decorator
+
+def _pass_from_context(name):
+    """Pass a node from the context as a keyword argument."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            kwargs[name] = self._context[name]
+            return fn(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class Lib2to3:
+    _target_version = "3.0.3"
 
     def __init__(self):
         self._schemes = set()
 
-    @_insert_into_injector("spec")
-    def convert(self, spec):
+        # Converters of nested nodes may need to access their ancestors (e.g.
+        # 'produces' of operation or spec). Instead of passing them all the way
+        # down the stack, ancestors are memorized by name in this context
+        # while they are being converted.
+        self._context = {}
+
+    @_insert_into_context("spec")
+    def convert(self, spec, *, paths=None):
         # The following OAS 2 fields are ignored and not converted. Mostly due
         # to the fact that we expect *resolved* spec as input, and most of its
         # fields are used to group shared (i.e. referenced) objects that will
         # not exist in the resolved spec.
         #
-        #  - definitions
         #  - parameters
         #  - responses
         #  - securityDefinitions
@@ -122,10 +185,18 @@ class Lib2to3:
         # converted. I simply have no time to work on this, and for
         # sphixcontrib-openapi purposes it's not actually needed.
 
+        selected = spec["paths"]
+        if paths is not None:
+            selected = {
+                key: value
+                for key, value in selected.items()
+                if key in paths or _is_vendor_extension(key)
+            }
+
         converted = {
             "info": spec["info"],
             "openapi": self._target_version,
-            "paths": self.convert_paths(spec["paths"]),
+            "paths": self.convert_paths(selected),
         }
         converted.update(
             _get_properties(spec, {"tags", "externalDocs"}, vendor_extensions=True),
@@ -135,9 +206,16 @@ class Lib2to3:
         if servers:
             converted["servers"] = servers
 
+        # Definitions are passed as they are, just like any other schema.
+        # Since the spec is resolved, they are the very same objects that
+        # are used in operations, and so they can tell what schemas are
+        # shared.
+        if spec.get("definitions"):
+            converted["components"] = {"schemas": spec["definitions"]}
+
         return converted
 
-    @_insert_into_injector("paths")
+    @_insert_into_context("paths")
     def convert_paths(self, paths):
         converted = _get_properties(paths, {}, vendor_extensions=True)
 
@@ -146,7 +224,7 @@ class Lib2to3:
 
         return converted
 
-    @_insert_into_injector("path")
+    @_insert_into_context("path")
     def convert_path(self, path):
         converted = _get_properties(path, {}, vendor_extensions=True)
 
@@ -158,8 +236,9 @@ class Lib2to3:
 
         return converted
 
-    @_insert_into_injector("operation")
+    @_insert_into_context("operation")
     def convert_operation(self, operation):
+        _instrumentation.count("convert_operation")
         converted = _get_properties(
             operation,
             {
@@ -196,7 +275,7 @@ class Lib2to3:
         converted["responses"] = self.convert_responses(operation["responses"])
         return converted
 
-    @_injector.pass_("spec")
+    @_pass_from_context("spec")
     def convert_request_body(self, operation, *, spec):
         # OAS 3 expects an explicitly specified mimetype of the request body.
         # It's not clear what to do if OAS 2 'consumes' is not defined. Let's
@@ -217,7 +296,7 @@ class Lib2to3:
 
         return None
 
-    @_injector.pass_("spec")
+    @_pass_from_context("spec")
     def convert_request_body_formdata(self, operation, *, spec):
         consumes = (
             operation.get("consumes")
@@ -257,7 +336,7 @@ class Lib2to3:
             return None
         return {"content": {mimetype: {"schema": schema} for mimetype in mimetypes}}
 
-    @_insert_into_injector("parameters")
+    @_insert_into_context("parameters")
     def convert_parameters(self, parameters):
         return [
             self.convert_parameter(parameter)
@@ -269,7 +348,7 @@ class Lib2to3:
             if parameter["in"] in {"query", "header", "path"}
         ]
 
-    @_insert_into_injector("parameter")
+    @_insert_into_context("parameter")
     def convert_parameter(self, parameter):
         schema = _get_schema_properties(
             parameter,
@@ -303,7 +382,7 @@ class Lib2to3:
 
         return converted
 
-    @_insert_into_injector("responses")
+    @_insert_into_context("responses")
     def convert_responses(self, responses):
         converted = _get_properties(responses, {}, vendor_extensions=True)
 
@@ -312,9 +391,9 @@ class Lib2to3:
 
         return converted
 
-    @_injector.pass_("spec")
-    @_injector.pass_("operation")
-    @_insert_into_injector("response")
+    @_pass_from_context("spec")
+    @_pass_from_context("operation")
+    @_insert_into_context("response")
     def convert_response(self, response, *, spec, operation):
         converted = _get_properties(response, {"description"}, vendor_extensions=True)
 
@@ -0,0 +1,355 @@
+"""Partial loading of specs.
+
+A directive that renders a few endpoints of a large spec doesn't need the
+whole spec to be constructed. The loader below skips path items that aren't
+selected while composing the document, so no nodes are even created for
+them. Then, only selected path items and document-level properties are
+constructed, plus entries of reusable sections (e.g. ``components/schemas``
+or ``definitions``) that are transitively reachable from them via local JSON
+references.
+
+Whenever the loader can't guarantee the result is equivalent to a fully
+loaded spec (e.g. a skipped path item defines a YAML anchor, or there's a
+JSON reference to something that has been skipped), it falls back to
+loading the whole document.
+"""
+
+import os
+import re
+
+from urllib.parse import unquote, urldefrag
+from urllib.request import url2pathname
+
+import yaml
+
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.events import (
+    AliasEvent,
+    CollectionEndEvent,
+    CollectionStartEvent,
+    MappingEndEvent,
+)
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+from yaml.resolver import Resolver
+
+from sphinxcontrib.openapi import _yaml
+
+__all__ = [
+    "get_path_selector",
+    "load",
+]
+
+
+# Top-level properties holding named entries that are meant to be referenced,
+# mapped to the depth of entries within them. Everything else is loaded
+# unconditionally.
+_REUSABLE_SECTIONS = {
+    # OpenAPI 3.x
+    "components": 2,
+    # OpenAPI 2.0 (f.k.a. Swagger)
+    "definitions": 1,
+    "parameters": 1,
+    "responses": 1,
+}
+
+# Components that are looked up by name rather than referenced.
+_UNREFERENCED_COMPONENTS = {"securitySchemes"}
+
+
+class _Fallback(Exception):
+    """The spec can't be loaded partially."""
+
+
+def get_path_selector(options):
+    """Return a predicate for path items selected by rendering options.
+
+    The predicate mirrors path selection done by renderers, i.e. 'paths',
+    'include' and 'exclude' options. If none of them is passed, 'None' is
+    returned since every path item is selected.
+    """
+
+    if not any(option in options for option in ("paths", "include", "exclude")):
+        return None
+
+    paths = set(options.get("paths", []))
+    include = [re.compile(pattern) for pattern in options.get("include", [])]
+    exclude = [re.compile(pattern) for pattern in options.get("exclude", [])]
+    include_all = "paths" not in options and "include" not in options
+
+    def _is_selected(path):
+        if not (
+            include_all
+            or path in paths
+            or any(pattern.match(path) for pattern in include)
+        ):
+            return False
+        return not any(pattern.match(path) for pattern in exclude)
+
+    return _is_selected
+
+
+class _PartialLoader(Composer, _yaml.Parser, SafeConstructor, Resolver):
+    def __init__(self, stream, is_selected):
+        # Even though only a part of the document is composed, the whole
+        # document has to be parsed, hence the fastest parser is used.
+        _yaml.Parser.__init__(self, stream)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+        self._is_selected = is_selected
+        self._depth = 0
+        self._is_paths = False
+        self._skipped_anchors = set()
+
+    def compose_node(self, parent, index):
+        if self.check_event(AliasEvent):
+            if self.peek_event().anchor in self._skipped_anchors:
+                raise _Fallback()
+        return super().compose_node(parent, index)
+
+    def compose_mapping_node(self, anchor):
+        # That's a simplified version of the original composer that doesn't
+        # compose values of path items that aren't selected.
+        start_event = self.get_event()
+        tag = start_event.tag
+        if tag is None or tag == "!":
+            tag = self.resolve(MappingNode, None, start_event.implicit)
+        node = MappingNode(
+            tag,
+            [],
+            start_event.start_mark,
+            None,
+            flow_style=start_event.flow_style,
+        )
+        if anchor is not None:
+            self.anchors[anchor] = node
+
+        is_paths, self._is_paths = self._is_paths, False
+        self._depth += 1
+
+        while not self.check_event(MappingEndEvent):
+            item_key = self.compose_node(node, None)
+
+            if (
+                is_paths
+                and isinstance(item_key, ScalarNode)
+                and not self._is_selected(item_key.value)
+            ):
+                self._skip_node()
+                continue
+
+            # Path items are direct children of the 'paths' property of
+            # the document, which is the only mapping at depth 1.
+            self._is_paths = (
+                self._depth == 1
+                and isinstance(item_key, ScalarNode)
+                and item_key.value == "paths"
+            )
+            item_value = self.compose_node(node, item_key)
+            self._is_paths = False
+            node.value.append((item_key, item_value))
+
+        self._depth -= 1
+        end_event = self.get_event()
+        node.end_mark = end_event.end_mark
+        return node
+
+    def compose_sequence_node(self, anchor):
+        self._is_paths = False
+        self._depth += 1
+        try:
+            return super().compose_sequence_node(anchor)
+        finally:
+            self._depth -= 1
+
+    def _skip_node(self):
+        depth = 0
+        while True:
+            event = self.get_event()
+
+            # Skipped anchors can't be resolved later, so it's crucial to
+            # memorize them in order to tell when they are used.
+            if not isinstance(event, AliasEvent) and getattr(event, "anchor", None):
+                self._skipped_anchors.add(event.anchor)
+
+            if isinstance(event, CollectionStartEvent):
+                depth += 1
+            elif isinstance(event, CollectionEndEvent):
+                depth -= 1
+
+            if depth == 0:
+                return
+
+
+def _iterchildren(node):
+    if isinstance(node, MappingNode):
+        for key, value in node.value:
+            yield key, value
+    elif isinstance(node, SequenceNode):
+        for value in node.value:
+            yield None, value
+
+
+def _iterrefs(node, seen):
+    """Yield JSON references found within a given node."""
+
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+
+        for key, value in _iterchildren(node):
+            if _get_name(key) == "$ref" and isinstance(value, ScalarNode):
+                yield value.value
+            else:
+                stack.append(value)
+
+
+def _get_name(node):
+    return node.value if isinstance(node, ScalarNode) else None
+
+
+def _get_child(node, name):
+    if isinstance(node, MappingNode):
+        for key, value in node.value:
+            if _get_name(key) == name:
+                return value
+    return None
+
+
+def _get_pointer(ref, path):
+    """Return a pointer of a given JSON reference to a document at 'path'.
+
+    If the reference points to another document, 'None' is returned.
+    """
+
+    url, fragment = urldefrag(ref)
+    if url:
+        if path is None or "://" in url:
+            return None
+        other = os.path.join(os.path.dirname(path), url2pathname(url))
+        if os.path.normpath(other) != os.path.normpath(path):
+            return None
+
+    return [
+        unquote(part).replace("~1", "/").replace("~0", "~")
+        for part in fragment.split("/")[1:]
+    ]
+
+
+class _CompactPartialLoader(_yaml.CompactConstructor, _PartialLoader):
+    pass
+
+
+def _prune(node, location, reusable, depth):
+    """Return a copy of a reusable section node that has only loaded entries."""
+
+    pruned = MappingNode(node.tag, [])
+    for key, value in node.value:
+        entry = location + (_get_name(key),)
+        if entry in reusable:
+            pruned.value.append((key, value))
+        elif depth > 1 and isinstance(value, MappingNode):
+            pruned.value.append((key, _prune(value, entry, reusable, depth - 1)))
+    return pruned
+
+
+def _load_partial(stream, is_selected, path, compact):
+    loader_cls = _CompactPartialLoader if compact else _PartialLoader
+    loader = loader_cls(stream, is_selected)
+    try:
+        root = loader.get_single_node()
+        # Merge keys may bring reusable sections from elsewhere, so let's not
+        # bother to support them on the document level.
+        if not isinstance(root, MappingNode) or _get_child(root, "<<") is not None:
+            raise _Fallback()
+
+        # Reusable entries to be loaded, keyed by their location within the
+        # document. Everything but reusable sections is loaded regardless.
+        reusable = {}
+        seen = set()
+        pending = []
+        for key, value in root.value:
+            if _get_name(key) not in _REUSABLE_SECTIONS:
+                pending.append(value)
+            elif _get_name(key) == "components":
+                for name in _UNREFERENCED_COMPONENTS:
+                    component = _get_child(value, name)
+                    if component is not None:
+                        reusable[("components", name)] = component
+                        pending.append(component)
+
+        while pending:
+            for ref in _iterrefs(pending.pop(), seen):
+                pointer = _get_pointer(ref, path)
+                if pointer is None:
+                    continue
+
+                depth = _REUSABLE_SECTIONS.get(pointer[0] if pointer else None)
+                if depth is None:
+                    # A reference to something outside of reusable sections
+                    # may point to a skipped path item.
+                    if pointer and pointer[0] == "paths":
+                        raise _Fallback()
+                    continue
+
+                location = tuple(pointer[: depth + 1])
+                if location in reusable or location[:2] in reusable:
+                    continue
+
+                node = root
+                for part in location:
+                    node = _get_child(node, part)
+                if node is None:
+                    raise _Fallback()
+                reusable[location] = node
+                pending.append(node)
+
+        # Build a document that holds only nodes to be loaded, and let the
+        # loader construct it as usual.
+        document = MappingNode(root.tag, [])
+        for key, value in root.value:
+            if _get_name(key) not in _REUSABLE_SECTIONS or not isinstance(
+                value, MappingNode
+            ):
+                document.value.append((key, value))
+                continue
+
+            document.value.append(
+                (
+                    key,
+                    _prune(
+                        value, (key.value,), reusable, _REUSABLE_SECTIONS[key.value]
+                    ),
+                )
+            )
+
+        return loader.construct_document(document)
+    finally:
+        loader.dispose()
+
+
+def load(stream, is_selected=None, path=None, *, compact=False):
+    """Load a spec from a given stream.
+
+    If 'is_selected' predicate is passed, only path items it selects and
+    properties reachable from them are loaded. The 'path' is the location of
+    the loaded document, and is used to tell whether relative JSON
+    references point to the document itself. If 'compact' is passed, equal
+    strings of the spec are shared.
+    """
+
+    if is_selected is None:
+        return _yaml.load(stream, compact=compact)
+
+    position = stream.tell()
+    try:
+        return _load_partial(stream, is_selected, path, compact)
+    except (_Fallback, yaml.YAMLError):
+        # YAML errors are reported by the full load, so they look exactly
+        # the same as if partial loading is off.
+        stream.seek(position)
+        return _yaml.load(stream, compact=compact)
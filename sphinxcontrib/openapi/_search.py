@@ -0,0 +1,203 @@
+"""Client-side search index of rendered operations.
+
+Sphinx's full-text search is neither fast nor precise when it comes to
+looking up an operation of a large API. So when the search index is on,
+operations are collected while specs are rendered, and once the build is
+finished a dedicated index is written next to static files along with a
+small script to look operations up in the browser.
+
+The index consists of a manifest and shards. Search keys (e.g. path
+segments, operation IDs, tags and summary words) are sharded by their
+first characters, and each shard holds its keys in sorted order along with
+operations they point to. So a lookup loads a single shard, and finds keys
+starting with a query by binary search.
+"""
+
+import json
+import os
+import re
+
+from docutils import nodes
+from sphinx import addnodes
+
+__all__ = [
+    "build_index",
+    "note_operations",
+    "setup",
+]
+
+# A number of leading characters of keys that shards are picked by.
+_SHARD_PREFIX_LENGTH = 2
+
+# A directory within static files the index is written to.
+_INDEX_DIR = "openapi-search"
+
+_STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _get_operations(env):
+    if not hasattr(env, "openapi_search_operations"):
+        env.openapi_search_operations = {}
+    return env.openapi_search_operations
+
+
+def note_operations(env, spec, rendered):
+    """Note operations rendered for the current document."""
+
+    if not env.config.openapi_search_index:
+        return
+
+    operations = _get_operations(env).setdefault(env.docname, [])
+    paths = spec.get("paths", {})
+
+    for node in rendered:
+        if not isinstance(node, nodes.Element):
+            continue
+
+        for signode in node.findall(addnodes.desc_signature):
+            if "method" not in signode or not signode["ids"]:
+                continue
+
+            method, path = signode["method"], signode["path"]
+
+            # Callbacks are rendered as operations too, though they aren't
+            # defined among spec paths.
+            operation = paths.get(path, {}).get(method, {})
+            if not isinstance(operation, dict):
+                operation = {}
+
+            operations.append(
+                (
+                    method,
+                    path,
+                    operation.get("operationId", ""),
+                    [str(tag) for tag in operation.get("tags", [])],
+                    operation.get("summary", ""),
+                    signode["ids"][0],
+                )
+            )
+
+
+def _iterkeys(method, path, operation_id, tags, summary):
+    """Iterate over search keys of a given operation."""
+
+    yield method
+    yield path.lower()
+    yield from _WORD_RE.findall(path.lower())
+
+    if operation_id:
+        yield operation_id.lower()
+
+    for tag in tags:
+        yield tag.lower()
+        yield from _WORD_RE.findall(tag.lower())
+
+    yield from _WORD_RE.findall(summary.lower())
+
+
+def build_index(operations):
+    """Build a search index of given operations.
+
+    Operations are tuples of method, path, operation ID, tags, summary and
+    URI. Returns a manifest, and a list of shards it refers to.
+    """
+
+    postings = {}
+    for i, operation in enumerate(operations):
+        for key in _iterkeys(*operation[:5]):
+            postings.setdefault(key, set()).add(i)
+
+    manifest = {}
+    shards = []
+
+    for key in sorted(postings):
+        prefix = key[:_SHARD_PREFIX_LENGTH]
+        if prefix not in manifest:
+            manifest[prefix] = len(shards)
+            shards.append({"keys": [], "postings": [], "operations": [], "_ids": {}})
+
+        # Operations are stored within shards that refer to them, so a
+        # lookup needs nothing but a single shard. Within a shard, each
+        # operation is stored once.
+        shard = shards[manifest[prefix]]
+        shard_postings = []
+        for i in sorted(postings[key]):
+            if i not in shard["_ids"]:
+                shard["_ids"][i] = len(shard["operations"])
+                method, path, operation_id, tags, summary, uri = operations[i]
+                shard["operations"].append([method, path, operation_id, summary, uri])
+            shard_postings.append(shard["_ids"][i])
+
+        shard["keys"].append(key)
+        shard["postings"].append(shard_postings)
+
+    for shard in shards:
+        del shard["_ids"]
+
+    return {"prefixLength": _SHARD_PREFIX_LENGTH, "shards": manifest}, shards
+
+
+def _dump(value, path):
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(value, stream, ensure_ascii=False, separators=(",", ":"))
+
+
+def _purge_doc(app, env, docname):
+    _get_operations(env).pop(docname, None)
+
+
+def _merge_info(app, env, docnames, other):
+    operations = _get_operations(env)
+
+    for docname, noted in _get_operations(other).items():
+        if docname in docnames:
+            operations[docname] = noted
+
+
+def _builder_inited(app):
+    if not app.config.openapi_search_index or app.builder.format != "html":
+        return
+
+    app.config.html_static_path.append(_STATIC_DIR)
+    app.add_js_file("openapi-search.js")
+
+
+def _build_finished(app, exception):
+    if (
+        exception is not None
+        or not app.config.openapi_search_index
+        or app.builder.format != "html"
+    ):
+        return
+
+    operations = []
+    for docname, noted in sorted(_get_operations(app.env).items()):
+        uri = app.builder.get_target_uri(docname)
+        for method, path, operation_id, tags, summary, anchor in noted:
+            operations.append(
+                (method, path, operation_id, tags, summary, f"{uri}#{anchor}")
+            )
+
+    manifest, shards = build_index(operations)
+
+    index_dir = os.path.join(app.outdir, "_static", _INDEX_DIR)
+    os.makedirs(index_dir, exist_ok=True)
+
+    # Shards are numbered, so the ones left from previous builds have to be
+    # removed lest they are mistaken for current ones.
+    for name in os.listdir(index_dir):
+        os.remove(os.path.join(index_dir, name))
+
+    for i, shard in enumerate(shards):
+        _dump(shard, os.path.join(index_dir, f"{i}.json"))
+    _dump(manifest, os.path.join(index_dir, "index.json"))
+
+
+def setup(app):
+    app.add_config_value("openapi_search_index", False, "env")
+    app.connect("env-purge-doc", _purge_doc)
+    app.connect("env-merge-info", _merge_info)
+    app.connect("builder-inited", _builder_inited)
+    app.connect("build-finished", _build_finished)
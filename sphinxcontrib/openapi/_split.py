@@ -0,0 +1,207 @@
+"""Generation of per-operation (or per-tag) documents.
+
+Sphinx reads documents in parallel, but a single document is always read by
+a single worker, so a page that renders a large spec takes as long as all of
+its operations take to render. When a spec is split, a document is generated
+for each of its operations (or tags) along with an index page, and they are
+read in parallel with ``sphinx-build -j``.
+
+Generated documents carry content digests of the operations they render, and
+are rewritten only when they change. Unlike regular documents, they don't
+depend on the spec file itself, so changing a few operations of a spec makes
+Sphinx read only the documents that render them.
+"""
+
+import os
+import re
+
+from sphinx.util import logging
+from sphinxcontrib.httpdomain import http_resource_anchor
+
+from sphinxcontrib.openapi import _hashing, directive, utils
+
+__all__ = [
+    "is_generated",
+    "setup",
+]
+
+logger = logging.getLogger(__name__)
+
+# The first line of generated documents, so they can be told apart from
+# documents written by hand, which are never overwritten nor removed.
+_HEADER = ".. Generated by sphinxcontrib-openapi from "
+
+_SPLIT_BY = {"operation", "tag"}
+
+
+def _slugify(text):
+    return re.sub(r"[^\w.-]+", "-", text).strip("-").lower() or "default"
+
+
+def _write_title(lines, title, char="="):
+    lines.extend([title, char * len(title), ""])
+
+
+def _write_directive(lines, spec_path, options, endpoint, method):
+    lines.append(f".. openapi:: /{spec_path}")
+    lines.extend(["   :paths:", f"      {endpoint}", "   :methods:", f"      {method}"])
+
+    for option, value in options.items():
+        if value is None or value is True:
+            lines.append(f"   :{option}:")
+        elif isinstance(value, (list, tuple)):
+            lines.append(f"   :{option}:")
+            lines.extend(f"      {item}" for item in value)
+        else:
+            lines.append(f"   :{option}: {value}")
+    lines.append("")
+
+
+def _iteroperations(spec):
+    for endpoint, path in spec.get("paths", {}).items():
+        for method, operation in path.items():
+            if method.lower() in utils.HTTP_METHODS:
+                yield endpoint, method, operation
+
+
+def _get_documents(spec, spec_path, settings):
+    """Return generated documents keyed by their names."""
+
+    by = settings.get("by", "operation")
+    options = settings.get("options", {})
+    hashes = _hashing.Hashes()
+    header = f"{_HEADER}{spec_path}, do not edit."
+
+    groups = {}
+    if by == "tag":
+        for tag in spec.get("tags", []):
+            groups[tag["name"]] = []
+    for endpoint, method, operation in _iteroperations(spec):
+        if by == "tag":
+            key = (operation.get("tags") or ["default"])[0]
+        else:
+            key = f"{method.upper()} {endpoint}"
+        groups.setdefault(key, []).append((endpoint, method, operation))
+
+    tag_descriptions = {
+        tag["name"]: tag.get("description", "") for tag in spec.get("tags", [])
+    }
+    documents = {}
+
+    for title, operations in groups.items():
+        if not operations:
+            continue
+
+        if by == "tag":
+            name = _slugify(title)
+        else:
+            name = http_resource_anchor(operations[0][1], operations[0][0])
+
+        # Names may clash once they are slugified, e.g. '/pets' and '/Pets'
+        # on case-insensitive filesystems.
+        base, i = name, 1
+        while name.lower() in {"index"} | {other.lower() for other in documents}:
+            name, i = f"{base}-{i}", i + 1
+
+        # Digests are what tells whether a document has to be read again,
+        # since the document itself doesn't depend on the spec file.
+        lines = [header]
+        lines.extend(
+            f".. digest: {hashes.digest(operation)}" for _, _, operation in operations
+        )
+        lines.append("")
+        _write_title(lines, title)
+
+        if tag_descriptions.get(title) and by == "tag":
+            lines.extend(tag_descriptions[title].strip().splitlines())
+            lines.append("")
+
+        for endpoint, method, _ in operations:
+            _write_directive(lines, spec_path, options, endpoint, method)
+        documents[name] = lines
+
+    index = [header, ""]
+    _write_title(index, settings.get("title") or spec["info"]["title"])
+    index.extend([".. toctree::", "   :maxdepth: 1", ""])
+    index.extend(f"   {name}" for name in documents)
+    index.append("")
+    documents["index"] = index
+
+    return documents
+
+
+def _write_file(path, text):
+    try:
+        with open(path, encoding="utf-8") as stream:
+            if stream.read() == text:
+                return
+    except OSError:
+        pass
+
+    with open(path, "w", encoding="utf-8") as stream:
+        stream.write(text)
+
+
+def _is_generated_file(path):
+    try:
+        with open(path, encoding="utf-8") as stream:
+            return stream.readline().startswith(_HEADER)
+    except OSError:
+        return False
+
+
+def _generate(app, directory, settings):
+    if settings.get("by", "operation") not in _SPLIT_BY:
+        raise ValueError(
+            "invalid 'openapi_split_specs' value: '%s' must be split by one "
+            "of: %s" % (directory, ", ".join(sorted(_SPLIT_BY)))
+        )
+
+    spec_path = settings["spec"].lstrip("/")
+    abspath = os.path.join(app.srcdir, spec_path)
+    spec = utils.normalize_spec(
+        directive._get_spec(
+            abspath,
+            app.config.source_encoding,
+            None,
+            app.config.openapi_compact_loading,
+        ),
+        uri="file://%s" % abspath,
+    )
+
+    outdir = os.path.join(app.srcdir, directory)
+    os.makedirs(outdir, exist_ok=True)
+
+    documents = _get_documents(spec, spec_path, settings)
+    for name, lines in documents.items():
+        _write_file(os.path.join(outdir, name + ".rst"), "\n".join(lines))
+
+    # Documents of removed operations must not outlive them.
+    for filename in os.listdir(outdir):
+        name, ext = os.path.splitext(filename)
+        path = os.path.join(outdir, filename)
+        if ext == ".rst" and name not in documents and _is_generated_file(path):
+            os.remove(path)
+
+    logger.info("[openapi] %d documents generated from %s", len(documents), spec_path)
+    return [
+        os.path.join(directory, name).replace(os.path.sep, "/") for name in documents
+    ]
+
+
+def is_generated(env, docname):
+    """Return 'True' if a given document is generated from a split spec."""
+
+    return docname in getattr(env, "openapi_split_docnames", ())
+
+
+def _builder_inited(app):
+    docnames = set()
+    for directory, settings in app.config.openapi_split_specs.items():
+        docnames.update(_generate(app, directory, settings))
+    app.env.openapi_split_docnames = docnames
+
+
+def setup(app):
+    app.add_config_value("openapi_split_specs", {}, "env")
+    app.connect("builder-inited", _builder_inited)
@@ -0,0 +1,378 @@
+"""Validation of specs before they are rendered.
+
+Renderers assume specs are valid, and an invalid one fails deep inside of
+rendering with an error that tells nothing about what's wrong with the spec.
+When validation is on (see ``openapi_validate``), a spec is validated before
+it's rendered, either structurally or fully:
+
+* Structural validation checks only what renderers rely on, i.e. types of
+  path items, operations, parameters, request bodies and responses, and
+  properties they look up. It doesn't look into schemas, so it takes
+  milliseconds even for large specs.
+
+* Full validation checks the spec against the OpenAPI meta-schema of its
+  version, along with the structural checks. Meta-schemas are either set by
+  ``openapi_validate_schemas`` or come from ``openapi-spec-validator``, if
+  installed. Validators are compiled once per process, and results are
+  cached by spec content, so a spec rendered by many directives is validated
+  once.
+"""
+
+import collections
+import functools
+
+import jsonschema
+from sphinx.util import logging
+
+from sphinxcontrib.openapi import _hashing, _instrumentation, utils
+
+try:
+    from openapi_spec_validator import schemas as _bundled_schemas
+except ImportError:  # pragma: no cover
+    _bundled_schemas = None
+
+__all__ = [
+    "LEVELS",
+    "check",
+    "set_schemas",
+    "setup",
+    "validate",
+]
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ("structural", "full")
+
+# Meta-schemas provided by openapi-spec-validator, keyed by OpenAPI versions.
+_BUNDLED_SCHEMAS = {
+    "2.0": "schema_v2",
+    "3.0": "schema_v30",
+    "3.1": "schema_v31",
+}
+
+# Meta-schemas set by users, keyed by OpenAPI versions.
+_schemas = {}
+
+# Errors of fully validated specs, keyed by their content digests.
+_CACHE_SIZE = 128
+_cache = collections.OrderedDict()
+
+# A number of errors to report, the rest are only counted.
+_MAX_REPORTED_ERRORS = 10
+
+
+def _escape(token):
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _get_pointer(path):
+    return "/" + "/".join(_escape(token) for token in path)
+
+
+def _get_version(spec):
+    """Return a version of a spec as it's referred to by meta-schemas."""
+
+    if spec.get("swagger") == "2.0":
+        return "2.0"
+
+    version = spec.get("openapi")
+    if isinstance(version, str):
+        for known in ("3.0", "3.1"):
+            if version == known or version.startswith(known + "."):
+                return known
+    return None
+
+
+def _is_ref(node):
+    # References are resolved once a spec is normalized, and until then
+    # there's nothing to check but the reference itself.
+    return isinstance(node.get("$ref"), str)
+
+
+class _StructuralValidator:
+    """Checks what renderers rely on, and collects errors."""
+
+    def __init__(self, version):
+        self._version = version
+        self.errors = []
+
+    def _error(self, path, message):
+        self.errors.append((tuple(path), message))
+
+    def _check_mapping(self, node, path):
+        if not isinstance(node, dict):
+            self._error(path, f"{node!r} is not of type 'object'")
+            return False
+        return True
+
+    def _check_list(self, node, path):
+        if not isinstance(node, list):
+            self._error(path, f"{node!r} is not of type 'array'")
+            return False
+        return True
+
+    def _check_strings(self, node, path, *properties):
+        for name in properties:
+            if name in node and not isinstance(node[name], str):
+                self._error(path + [name], f"{node[name]!r} is not of type 'string'")
+
+    def _check_required(self, node, path, *properties):
+        for name in properties:
+            if name not in node:
+                self._error(path, f"{name!r} is a required property")
+
+    def check_spec(self, spec):
+        if "paths" not in spec:
+            # Webhooks-only specs of OpenAPI 3.1 have no paths.
+            if self._version != "3.1":
+                self._check_required(spec, [], "paths")
+            return
+
+        if not self._check_mapping(spec["paths"], ["paths"]):
+            return
+
+        for endpoint, path_item in spec["paths"].items():
+            self.check_path_item(path_item, ["paths", endpoint])
+
+        tags = spec.get("tags", [])
+        if self._check_list(tags, ["tags"]):
+            for i, tag in enumerate(tags):
+                if self._check_mapping(tag, ["tags", i]):
+                    self._check_required(tag, ["tags", i], "name")
+
+    def check_path_item(self, path_item, path):
+        if not self._check_mapping(path_item, path) or _is_ref(path_item):
+            return
+
+        self.check_parameters(path_item, path)
+
+        for method, operation in path_item.items():
+            if method.lower() in utils.HTTP_METHODS:
+                self.check_operation(operation, path + [method])
+
+    def check_operation(self, operation, path):
+        if not self._check_mapping(operation, path):
+            return
+
+        self._check_strings(operation, path, "summary", "description", "operationId")
+        self.check_parameters(operation, path)
+
+        if "tags" in operation and self._check_list(operation["tags"], path + ["tags"]):
+            for i, tag in enumerate(operation["tags"]):
+                if not isinstance(tag, str):
+                    self._error(path + ["tags", i], f"{tag!r} is not of type 'string'")
+
+        if "requestBody" in operation:
+            self.check_request_body(operation["requestBody"], path + ["requestBody"])
+
+        # Responses are optional since OpenAPI 3.1, yet they are required
+        # before.
+        if "responses" not in operation:
+            if self._version != "3.1":
+                self._check_required(operation, path, "responses")
+            return
+
+        responses = operation["responses"]
+        if self._check_mapping(responses, path + ["responses"]):
+            for status, response in responses.items():
+                self.check_response(response, path + ["responses", status])
+
+    def check_parameters(self, node, path):
+        if "parameters" not in node:
+            return
+
+        path = path + ["parameters"]
+        if not self._check_list(node["parameters"], path):
+            return
+
+        for i, parameter in enumerate(node["parameters"]):
+            if not self._check_mapping(parameter, path + [i]) or _is_ref(parameter):
+                continue
+
+            self._check_required(parameter, path + [i], "name", "in")
+            self._check_strings(parameter, path + [i], "name", "in", "description")
+
+            if self._version == "2.0":
+                if parameter.get("in") == "body":
+                    self._check_required(parameter, path + [i], "schema")
+            elif "schema" not in parameter and "content" not in parameter:
+                self._error(path + [i], "'schema' or 'content' is a required property")
+
+            if "schema" in parameter:
+                self._check_mapping(parameter["schema"], path + [i, "schema"])
+
+    def check_request_body(self, request_body, path):
+        if not self._check_mapping(request_body, path) or _is_ref(request_body):
+            return
+
+        self._check_required(request_body, path, "content")
+        self.check_content(request_body, path)
+
+    def check_response(self, response, path):
+        if not self._check_mapping(response, path) or _is_ref(response):
+            return
+
+        self._check_strings(response, path, "description")
+        if self._version == "2.0":
+            if "schema" in response:
+                self._check_mapping(response["schema"], path + ["schema"])
+        else:
+            self.check_content(response, path)
+
+    def check_content(self, node, path):
+        if "content" not in node:
+            return
+
+        path = path + ["content"]
+        if not self._check_mapping(node["content"], path):
+            return
+
+        for media_type, content in node["content"].items():
+            if not self._check_mapping(content, path + [media_type]):
+                continue
+
+            if "schema" in content:
+                self._check_mapping(content["schema"], path + [media_type, "schema"])
+
+            examples = content.get("examples", {})
+            if self._check_mapping(examples, path + [media_type, "examples"]):
+                for name, example in examples.items():
+                    self._check_mapping(example, path + [media_type, "examples", name])
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator(version):
+    """Return a compiled meta-schema validator, or 'None' if there's none."""
+
+    schema = _schemas.get(version)
+    if schema is None and _bundled_schemas is not None:
+        schema = getattr(_bundled_schemas, _BUNDLED_SCHEMAS[version], None)
+    if schema is None:
+        logger.warning(
+            "[openapi] no meta-schema of OpenAPI %s to fully validate specs "
+            "against; install openapi-spec-validator or set "
+            "'openapi_validate_schemas'. Specs are validated structurally.",
+            version,
+        )
+        return None
+
+    # Bundled meta-schemas are lazy proxies, and validators want the real
+    # thing.
+    schema = dict(schema)
+    cls = jsonschema.validators.validator_for(schema)
+    return cls(schema)
+
+
+def _validate_fully(spec, version):
+    validator = _get_validator(version)
+    if validator is None:
+        return []
+
+    key = (version, _hashing.Hashes().digest(spec))
+
+    errors = _cache.get(key)
+    if errors is None:
+        _instrumentation.count("validate_spec")
+        errors = [
+            (tuple(error.absolute_path), error.message)
+            for error in validator.iter_errors(spec)
+        ]
+        _cache[key] = errors
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return errors
+
+
+def validate(spec, level="structural"):
+    """Return errors of a spec as a list of pointers along with messages.
+
+    The level is either ``structural`` or ``full``, see the module docstring
+    for details. The spec is either a raw one or a normalized one.
+    """
+
+    if level not in LEVELS:
+        raise ValueError(
+            "Unknown validation level '%s', expected one of: %s."
+            % (level, ", ".join(LEVELS))
+        )
+
+    if not isinstance(spec, dict):
+        return [("/", f"{spec!r} is not of type 'object'")]
+
+    version = _get_version(spec)
+    if version is None:
+        return [("/", "neither 'swagger: \"2.0\"' nor 'openapi: 3.0.x/3.1.x' is set")]
+
+    validator = _StructuralValidator(version)
+    validator.check_spec(spec)
+    errors = [(_get_pointer(path), message) for path, message in validator.errors]
+
+    if level == "full":
+        for path, message in _validate_fully(spec, version):
+            error = (_get_pointer(path), message)
+            if error not in errors:
+                errors.append(error)
+    return errors
+
+
+def check(spec, level, source):
+    """Raise 'ValueError' if a spec is not valid.
+
+    Validation is off unless the level is set. The error lists what's wrong
+    with the spec, and 'source' tells which spec it is.
+    """
+
+    if not level:
+        return
+    level = "full" if level is True else level
+
+    # Valid specs are marked as such, so a spec that is rendered by a few
+    # directives is validated once.
+    validated = utils.get_validation_level(spec) if isinstance(spec, dict) else None
+    if validated in (level, "full"):
+        return
+
+    with _instrumentation.phase("validate"):
+        errors = validate(spec, level)
+
+    if errors:
+        lines = [f"{pointer}: {message}" for pointer, message in errors]
+        if len(lines) > _MAX_REPORTED_ERRORS:
+            lines[_MAX_REPORTED_ERRORS:] = [
+                "... and %d more" % (len(lines) - _MAX_REPORTED_ERRORS)
+            ]
+        raise ValueError(
+            "%s is not a valid OpenAPI spec:\n  %s" % (source, "\n  ".join(lines))
+        )
+
+    utils.set_validation_level(spec, level)
+
+
+def set_schemas(schemas):
+    """Set meta-schemas to validate specs against, keyed by OpenAPI versions.
+
+    Versions are ``2.0``, ``3.0`` and ``3.1``, and the ones that are not set
+    fall back to meta-schemas of openapi-spec-validator, if installed.
+    """
+
+    _schemas.clear()
+    _schemas.update(schemas or {})
+    _get_validator.cache_clear()
+    _cache.clear()
+
+
+def _config_inited(app, conf):
+    if conf.openapi_validate not in (False, None, True) + LEVELS:
+        raise ValueError(
+            "Unknown 'openapi_validate' value '%s', expected one of: %s."
+            % (conf.openapi_validate, ", ".join(LEVELS))
+        )
+    set_schemas(conf.openapi_validate_schemas)
+
+
+def setup(app):
+    app.add_config_value("openapi_validate", False, "")
+    app.add_config_value("openapi_validate_schemas", {}, "")
+    app.connect("config-inited", _config_inited)
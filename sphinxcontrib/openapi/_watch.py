@@ -0,0 +1,58 @@
+"""Watching specs for changes.
+
+A spec and files it refers to are polled for changes. There are only a few
+files to check, and checking one is a single 'stat' call, so polling costs
+next to nothing while working everywhere, unlike file system notifications.
+"""
+
+import logging
+import os
+import time
+
+__all__ = [
+    "watch",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def _get_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def watch(render, paths=(), interval=0.1, is_running=lambda: True):
+    """Call 'render' each time files it depends on are changed.
+
+    'render' is called right away, and must return paths of files it
+    depends on. If it fails (e.g. a spec is being edited and is invalid at
+    the moment), the error is logged and the files it depended on last time
+    (or given 'paths' initially) are watched.
+    """
+
+    paths = list(paths)
+
+    while True:
+        # Files may be changed while they are rendered, so modification times
+        # are taken beforehand in order not to miss such changes.
+        mtimes = _get_mtimes(paths)
+        try:
+            paths = render()
+        except Exception:
+            logger.exception("Cannot render the spec")
+        mtimes = dict(
+            _get_mtimes(paths),
+            **{path: mtime for path, mtime in mtimes.items() if path in paths},
+        )
+
+        while is_running():
+            time.sleep(interval)
+            if _get_mtimes(paths) != mtimes:
+                break
+        else:
+            return
@@ -0,0 +1,79 @@
+"""YAML loading primitives shared by spec loaders.
+
+Large specs are mostly made of the same few strings: property names, types,
+formats, media types, etc. A regular loader creates a separate string object
+for each occurrence, so a compact loader is provided that shares equal
+strings within a document, both mapping keys and values.
+"""
+
+import yaml
+
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+try:
+    # LibYAML parser is way faster than the pure Python one, so it's used
+    # when available.
+    from yaml.cyaml import CParser as Parser
+except ImportError:
+    from yaml.parser import Parser as _Parser
+    from yaml.reader import Reader
+    from yaml.scanner import Scanner
+
+    class Parser(Reader, Scanner, _Parser):
+        def __init__(self, stream):
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            _Parser.__init__(self)
+
+
+__all__ = [
+    "CompactConstructor",
+    "CompactLoader",
+    "Parser",
+    "load",
+]
+
+
+class CompactConstructor(SafeConstructor):
+    """Safe constructor that shares equal strings within a document."""
+
+    def construct_yaml_str(self, node):
+        value = super().construct_yaml_str(node)
+
+        try:
+            strings = self._strings
+        except AttributeError:
+            strings = self._strings = {}
+        return strings.setdefault(value, value)
+
+
+CompactConstructor.add_constructor(
+    "tag:yaml.org,2002:str", CompactConstructor.construct_yaml_str
+)
+
+
+class CompactLoader(Composer, Parser, CompactConstructor, Resolver):
+    def __init__(self, stream):
+        Parser.__init__(self, stream)
+        Composer.__init__(self)
+        CompactConstructor.__init__(self)
+        Resolver.__init__(self)
+
+
+def load(stream, *, compact=False):
+    """Load a single YAML document from a given stream.
+
+    If 'compact' is passed, equal strings of the document are shared.
+    Otherwise, it's the same as 'yaml.safe_load()'.
+    """
+
+    if not compact:
+        return yaml.safe_load(stream)
+
+    loader = CompactLoader(stream)
+    try:
+        return loader.get_single_data()
+    finally:
+        loader.dispose()
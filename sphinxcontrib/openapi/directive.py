@@ -9,18 +9,63 @@
 """
 
 import functools
+import os
 
+from docutils import nodes
 from docutils.parsers.rst import directives
+from docutils.statemachine import ViewList
 from sphinx.util.docutils import SphinxDirective
-import yaml
+from sphinx.util.nodes import nested_parse_with_titles
+
+from sphinxcontrib.openapi import (
+    _dependencies, _diff, _instrumentation, _partial, _search, _split, _validate,
+    renderers, utils)
 
 
 # Locally cache spec to speedup processing of same spec file in multiple
 # openapi directives
 @functools.lru_cache()
-def _get_spec(abspath, encoding):
+def _load_spec(abspath, mtime, size, encoding, selection, compact):
+    # Both modification time and size are part of the cache key, so a spec
+    # is loaded again once it's changed (e.g. between builds in the same
+    # process).
+    #
+    # Selection is a hashable version of path selection options, and when
+    # passed only selected path items (and what they refer to) are loaded.
+    is_selected = None
+    if selection is not None:
+        is_selected = _partial.get_path_selector(dict(selection))
+
     with open(abspath, 'rt', encoding=encoding) as stream:
-        return yaml.safe_load(stream)
+        return _partial.load(stream, is_selected, abspath, compact=compact)
+
+
+def _get_spec(abspath, encoding, selection=None, compact=False):
+    stat = os.stat(abspath)
+    return _load_spec(
+        abspath, stat.st_mtime_ns, stat.st_size, encoding, selection, compact)
+
+
+def _get_selection(options):
+    selection = tuple(
+        (option, tuple(options[option]))
+        for option in ('paths', 'include', 'exclude')
+        if option in options
+    )
+    return selection or None
+
+
+# Renderer options that can be set project-wide in Sphinx's config, mapped to
+# the corresponding config values.
+_CONFIG_OPTIONS = {
+    'workers': 'openapi_render_workers',
+    'executor': 'openapi_render_executor',
+    'max-properties': 'openapi_max_properties',
+    'max-depth': 'openapi_max_depth',
+    'max-items': 'openapi_max_items',
+    'max-example-bytes': 'openapi_max_example_bytes',
+    'max-example-lines': 'openapi_max_example_lines',
+}
 
 
 def create_directive_from_renderer(renderer_cls):
@@ -39,20 +84,110 @@ def create_directive_from_renderer(renderer_cls):
         def run(self):
             relpath, abspath = self.env.relfn2path(directives.path(self.arguments[0]))
 
+            # Memory used by the pipeline is reported per spec and per
+            # directive, if it's traced at all.
+            with _instrumentation.phase('directive', spec=relpath):
+                rendered = self._render(relpath, abspath)
+            _instrumentation.log_memory(location=(self.env.docname, self.lineno))
+            return rendered
+
+        def _render(self, relpath, abspath):
             # URI parameter is crucial for resolving relative references. So we
             # need to set this option properly as it's used later down the
             # stack.
             self.options.setdefault('uri', 'file://%s' % abspath)
 
+            # Options that aren't passed explicitly fall back to Sphinx's
+            # config, if the renderer supports them at all.
+            for option, config_name in _CONFIG_OPTIONS.items():
+                if option in renderer_cls.option_spec:
+                    self.options.setdefault(option, self.config[config_name])
+
             # Add a given OpenAPI spec as a dependency of the referring
             # reStructuredText document, so the document is rebuilt each time
-            # the spec is changed.
-            self.env.note_dependency(relpath)
+            # the spec is changed. Documents generated from a split spec are
+            # regenerated whenever operations they render change, so they are
+            # the only exception.
+            is_generated = _split.is_generated(self.env, self.env.docname)
+            if not is_generated:
+                _dependencies.note_dependency(self.env, relpath)
 
             # Read the spec using encoding passed to the directive or fallback to
             # the one specified in Sphinx's config.
             encoding = self.options.get('encoding', self.config.source_encoding)
-            spec = _get_spec(abspath, encoding)
-            return renderer_cls(self.state, self.options).render(spec)
+            selection = None
+            if self.config.openapi_partial_loading:
+                selection = _get_selection(self.options)
+            with _instrumentation.phase('load'):
+                spec = _get_spec(
+                    abspath, encoding, selection, self.config.openapi_compact_loading)
+
+            # An invalid spec is reported before any work is done, rather than
+            # failing somewhere in the middle of rendering.
+            _validate.check(spec, self.config.openapi_validate, relpath)
+            rendered = renderer_cls(self.state, self.options).render(spec)
+
+            # The spec may have references to other local files which are
+            # known only once it's normalized by the renderer. They must be
+            # tracked as well, so the document is rebuilt each time they are
+            # changed.
+            for path in utils.get_local_files(spec):
+                if not is_generated:
+                    _dependencies.note_dependency(self.env, path)
+
+            # Rendered operations are collected for the search index, if it's
+            # enabled.
+            _search.note_operations(self.env, spec, rendered)
+
+            return rendered
 
     return _RenderingDirective
+
+
+class ChangelogDirective(SphinxDirective):
+    """Render changes between two versions of a spec."""
+
+    required_arguments = 2                  # paths to old and new specs
+    option_spec = dict(
+        {
+            'encoding': directives.encoding,
+        },
+        **{
+            option: converter
+            for option, converter in renderers.HttpdomainRenderer.option_spec.items()
+            # Operations are diffed and rendered one by one, so selecting and
+            # rendering them concurrently makes no sense.
+            if option not in {'paths', 'workers', 'executor', 'shared-schemas'}
+        }
+    )
+
+    def _get_spec(self, path):
+        relpath, abspath = self.env.relfn2path(directives.path(path))
+        _dependencies.note_dependency(self.env, relpath)
+
+        encoding = self.options.get('encoding', self.config.source_encoding)
+        spec = _get_spec(abspath, encoding, None, self.config.openapi_compact_loading)
+        _validate.check(spec, self.config.openapi_validate, relpath)
+        spec = utils.normalize_spec(spec, uri='file://%s' % abspath)
+
+        for path in utils.get_local_files(spec):
+            _dependencies.note_dependency(self.env, path)
+        return spec
+
+    def run(self):
+        old, new = (self._get_spec(path) for path in self.arguments)
+
+        for option, config_name in _CONFIG_OPTIONS.items():
+            if option in self.option_spec:
+                self.options.setdefault(option, self.config[config_name])
+
+        renderer = renderers.HttpdomainRenderer(self.state, self.options)
+
+        viewlist = ViewList()
+        for line in _diff.render_changelog(renderer, old, new):
+            viewlist.append(line, '<openapi-changelog>')
+
+        node = nodes.section()
+        node.document = self.state.document
+        nested_parse_with_titles(self.state, viewlist, node)
+        return node.children
@@ -10,80 +10,77 @@
 """
 
 import collections
-import itertools
 import re
 
 from sphinxcontrib.openapi import utils
 
 
-def _httpresource(endpoint, method, properties, convert):
+def _httpresource(writer, endpoint, method, properties, convert):
     parameters = properties.get('parameters', [])
     responses = properties['responses']
-    indent = '   '
 
-    yield '.. http:{0}:: {1}'.format(method, endpoint)
-    yield '   :synopsis: {0}'.format(properties.get('summary', 'null'))
-    yield ''
+    writer.write('.. http:%s:: %s' % (method, endpoint))
+    writer.push()
+    writer.write(':synopsis: %s' % properties.get('summary', 'null'))
+    writer.write()
 
     if 'summary' in properties:
         for line in properties['summary'].splitlines():
-            yield '{indent}**{line}**'.format(**locals())
-        yield ''
+            writer.write('**%s**' % line)
+        writer.write()
 
     if 'description' in properties:
-        for line in convert(properties['description']).splitlines():
-            yield '{indent}{line}'.format(**locals())
-        yield ''
+        writer.writelines(convert(properties['description']).splitlines())
+        writer.write()
 
     for param in filter(lambda p: p['in'] == 'path', parameters):
-        yield indent + ':param {type} {name}:'.format(**param)
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+        writer.write(':param {type} {name}:'.format(**param))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
 
     # print request's query params
     for param in filter(lambda p: p['in'] == 'query', parameters):
-        yield indent + ':query {type} {name}:'.format(**param)
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+        writer.write(':query {type} {name}:'.format(**param))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
 
     # print the json body params
     for param in filter(lambda p: p['in'] == 'body', parameters):
         if 'schema' in param:
-            yield ''
-            for line in convert_json_schema(param['schema']):
-                yield '{indent}{line}'.format(**locals())
-            yield ''
+            writer.write()
+            writer.writelines(convert_json_schema(param['schema']))
+            writer.write()
 
     # print response status codes
     for status, response in sorted(responses.items()):
-        yield '{indent}:status {status}:'.format(**locals())
-        for line in convert(response.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+        writer.write(':status %s:' % status)
+        with writer.indented():
+            writer.writelines(convert(response.get('description', '')).splitlines())
 
     # print request header params
     for param in filter(lambda p: p['in'] == 'header', parameters):
-        yield indent + ':reqheader {name}:'.format(**param)
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+        writer.write(':reqheader {name}:'.format(**param))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
 
     # print response headers
     for status, response in responses.items():
         for headername, header in response.get('headers', {}).items():
-            yield indent + ':resheader {name}:'.format(name=headername)
-            for line in convert(header.get('description', '')).splitlines():
-                yield '{indent}{indent}{line}'.format(**locals())
+            writer.write(':resheader %s:' % headername)
+            with writer.indented():
+                writer.writelines(convert(header.get('description', '')).splitlines())
 
     for status, response in responses.items():
         if not is_2xx_response(status):
             continue
         if 'schema' in response:
-            yield ''
-            for line in convert_json_schema(
-                    response['schema'], directive=':>json'):
-                yield '{indent}{line}'.format(**locals())
-            yield ''
+            writer.write()
+            writer.writelines(convert_json_schema(
+                response['schema'], directive=':>json'))
+            writer.write()
 
-    yield ''
+    writer.pop()
+    writer.write()
 
 
 def convert_json_schema(schema, directive=':<json'):
@@ -165,13 +162,13 @@ def is_2xx_response(status):
     return False
 
 
-def _header(title):
-    yield title
-    yield '=' * len(title)
-    yield ''
+def _header(writer, title):
+    writer.write(title)
+    writer.write('=' * len(title))
+    writer.write()
 
 
-def openapihttpdomain(spec, **options):
+def openapihttpdomain(spec, render_cache=None, **options):
     if 'examples' in options:
         raise ValueError(
             'Rendering examples is not supported for OpenAPI v2.x specs.')
@@ -180,8 +177,6 @@ def openapihttpdomain(spec, **options):
         raise ValueError(
             'The :request: option is not supported for OpenAPI v2.x specs.')
 
-    generators = []
-
     # OpenAPI spec may contain JSON references, common properties, etc.
     # Trying to render the spec "As Is" will require to put multiple
     # if-s around the code. In order to simplify flow, let's make the
@@ -224,40 +219,38 @@ def openapihttpdomain(spec, **options):
                     _paths.append(path)
         paths = _paths
 
+    operations = [
+        (endpoint, method, properties)
+        for endpoint in paths
+        for method, properties in spec['paths'][endpoint].items()
+        if not options.get('methods') or method in options.get('methods')
+    ]
+
     if 'group' in options:
         groups = collections.OrderedDict(
             [(x['name'], []) for x in spec.get('tags', {})]
             )
 
-        for endpoint in paths:
-            for method, properties in spec['paths'][endpoint].items():
-                if options.get('methods') and method not in options.get('methods'):
-                    continue
-                key = properties.get('tags', [''])[0]
-                groups.setdefault(key, []).append(_httpresource(
-                    endpoint,
-                    method,
-                    properties,
-                    utils.get_text_converter(options),
-                    ))
-
-        for key in groups.keys():
-            if key:
-                generators.append(_header(key))
-            else:
-                generators.append(_header('default'))
-
-            generators.extend(groups[key])
+        for operation in operations:
+            key = operation[2].get('tags', [''])[0]
+            groups.setdefault(key, []).append(operation)
     else:
-        for endpoint in paths:
-            for method, properties in spec['paths'][endpoint].items():
-                if options.get('methods') and method not in options.get('methods'):
-                    continue
-                generators.append(_httpresource(
-                    endpoint,
-                    method,
-                    properties,
-                    utils.get_text_converter(options),
-                    ))
-
-    return iter(itertools.chain(*generators))
+        groups = {None: operations}
+
+    writer = utils.MarkupWriter()
+    for key, group in groups.items():
+        if key is not None:
+            _header(writer, key or 'default')
+
+        for endpoint, method, properties in group:
+            utils.write_operation(
+                writer,
+                render_cache,
+                _httpresource,
+                endpoint,
+                method,
+                properties,
+                utils.get_text_converter(options),
+                )
+
+    return iter(writer.lines)
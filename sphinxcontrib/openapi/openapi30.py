@@ -13,8 +13,6 @@ import copy
 import collections
 import collections.abc
 
-from datetime import datetime
-import itertools
 import json
 import re
 from urllib import parse
@@ -22,7 +20,7 @@ from http.client import responses as http_status_codes
 
 from sphinx.util import logging
 
-from sphinxcontrib.openapi import utils
+from sphinxcontrib.openapi import _json, schema_utils, utils
 
 
 LOG = logging.getLogger(__name__)
@@ -41,8 +39,8 @@ _TYPE_MAPPING = {
     ('string', None): 'string',  # string
     ('string', 'byte'): 'c3RyaW5n',  # b'string' encoded in base64,  # byte
     ('string', 'binary'): '01010101',  # binary
-    ('string', 'date'): datetime.now().date().isoformat(),  # date
-    ('string', 'date-time'): datetime.now().isoformat(),  # dateTime
+    ('string', 'date'): schema_utils.get_example_date,  # date
+    ('string', 'date-time'): schema_utils.get_example_datetime,  # dateTime
     ('string', 'password'): '********',  # password
 
     # custom extensions to handle common formats
@@ -79,13 +77,21 @@ def _dict_merge(dct, merge_dct):
             dct[k] = merge_dct[k]
 
 
-def _parse_schema(schema, method):
+def _parse_schema(schema, method, spending=None, depth=0):
     """
     Convert a Schema Object to a Python object.
 
     Args:
         schema: An ``OrderedDict`` representing the schema object.
+        spending: A tracker of a budget the object is generated within.
+        depth: A number of objects and arrays the schema is nested in.
     """
+    if spending is None:
+        spending = schema_utils.get_spending()
+
+    if spending.is_exhausted:
+        return schema_utils.TRUNCATED
+
     if method and schema.get('readOnly', False):
         return _READONLY_PROPERTY
 
@@ -95,7 +101,7 @@ def _parse_schema(schema, method):
         for x in schema['allOf'][1:]:
             _dict_merge(schema_, x)
 
-        return _parse_schema(schema_, method)
+        return _parse_schema(schema_, method, spending, depth)
 
     # anyOf: Must be valid against any of the subschemas
     # TODO(stephenfin): Handle anyOf
@@ -103,28 +109,33 @@ def _parse_schema(schema, method):
     # oneOf: Must be valid against exactly one of the subschemas
     if 'oneOf' in schema:
         # we only show the first one since we can't show everything
-        return _parse_schema(schema['oneOf'][0], method)
+        return _parse_schema(schema['oneOf'][0], method, spending, depth)
 
     if 'enum' in schema:
         # we only show the first one since we can't show everything
-        return schema['enum'][0]
+        return spending.spend(schema['enum'][0])
 
     schema_type = schema.get('type', 'object')
 
+    if schema_type in ('array', 'object') and \
+            spending.budget.is_too_deep(depth):
+        return schema_utils.TRUNCATED
+
     if schema_type == 'array':
         # special case oneOf and anyOf so that we can show examples for all
         # possible combinations
-        if 'oneOf' in schema['items']:
-            return [
-                _parse_schema(x, method) for x in schema['items']['oneOf']
-            ]
-
-        if 'anyOf' in schema['items']:
-            return [
-                _parse_schema(x, method) for x in schema['items']['anyOf']
-            ]
-
-        return [_parse_schema(schema['items'], method)]
+        for combinator in ('oneOf', 'anyOf'):
+            if combinator in schema['items']:
+                results = []
+                for x in schema['items'][combinator]:
+                    if spending.is_exhausted or \
+                            spending.budget.is_too_many_items(len(results)):
+                        results.append(schema_utils.TRUNCATED)
+                        break
+                    results.append(_parse_schema(x, method, spending, depth + 1))
+                return results
+
+        return [_parse_schema(schema['items'], method, spending, depth + 1)]
 
     if schema_type == 'object':
         if method and 'properties' in schema and \
@@ -134,20 +145,30 @@ def _parse_schema(schema, method):
 
         results = []
         for name, prop in schema.get('properties', {}).items():
-            result = _parse_schema(prop, method)
+            if spending.is_exhausted or \
+                    spending.budget.is_too_many_properties(len(results)):
+                results.append((schema_utils.TRUNCATED, schema_utils.TRUNCATED))
+                break
+            result = _parse_schema(prop, method, spending, depth + 1)
             if result != _READONLY_PROPERTY:
-                results.append((name, result))
+                results.append((spending.spend(name), result))
 
         return collections.OrderedDict(results)
 
     if (schema_type, schema.get('format')) in _TYPE_MAPPING:
-        return _TYPE_MAPPING[(schema_type, schema.get('format'))]
+        example = _TYPE_MAPPING[(schema_type, schema.get('format'))]
+    else:
+        example = _TYPE_MAPPING[(schema_type, None)]  # unrecognized format
 
-    return _TYPE_MAPPING[(schema_type, None)]  # unrecognized format
+    # Some examples depend on the build settings, and thus are produced by
+    # functions.
+    if callable(example):
+        example = example()
+    return spending.spend(example)
 
 
-def _example(media_type_objects, method=None, endpoint=None, status=None,
-             nb_indent=0):
+def _example(writer, media_type_objects, method=None, endpoint=None,
+             status=None, budget=None):
     """
     Format examples in `Media Type Object` openapi v3 to HTTP request or
     HTTP response example.
@@ -155,15 +176,15 @@ def _example(media_type_objects, method=None, endpoint=None, status=None,
     else status should be provided to print a response example.
 
     Arguments:
+        writer (utils.MarkupWriter): The writer to write examples to at its
+            current indentation.
         media_type_objects (Dict[str, Dict]): Dict containing
             Media Type Objects.
         method: The HTTP method to use in example.
         endpoint: The HTTP route to use in example.
         status: The HTTP status to use in example.
+        budget (schema_utils.Budget): Limits of generated examples.
     """
-    indent = '   '
-    extra_indent = indent * nb_indent
-
     if method is not None:
         method = method.upper()
     else:
@@ -182,6 +203,9 @@ def _example(media_type_objects, method=None, endpoint=None, status=None,
     for content_type, content in media_type_objects.items():
         examples = content.get('examples')
         example = content.get('example')
+        # Generated examples are new objects every time, so there's no point
+        # in caching their serialized lines.
+        generated = False
 
         # Try to get the example from the schema
         if example is None and 'schema' in content:
@@ -194,7 +218,10 @@ def _example(media_type_objects, method=None, endpoint=None, status=None,
                         None:
                     LOG.info('skipping non-JSON example generation.')
                     continue
-                example = _parse_schema(content['schema'], method=method)
+                example = _parse_schema(
+                    content['schema'], method=method,
+                    spending=schema_utils.get_spending(budget))
+                generated = True
 
             if method is None:
                 examples['Example response'] = {
@@ -205,12 +232,6 @@ def _example(media_type_objects, method=None, endpoint=None, status=None,
                     'value': example,
                 }
 
-        for example in examples.values():
-            # According to OpenAPI v3 specs, string examples should be left unchanged
-            if not isinstance(example['value'], str):
-                example['value'] = json.dumps(
-                    example['value'], indent=4, separators=(',', ': '))
-
         for example_name, example in examples.items():
             if 'summary' in example:
                 example_title = '{example_name} - {example[summary]}'.format(
@@ -218,77 +239,80 @@ def _example(media_type_objects, method=None, endpoint=None, status=None,
             else:
                 example_title = example_name
 
-            yield ''
-            yield '{extra_indent}**{example_title}:**'.format(**locals())
-            yield ''
-            yield '{extra_indent}.. sourcecode:: http'.format(**locals())
-            yield ''
-
-            # Print http request example
-            if method:
-                yield '{extra_indent}{indent}{method} {endpoint} HTTP/1.1' \
-                    .format(**locals())
-                yield '{extra_indent}{indent}Host: example.com' \
-                    .format(**locals())
-                if content_type:
-                    yield '{extra_indent}{indent}Content-Type: {content_type}'\
-                        .format(**locals())
-
-            # Print http response example
-            else:
-                yield '{extra_indent}{indent}HTTP/1.1 {status} {status_text}' \
-                    .format(**locals())
-                yield '{extra_indent}{indent}Content-Type: {content_type}' \
-                    .format(**locals())
-
-            yield ''
-            for example_line in example['value'].splitlines():
-                yield '{extra_indent}{indent}{example_line}'.format(**locals())
-            if example['value'].splitlines():
-                yield ''
-
-
-def _httpresource(endpoint, method, properties, convert, render_examples,
-                  render_request):
+            writer.write()
+            writer.write('**%s:**' % example_title)
+            writer.write()
+            writer.write('.. sourcecode:: http')
+            writer.write()
+
+            with writer.indented():
+                # Print http request example
+                if method:
+                    writer.write('%s %s HTTP/1.1' % (method, endpoint))
+                    writer.write('Host: example.com')
+                    if content_type:
+                        writer.write('Content-Type: %s' % content_type)
+
+                # Print http response example
+                else:
+                    writer.write('HTTP/1.1 %s %s' % (status, status_text))
+                    writer.write('Content-Type: %s' % content_type)
+
+                writer.write()
+                # According to OpenAPI v3 specs, string examples should be left
+                # unchanged
+                if isinstance(example['value'], str):
+                    example_lines = example['value'].splitlines()
+                    writer.writelines(example_lines)
+                else:
+                    example_lines = _json.getlines(
+                        example['value'], 4, writer.prefix, not generated)
+                    writer.writeraw(example_lines)
+            if example_lines:
+                writer.write()
+
+
+def _httpresource(writer, endpoint, method, properties, convert,
+                  render_examples, render_request, budget=None):
     # https://github.com/OAI/OpenAPI-Specification/blob/3.0.2/versions/3.0.0.md#operation-object
     parameters = properties.get('parameters', [])
     responses = properties['responses']
     query_param_examples = []
-    indent = '   '
 
-    yield '.. http:{0}:: {1}'.format(method, endpoint)
-    yield '   :synopsis: {0}'.format(properties.get('summary', 'null'))
-    yield ''
+    writer.write('.. http:%s:: %s' % (method, endpoint))
+    writer.push()
+    writer.write(':synopsis: %s' % properties.get('summary', 'null'))
+    writer.write()
 
     if 'summary' in properties:
         for line in properties['summary'].splitlines():
-            yield '{indent}**{line}**'.format(**locals())
-        yield ''
+            writer.write('**%s**' % line)
+        writer.write()
 
     if 'description' in properties:
-        for line in convert(properties.get('description', '')).splitlines():
-            yield '{indent}{line}'.format(**locals())
-        yield ''
+        writer.writelines(convert(properties.get('description', '')).splitlines())
+        writer.write()
 
     # print request's path params
     for param in filter(lambda p: p['in'] == 'path', parameters):
-        yield indent + ':param {type} {name}:'.format(
+        writer.write(':param {type} {name}:'.format(
             type=param['schema']['type'],
-            name=param['name'])
-
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+            name=param['name']))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
 
     # print request's query params
     for param in filter(lambda p: p['in'] == 'query', parameters):
-        yield indent + ':query {type} {name}:'.format(
+        writer.write(':query {type} {name}:'.format(
             type=param['schema']['type'],
-            name=param['name'])
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+            name=param['name']))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
+            if param.get('required', False):
+                writer.write('(Required)')
         if param.get('required', False):
-            yield '{indent}{indent}(Required)'.format(**locals())
-            example = _parse_schema(param['schema'], method)
+            example = _parse_schema(
+                param['schema'], method, schema_utils.get_spending(budget))
             example = param.get('example', example)
             if param.get('explode', False) and isinstance(example, list):
                 for v in example:
@@ -306,14 +330,12 @@ def _httpresource(endpoint, method, properties, convert, render_examples,
             schema = request_content['application/json']['schema']
             req_properties = json.dumps(schema['properties'], indent=2,
                                         separators=(',', ':'))
-            yield '{indent}**Request body:**'.format(**locals())
-            yield ''
-            yield '{indent}.. sourcecode:: json'.format(**locals())
-            yield ''
-            for line in req_properties.splitlines():
-                # yield indent + line
-                yield '{indent}{indent}{line}'.format(**locals())
-                # yield ''
+            writer.write('**Request body:**')
+            writer.write()
+            writer.write('.. sourcecode:: json')
+            writer.write()
+            with writer.indented():
+                writer.writelines(req_properties.splitlines())
 
     # print request example
     if render_examples:
@@ -324,71 +346,64 @@ def _httpresource(endpoint, method, properties, convert, render_examples,
 
         # print request example
         request_content = properties.get('requestBody', {}).get('content', {})
-        for line in _example(
-                request_content,
-                method,
-                endpoint=endpoint_examples,
-                nb_indent=1):
-            yield line
+        _example(writer, request_content, method, endpoint=endpoint_examples,
+                 budget=budget)
 
     # print response status codes
     for status, response in responses.items():
-        yield '{indent}:status {status}:'.format(**locals())
-        for line in convert(response.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
+        writer.write(':status %s:' % status)
+        with writer.indented():
+            writer.writelines(convert(response.get('description', '')).splitlines())
 
-        # print response example
-        if render_examples:
-            for line in _example(
-                    response.get('content', {}), status=status, nb_indent=2):
-                yield line
+            # print response example
+            if render_examples:
+                _example(writer, response.get('content', {}), status=status,
+                         budget=budget)
 
     # print request header params
     for param in filter(lambda p: p['in'] == 'header', parameters):
-        yield indent + ':reqheader {name}:'.format(**param)
-        for line in convert(param.get('description', '')).splitlines():
-            yield '{indent}{indent}{line}'.format(**locals())
-        if param.get('required', False):
-            yield '{indent}{indent}(Required)'.format(**locals())
+        writer.write(':reqheader {name}:'.format(**param))
+        with writer.indented():
+            writer.writelines(convert(param.get('description', '')).splitlines())
+            if param.get('required', False):
+                writer.write('(Required)')
 
     # print response headers
     for status, response in responses.items():
         for headername, header in response.get('headers', {}).items():
-            yield indent + ':resheader {name}:'.format(name=headername)
-            for line in convert(header.get('description', '')).splitlines():
-                yield '{indent}{indent}{line}'.format(**locals())
+            writer.write(':resheader %s:' % headername)
+            with writer.indented():
+                writer.writelines(convert(header.get('description', '')).splitlines())
 
     for cb_name, cb_specs in properties.get('callbacks', {}).items():
-        yield ''
-        yield indent + '.. admonition:: Callback: ' + cb_name
-        yield ''
-
-        for cb_endpoint in cb_specs.keys():
-            for cb_method, cb_properties in cb_specs[cb_endpoint].items():
-                for line in _httpresource(
+        writer.write()
+        writer.write('.. admonition:: Callback: ' + cb_name)
+        writer.write()
+
+        with writer.indented():
+            for cb_endpoint in cb_specs.keys():
+                for cb_method, cb_properties in cb_specs[cb_endpoint].items():
+                    _httpresource(
+                        writer,
                         cb_endpoint,
                         cb_method,
                         cb_properties,
                         convert=convert,
                         render_examples=render_examples,
-                        render_request=render_request):
-                    if line:
-                        yield indent+indent+line
-                    else:
-                        yield ''
-
-    yield ''
+                        render_request=render_request,
+                        budget=budget)
 
+    writer.pop()
+    writer.write()
 
-def _header(title):
-    yield title
-    yield '=' * len(title)
-    yield ''
 
+def _header(writer, title):
+    writer.write(title)
+    writer.write('=' * len(title))
+    writer.write()
 
-def openapihttpdomain(spec, **options):
-    generators = []
 
+def openapihttpdomain(spec, render_cache=None, **options):
     # OpenAPI spec may contain JSON references, common properties, etc.
     # Trying to render the spec "As Is" will require to put multiple
     # if-s around the code. In order to simplify flow, let's make the
@@ -436,40 +451,43 @@ def openapihttpdomain(spec, **options):
         render_request = True
 
     convert = utils.get_text_converter(options)
+    budget = schema_utils.Budget.from_options(options)
 
     # https://github.com/OAI/OpenAPI-Specification/blob/3.0.2/versions/3.0.0.md#paths-object
+    operations = [
+        (endpoint, method, properties)
+        for endpoint in paths
+        for method, properties in spec['paths'][endpoint].items()
+        if not options.get('methods') or method in options.get('methods')
+    ]
+
     if 'group' in options:
         groups = collections.OrderedDict(
             [(x['name'], []) for x in spec.get('tags', {})]
             )
 
-        for endpoint in paths:
-            for method, properties in spec['paths'][endpoint].items():
-                key = properties.get('tags', [''])[0]
-                groups.setdefault(key, []).append(_httpresource(
-                    endpoint,
-                    method,
-                    properties,
-                    convert,
-                    render_examples='examples' in options,
-                    render_request=render_request))
-
-        for key in groups.keys():
-            if key:
-                generators.append(_header(key))
-            else:
-                generators.append(_header('default'))
-
-            generators.extend(groups[key])
+        for operation in operations:
+            key = operation[2].get('tags', [''])[0]
+            groups.setdefault(key, []).append(operation)
     else:
-        for endpoint in paths:
-            for method, properties in spec['paths'][endpoint].items():
-                generators.append(_httpresource(
-                    endpoint,
-                    method,
-                    properties,
-                    convert,
-                    render_examples='examples' in options,
-                    render_request=render_request))
-
-    return iter(itertools.chain(*generators))
+        groups = {None: operations}
+
+    writer = utils.MarkupWriter()
+    for key, group in groups.items():
+        if key is not None:
+            _header(writer, key or 'default')
+
+        for endpoint, method, properties in group:
+            utils.write_operation(
+                writer,
+                render_cache,
+                _httpresource,
+                endpoint,
+                method,
+                properties,
+                convert,
+                render_examples='examples' in options,
+                render_request=render_request,
+                budget=budget)
+
+    return iter(writer.lines)
@@ -2,60 +2,123 @@
 
 import collections
 import collections.abc
+import concurrent.futures
 import copy
+import dataclasses
 import functools
 import http.client
-import json
+import itertools
+import urllib.parse
+import urllib.request
 
 import deepmerge
 import docutils.parsers.rst.directives as directives
-import requests
 import sphinx.util.logging as logging
 import sphinx_mdinclude
 
-from sphinxcontrib.openapi import _lib2to3 as lib2to3, utils
+from sphinxcontrib.openapi import (
+    _fetch,
+    _json,
+    _lib2to3 as lib2to3,
+    schema_utils,
+    utils,
+)
 from sphinxcontrib.openapi.renderers import abc
 from sphinxcontrib.openapi.schema_utils import example_from_schema
 
-CaseInsensitiveDict = requests.structures.CaseInsensitiveDict
-
-
 logger = logging.getLogger(__name__)
 
 
-def indented(generator, indent=3):
-    for item in generator:
-        if item:
-            item = " " * indent + item
-        yield item
+def _get_priorities(order_by):
+    """Return a priority map for a given order."""
 
+    # Passed 'order_by' may be 'None' which means *do not reorder, use natural
+    # order*. In order to avoid special cases in the code, we're simply falling
+    # back to an empty priority map since it effectively means *assume every
+    # item has equal priority*.
+    return {value: i for i, value in enumerate(order_by or [])}
 
-def _iterinorder(iterable, order_by, key=lambda x: x, case_sensitive=False):
+
+def _iterinorder(iterable, priorities, key=lambda x: x, case_sensitive=False):
     """Iterate over iterable in a given order."""
 
-    order_by = collections.defaultdict(
-        # Assume default priority is `Infinity` which means the lowest one.
-        # This value is effectively used if there's no corresponding value in a
-        # given 'order_by' array.
-        lambda: float("Inf"),
-        # Passed 'order_by' may be 'None' which means *do not reorder, use
-        # natural order*. In order to avoid special cases in the code, we're
-        # simply falling back to an empty 'order_by' array since it effectively
-        # means *assume every item in 'iterable' has equal priority*.
-        ((value, i) for i, value in enumerate(order_by or [])),
-    )
+    # If there's no priorities, the natural order is preserved anyway, so
+    # there's no need in sorting.
+    if not priorities:
+        yield from iterable
+        return
+
+    # Assume default priority is `Infinity` which means the lowest one. This
+    # value is effectively used if there's no corresponding value in a given
+    # priority map.
+    lowest = float("Inf")
+
     yield from sorted(
         iterable,
-        key=lambda value: order_by[
-            key(value) if case_sensitive else key(value).lower()
-        ],
+        key=lambda value: priorities.get(
+            key(value) if case_sensitive else key(value).lower(), lowest
+        ),
     )
 
 
-def _iterexamples(media_types, example_preference, examples_from_schemas):
-    """Iterate over examples and return them according to the caller preference."""
+# URL schemes of external examples that are fetched, and the ones that are
+# read from local files. Relative paths have no scheme.
+_REMOTE_SCHEMES = {"http", "https"}
+_LOCAL_SCHEMES = {"", "file"}
+
+
+def _get_scheme(url):
+    return urllib.parse.urlsplit(url).scheme
+
+
+def _get_local_path(url):
+    return urllib.request.url2pathname(urllib.parse.urlsplit(url).path)
+
+
+def _read_external_example(url, budget=None, fetched=None):
+    """Return a text of an external example at a given absolute URL.
+
+    Texts are limited by a budget, and a :data:`schema_utils.TRUNCATED` line
+    is put in place of what's left out. Local files are read only as far as
+    the limits go, while remote ones are fetched unless they are 'fetched'
+    already.
+    """
 
-    for content_type in _iterinorder(media_types, example_preference):
+    budget = budget or schema_utils.Budget()
+    limits = (budget.max_example_bytes, budget.max_example_lines)
+
+    if _get_scheme(url) in _LOCAL_SCHEMES:
+        text, truncated = utils.read_text(_get_local_path(url), *limits)
+    else:
+        text = (fetched or {}).get(url)
+        if text is None:
+            text = _fetch.fetch(url)
+        elif isinstance(text, Exception):
+            raise text
+        text, truncated = utils.truncate_text(text, *limits)
+
+    if truncated:
+        text = "\n".join(text.splitlines() + [schema_utils.TRUNCATED])
+    return text
+
+
+def _iterexamples(
+    media_types,
+    example_priorities,
+    examples_from_schemas,
+    budget=None,
+    external_examples=None,
+    base_uri="",
+):
+    """Iterate over examples and return them according to the caller preference.
+
+    External examples are resolved against 'base_uri', and they are read
+    unless 'external_examples' has them read beforehand (see
+    :func:`_load_external_examples`). Examples are returned as copies with
+    values in place of URLs, so the spec is left intact.
+    """
+
+    for content_type in _iterinorder(media_types, example_priorities):
         media_type = media_types[content_type]
 
         # Look for a example in a bunch of possible places. According to
@@ -66,7 +129,8 @@ def _iterexamples(media_types, example_preference, examples_from_schemas):
         if media_type.get("examples", {}):
             for example in media_type["examples"].values():
                 if "externalValue" in example:
-                    if not example["externalValue"].startswith(("http://", "https://")):
+                    url = urllib.parse.urljoin(base_uri, example["externalValue"])
+                    if _get_scheme(url) not in _REMOTE_SCHEMES | _LOCAL_SCHEMES:
                         logger.warning(
                             "Not supported protocol in 'externalValue': %s",
                             example["externalValue"],
@@ -74,17 +138,24 @@ def _iterexamples(media_types, example_preference, examples_from_schemas):
                         continue
 
                     try:
-                        response = requests.get(example["externalValue"])
-                        response.raise_for_status()
-
-                        example["value"] = response.text
-                        example.pop("externalValue")
+                        text = (external_examples or {}).get(url)
+                        if text is None:
+                            text = _read_external_example(url, budget)
+                        elif isinstance(text, Exception):
+                            raise text
                     except Exception:
                         logger.error(
                             "Cannot retrieve example from: '%s'",
                             example["externalValue"],
                         )
                         continue
+
+                    example = {
+                        key: value
+                        for key, value in example.items()
+                        if key != "externalValue"
+                    }
+                    example["value"] = text
                 break
             else:
                 # If the loop over examples has not been interrupted, we
@@ -100,8 +171,12 @@ def _iterexamples(media_types, example_preference, examples_from_schemas):
             # allows to treat all returned examples the same way.
             example = {"value": media_type["schema"]["example"]}
         elif "schema" in media_type and examples_from_schemas:
-            # Convert schema to example
-            example = {"value": example_from_schema(media_type["schema"])}
+            # Convert schema to example. Generated examples are new objects
+            # every time, so they are marked as such to not be cached.
+            example = {
+                "value": example_from_schema(media_type["schema"], budget),
+                "generated": True,
+            }
             pass
         else:
             continue
@@ -109,6 +184,66 @@ def _iterexamples(media_types, example_preference, examples_from_schemas):
         yield content_type, example
 
 
+def _iterexternalexamples(paths):
+    """Yield examples of given paths that are to be read from URLs."""
+
+    for path in paths.values():
+        for method, operation in path.items():
+            if method.lower() not in utils.HTTP_METHODS:
+                continue
+
+            bodies = [operation.get("requestBody", {})]
+            bodies.extend(operation.get("responses", {}).values())
+
+            for body in bodies:
+                if not isinstance(body, collections.abc.Mapping):
+                    continue
+
+                for media_type in body.get("content", {}).values():
+                    # Only the first example is rendered, unless preceding
+                    # external ones cannot be fetched.
+                    for example in media_type.get("examples", {}).values():
+                        if not isinstance(example.get("externalValue"), str):
+                            break
+                        yield example
+
+
+def _load_external_examples(paths, base_uri="", budget=None):
+    """Read external examples of given paths.
+
+    Remote examples are fetched concurrently, and local ones are read from
+    files resolved against 'base_uri'. Returns texts of examples, or errors
+    of the ones that failed to be read, keyed by URLs, along with paths of
+    local files that have been read. The spec is shared by directives with
+    different budgets, and local files may change between builds, so texts
+    are not written into the spec.
+    """
+
+    urls = set()
+    for example in _iterexternalexamples(paths):
+        url = urllib.parse.urljoin(base_uri, example["externalValue"])
+        # Not supported schemes are reported once examples are rendered.
+        if _get_scheme(url) in _REMOTE_SCHEMES | _LOCAL_SCHEMES:
+            urls.add(url)
+
+    fetched = _fetch.fetch_all(
+        url for url in urls if _get_scheme(url) in _REMOTE_SCHEMES
+    )
+    examples, local_files = {}, set()
+
+    for url in sorted(urls):
+        try:
+            examples[url] = _read_external_example(url, budget, fetched)
+        except Exception as exc:
+            examples[url] = exc
+            continue
+
+        if _get_scheme(url) in _LOCAL_SCHEMES:
+            local_files.add(_get_local_path(url))
+
+    return examples, sorted(local_files)
+
+
 def _get_markers_from_object(oas_object, schema):
     """Retrieve a bunch of OAS object markers."""
 
@@ -156,6 +291,57 @@ def _is_2xx_status(status_code):
     return str(status_code).startswith("2")
 
 
+def _get_json_schema(media_types):
+    """Return a schema of the first JSON media type, if any."""
+
+    for content_type, content in media_types.items():
+        if _is_json_mimetype(content_type) and content.get("schema"):
+            return content["schema"]
+    return None
+
+
+def _get_response_json_schema(responses):
+    """Return a JSON schema of the first successful response, if any."""
+
+    for status_code, response in responses.items():
+        if _is_2xx_status(status_code):
+            return _get_json_schema(response.get("content", {}))
+    return None
+
+
+def _get_shared_schemas(spec):
+    """Return shared schemas of a given spec keyed by their names."""
+
+    # References are resolved into the very objects they point to, hence the
+    # identity of a schema is enough to tell whether it's a shared one. If
+    # the same schema is available under a few names, the first one is used.
+    seen = set()
+    shared_schemas = {}
+    for name, schema in spec.get("components", {}).get("schemas", {}).items():
+        if isinstance(schema, collections.abc.Mapping) and id(schema) not in seen:
+            seen.add(id(schema))
+            shared_schemas[name] = schema
+    return shared_schemas
+
+
+def _get_schemas_key(state, uri):
+    """Return a key of shared schemas of a spec rendered in a document."""
+
+    settings = state.document.settings if state is not None else None
+    docname = getattr(getattr(settings, "env", None), "docname", "")
+    return utils.get_digest([docname, uri])[:8]
+
+
+def _get_schema_label(key, name):
+    """Return a label to cross-reference a shared schema with.
+
+    Labels are global to a project, so they are prefixed with a key of the
+    spec and the document it's rendered in (see :func:`_get_schemas_key`).
+    """
+
+    return f"openapi-schema-{key}-{name}"
+
+
 def _get_schema_type(schema):
     """Retrieve schema type either by reading 'type' or guessing."""
 
@@ -176,6 +362,198 @@ def _get_schema_type(schema):
     return schema_type
 
 
+# A schema of a field that stands for fields left out due to a budget.
+_TRUNCATED_SCHEMA = {}
+
+# Parameter locations and corresponding httpdomain's fields to render them.
+_PARAMETER_KINDS = {"path": "param", "query": "queryparam", "header": "reqheader"}
+
+
+def _freeze(value):
+    """Return a hashable version of a given option value."""
+
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+@dataclasses.dataclass(frozen=True)
+class _RendererConfig:
+    """Precompiled renderer options.
+
+    Renderer options are passed as a mapping of raw values which is neither
+    hashable nor convenient to use in hot loops. The config is built once per
+    distinct set of options, and holds precomputed lookups next to the
+    option values. Since it's immutable and hashable, it can be used as a
+    cache key as well.
+    """
+
+    paths: tuple = None
+    methods: frozenset = None
+    markup: str = "commonmark"
+    http_methods_order: tuple = ()
+    response_examples_for: frozenset = frozenset()
+    request_parameters_order: tuple = ()
+    request_example_preference: tuple = None
+    response_example_preference: tuple = None
+    generate_examples_from_schemas: bool = False
+    json_schema_description: bool = True
+    shared_schemas: bool = False
+    budget: schema_utils.Budget = schema_utils.Budget()
+    workers: int = 0
+    executor: str = "thread"
+
+    # The following are derived from the options above, and thus are not
+    # taken into account when configs are compared.
+    http_methods_priorities: dict = dataclasses.field(
+        init=False, compare=False, repr=False
+    )
+    request_parameters_priorities: dict = dataclasses.field(
+        init=False, compare=False, repr=False
+    )
+    request_example_priorities: dict = dataclasses.field(
+        init=False, compare=False, repr=False
+    )
+    response_example_priorities: dict = dataclasses.field(
+        init=False, compare=False, repr=False
+    )
+
+    def __post_init__(self):
+        for name, order_by in [
+            ("http_methods_priorities", self.http_methods_order),
+            ("request_parameters_priorities", self.request_parameters_order),
+            ("request_example_priorities", self.request_example_preference),
+            ("response_example_priorities", self.response_example_preference),
+        ]:
+            object.__setattr__(self, name, _get_priorities(order_by))
+
+    @classmethod
+    def from_options(cls, renderer_cls, options):
+        """Return a config for given options of a given renderer class."""
+
+        # Options not supported by the renderer (e.g. 'uri' or 'encoding')
+        # do not affect rendering, and thus must not produce distinct
+        # configs.
+        return cls._from_options(
+            renderer_cls,
+            tuple(
+                (key, _freeze(value))
+                for key, value in sorted(options.items())
+                if key in renderer_cls.option_spec
+            ),
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _from_options(cls, renderer_cls, options):
+        # Defaults come from the renderer class, so subclasses may override
+        # them.
+        options = dict(options)
+        example_preference = options.get("example-preference")
+
+        return cls(
+            paths=options.get("paths"),
+            methods=(
+                frozenset(method.lower() for method in options["methods"])
+                if "methods" in options
+                else None
+            ),
+            markup=options.get("markup", "commonmark"),
+            http_methods_order=tuple(
+                http_method.lower()
+                for http_method in options.get("http-methods-order", [])
+            ),
+            response_examples_for=frozenset(
+                options.get(
+                    "response-examples-for",
+                    renderer_cls._response_examples_for,
+                )
+            ),
+            request_parameters_order=tuple(
+                parameter_type.lower()
+                for parameter_type in options.get(
+                    "request-parameters-order",
+                    renderer_cls._request_parameters_order,
+                )
+            ),
+            request_example_preference=options.get(
+                "request-example-preference", example_preference
+            ),
+            response_example_preference=options.get(
+                "response-example-preference", example_preference
+            ),
+            generate_examples_from_schemas="generate-examples-from-schemas" in options,
+            json_schema_description="no-json-schema-description" not in options,
+            shared_schemas="shared-schemas" in options,
+            budget=schema_utils.Budget.from_options(options),
+            workers=options.get("workers") or 0,
+            executor=options.get("executor") or "thread",
+        )
+
+
+def _render_operation(
+    renderer_cls,
+    options,
+    schemas,
+    schemas_key,
+    external_examples,
+    endpoint,
+    method,
+    operation,
+):
+    """Render OAS operation item in a worker process."""
+
+    # Renderer instances hold a reference to docutils state which cannot be
+    # sent to another process, and nor it is needed to produce markup. So the
+    # renderer is recreated in the worker process from its options.
+    renderer = renderer_cls(None, options)
+
+    # Shared schemas are told apart by identity, which survives pickling only
+    # for objects that are sent together. That's why they are passed along
+    # with operations rather than looked up elsewhere.
+    renderer._set_shared_schemas(dict(schemas))
+    renderer._schemas_key = schemas_key
+    renderer._external_examples = external_examples
+    return list(renderer.render_operation(endpoint, method, operation))
+
+
+def _resolve_combining_schema(schema):
+    if "oneOf" in schema:
+        # The part with merging is a vague one since I only found a
+        # single 'oneOf' example where such merging was assumed, and no
+        # explanations in the spec itself.
+        merged_schema = schema.copy()
+        merged_schema.update(merged_schema.pop("oneOf")[0])
+        return merged_schema
+
+    elif "anyOf" in schema:
+        # The part with merging is a vague one since I only found a
+        # single 'oneOf' example where such merging was assumed, and no
+        # explanations in the spec itself.
+        merged_schema = schema.copy()
+        merged_schema.update(merged_schema.pop("anyOf")[0])
+        return merged_schema
+
+    elif "allOf" in schema:
+        # Since the item is represented by all schemas from the array,
+        # the best we can do is to render them all at once
+        # sequentially. Please note, the only way the end result will
+        # ever make sense is when all schemas from the array are of
+        # object type.
+        merged_schema = schema.copy()
+        for item in merged_schema.pop("allOf"):
+            merged_schema = _merge_mappings(merged_schema, copy.deepcopy(item))
+        return merged_schema
+
+    elif "not" in schema:
+        # Eh.. do nothing because I have no idea what can we do.
+        return {}
+
+    return schema
+
+
 _merge_mappings = deepmerge.Merger(
     [(collections.abc.Mapping, deepmerge.strategy.dict.DictStrategies("merge"))],
     ["override"],
@@ -192,8 +570,14 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
     }
     _response_examples_for = {"200", "201", "202", "2XX"}
     _request_parameters_order = ["header", "path", "query", "cookie"]
+    _executors = {
+        "thread": concurrent.futures.ThreadPoolExecutor,
+        "process": concurrent.futures.ProcessPoolExecutor,
+    }
 
     option_spec = {
+        "paths": lambda s: s.split(),
+        "methods": lambda s: s.split(),
         "markup": functools.partial(directives.choice, values=_markup_converters),
         "http-methods-order": lambda s: s.split(),
         "response-examples-for": None,
@@ -203,48 +587,117 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
         "response-example-preference": None,
         "generate-examples-from-schemas": directives.flag,
         "no-json-schema-description": directives.flag,
+        "shared-schemas": directives.flag,
+        "max-properties": directives.nonnegative_int,
+        "max-depth": directives.nonnegative_int,
+        "max-items": directives.nonnegative_int,
+        "max-example-bytes": directives.nonnegative_int,
+        "max-example-lines": directives.nonnegative_int,
+        "workers": directives.nonnegative_int,
+        "executor": functools.partial(directives.choice, values=_executors),
     }
 
     def __init__(self, state, options):
         super().__init__(state, options)
 
-        self._convert_markup = self._markup_converters[
-            options.get("markup", "commonmark")
-        ]
-        self._http_methods_order = [
-            http_method.lower() for http_method in options.get("http-methods-order", [])
-        ]
-        self._response_examples_for = options.get(
-            "response-examples-for", self._response_examples_for
-        )
-        self._request_parameters_order = [
-            parameter_type.lower()
-            for parameter_type in options.get(
-                "request-parameters-order", self._request_parameters_order
-            )
-        ]
-        self._example_preference = options.get("example-preference")
-        self._request_example_preference = options.get(
-            "request-example-preference", self._example_preference
-        )
-        self._response_example_preference = options.get(
-            "response-example-preference", self._example_preference
-        )
-        self._generate_example_from_schema = "generate-examples-from-schemas" in options
-        self._json_schema_description = "no-json-schema-description" not in options
+        self._config = _RendererConfig.from_options(type(self), options)
+        self._convert_markup = self._markup_converters[self._config.markup]
+        self._executor = self._executors[self._config.executor]
+        self._set_shared_schemas({})
+
+        # Labels of shared schemas are prefixed with a key, so they don't clash
+        # with the ones of other specs and documents. Worker processes have no
+        # document to tell, so the key is passed to them.
+        self._schemas_key = _get_schemas_key(state, options.get("uri", ""))
+
+        # Texts of external examples, or errors of the ones that failed to be
+        # read, keyed by URLs. Examples are read before rendering, so there's
+        # no need to try again while rendering.
+        self._external_examples = {}
+
+        # Relative external examples are resolved against the spec's URI.
+        self._base_uri = options.get("uri", "")
+
+    def _set_shared_schemas(self, shared_schemas):
+        """Set schemas to be cross-referenced rather than expanded."""
+
+        self._shared_schemas = shared_schemas
+        self._schema_names = {
+            id(schema): name for name, schema in shared_schemas.items()
+        }
 
     def render_restructuredtext_markup(self, spec):
         """Spec render entry point."""
         utils.normalize_spec(spec, **self._options)
+        normalized_spec = spec
 
         if spec.get("swagger") == "2.0":
-            spec = lib2to3.convert(spec)
-        yield from self.render_paths(spec.get("paths", {}))
+            # Converting a large spec is costly, so if only some paths are
+            # going to be rendered, only them are worth converting.
+            spec = lib2to3.convert(spec, paths=self._config.paths)
+
+        paths = spec.get("paths", {})
+
+        if self._config.paths is not None:
+            if not set(self._config.paths).issubset(paths):
+                raise ValueError(
+                    "One or more paths are not defined in the spec: %s."
+                    % (", ".join(sorted(set(self._config.paths) - set(paths))),)
+                )
+            paths = {endpoint: paths[endpoint] for endpoint in self._config.paths}
+
+        if self._config.shared_schemas:
+            self._set_shared_schemas(_get_shared_schemas(spec))
+
+        # Local files of external examples are dependencies of the spec, just
+        # like files it has references to.
+        self._external_examples, local_files = _load_external_examples(
+            paths, self._base_uri, self._config.budget
+        )
+        utils.add_local_files(normalized_spec, local_files)
+
+        yield from self.render_paths(paths)
+
+        if self._config.shared_schemas:
+            yield from self.render_schemas(paths)
+
+    def _render(self, write, *args):
+        """Render markup written by a given method."""
+
+        writer = utils.MarkupWriter()
+        write(writer, *args)
+        yield from writer.lines
+
+    def _write_markup(self, writer, text):
+        """Write converted markup text one level deeper."""
+
+        with writer.indented():
+            writer.writelines(self._convert_markup(text).strip().splitlines())
 
     def render_paths(self, paths):
         """Render OAS paths item."""
 
+        return self._render(self._write_paths, paths)
+
+    def _write_paths(self, writer, paths):
+        operations = self._iteroperations(paths)
+
+        if self._config.workers:
+            for lines in self._render_operations_concurrently(operations):
+                writer.writelines(lines)
+                writer.write()
+        else:
+            for endpoint, method, operation in operations:
+                self._write_operation(writer, endpoint, method, operation)
+                writer.write()
+
+    def _iteroperations(self, paths):
+        """Iterate over OAS operations in the order they are rendered."""
+
         for endpoint, path in paths.items():
+            # Specs, converted ones included, are shared by renders, and so
+            # they are copied before they are changed.
+            path = dict(path)
             common_parameters = path.pop("parameters", [])
 
             # OpenAPI's path description may contain objects of different
@@ -254,63 +707,124 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
             for key in {"summary", "description", "servers"}:
                 path.pop(key, None)
 
-            for method in _iterinorder(path, self._http_methods_order):
+            for method in _iterinorder(path, self._config.http_methods_priorities):
+                if (
+                    self._config.methods is not None
+                    and method.lower() not in self._config.methods
+                ):
+                    continue
+
                 operation = path[method]
-                operation.setdefault("parameters", [])
-                operation_parameters_ids = set(
-                    (parameter["name"], parameter["in"])
-                    for parameter in operation["parameters"]
+
+                # Normalized specs have common parameters pushed inside
+                # operations already, so there's nothing to merge.
+                if common_parameters:
+                    operation_parameters = operation.get("parameters", [])
+                    operation_parameters_ids = set(
+                        (parameter["name"], parameter["in"])
+                        for parameter in operation_parameters
+                    )
+                    operation = dict(operation)
+                    operation["parameters"] = [
+                        parameter
+                        for parameter in common_parameters
+                        if (parameter["name"], parameter["in"])
+                        not in operation_parameters_ids
+                    ] + operation_parameters
+
+                yield endpoint, method, operation
+
+    def _render_operations_concurrently(self, operations):
+        """Render OAS operations using a pool of workers."""
+
+        operations = list(operations)
+
+        if not operations:
+            return
+
+        with self._executor(max_workers=self._config.workers) as executor:
+            if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+                # Sending operations to another process one by one is costly,
+                # so let's send them in batches while still giving each worker
+                # a few batches to balance the load.
+                rendered = executor.map(
+                    _render_operation,
+                    itertools.repeat(type(self)),
+                    itertools.repeat(self._options),
+                    itertools.repeat(list(self._shared_schemas.items())),
+                    itertools.repeat(self._schemas_key),
+                    itertools.repeat(
+                        {
+                            # Not every error survives pickling, and it's
+                            # only logged that there's one anyway.
+                            url: (
+                                text if isinstance(text, str) else Exception(str(text))
+                            )
+                            for url, text in self._external_examples.items()
+                        }
+                    ),
+                    *zip(*operations),
+                    chunksize=max(1, len(operations) // (self._config.workers * 4)),
+                )
+            else:
+                rendered = executor.map(
+                    lambda operation: list(self.render_operation(*operation)),
+                    operations,
                 )
-                operation["parameters"] = [
-                    parameter
-                    for parameter in common_parameters
-                    if (parameter["name"], parameter["in"])
-                    not in operation_parameters_ids
-                ] + operation["parameters"]
 
-                yield from self.render_operation(endpoint, method, operation)
-                yield ""
+            # The executor yields results in the order operations are passed,
+            # which is exactly the order they must be rendered in.
+            yield from rendered
 
     def render_operation(self, endpoint, method, operation):
         """Render OAS operation item."""
 
-        yield f".. http:{method}:: {endpoint}"
+        return self._render(self._write_operation, endpoint, method, operation)
 
-        if operation.get("deprecated"):
-            yield "   :deprecated:"
-        yield ""
+    def _write_operation(self, writer, endpoint, method, operation):
+        writer.write(f".. http:{method}:: {endpoint}")
 
-        if operation.get("summary"):
-            yield f"   **{operation['summary']}**"
-            yield ""
+        with writer.indented():
+            if operation.get("deprecated"):
+                writer.write(":deprecated:")
+            writer.write()
 
-        if operation.get("description"):
-            yield from indented(
-                self._convert_markup(operation["description"]).strip().splitlines()
-            )
-            yield ""
+            if operation.get("summary"):
+                writer.write(f"**{operation['summary']}**")
+                writer.write()
 
-        yield from indented(self.render_parameters(operation.get("parameters", [])))
-        if "requestBody" in operation:
-            yield from indented(
-                self.render_request_body(operation["requestBody"], endpoint, method)
-            )
-        yield from indented(self.render_responses(operation["responses"]))
+            if operation.get("description"):
+                writer.writelines(
+                    self._convert_markup(operation["description"]).strip().splitlines()
+                )
+                writer.write()
+
+            self._write_parameters(writer, operation.get("parameters", []))
+            if "requestBody" in operation:
+                self._write_request_body(
+                    writer, operation["requestBody"], endpoint, method
+                )
+            self._write_responses(writer, operation["responses"])
 
     def render_parameters(self, parameters):
         """Render OAS operation's parameters."""
 
+        return self._render(self._write_parameters, parameters)
+
+    def _write_parameters(self, writer, parameters):
         for parameter in _iterinorder(
-            parameters, self._request_parameters_order, key=lambda value: value["in"]
+            parameters,
+            self._config.request_parameters_priorities,
+            key=lambda value: value["in"],
         ):
-            yield from self.render_parameter(parameter)
+            self._write_parameter(writer, parameter)
 
     def render_parameter(self, parameter):
         """Render OAS operation's parameter."""
 
-        kinds = CaseInsensitiveDict(
-            {"path": "param", "query": "queryparam", "header": "reqheader"}
-        )
+        return self._render(self._write_parameter, parameter)
+
+    def _write_parameter(self, writer, parameter):
         schema = parameter.get("schema", {})
 
         if "content" in parameter:
@@ -319,7 +833,9 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
             # list is not expensive and should be acceptable.
             schema = list(parameter["content"].values())[0].get("schema", {})
 
-        if parameter["in"] not in kinds:
+        kind = _PARAMETER_KINDS.get(parameter["in"].lower())
+
+        if kind is None:
             logger.warning(
                 "OpenAPI spec contains parameter '%s' (in: '%s') that cannot "
                 "be rendererd.",
@@ -328,95 +844,105 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
             )
             return
 
-        yield f":{kinds[parameter['in']]} {parameter['name']}:"
+        writer.write(f":{kind} {parameter['name']}:")
 
         if parameter.get("description"):
-            yield from indented(
-                self._convert_markup(parameter["description"]).strip().splitlines()
-            )
+            self._write_markup(writer, parameter["description"])
 
         markers = _get_markers_from_object(parameter, schema)
         if markers:
             markers = ", ".join(markers)
-            yield f":{kinds[parameter['in']]}type {parameter['name']}: {markers}"
+            writer.write(f":{kind}type {parameter['name']}: {markers}")
 
     def render_request_body(self, request_body, endpoint, method):
         """Render OAS operation's requestBody."""
 
-        if self._json_schema_description:
-            for content_type, content in request_body["content"].items():
-                if _is_json_mimetype(content_type) and content.get("schema"):
-                    yield from self.render_json_schema_description(
-                        content["schema"], "req"
-                    )
-                    yield ""
-                    break
+        return self._render(self._write_request_body, request_body, endpoint, method)
 
-        yield from self.render_request_body_example(request_body, endpoint, method)
-        yield ""
+    def _write_request_body(self, writer, request_body, endpoint, method):
+        if self._config.json_schema_description:
+            schema = _get_json_schema(request_body["content"])
+            if schema is not None:
+                self._write_json_schema_description(writer, schema, "req")
+                writer.write()
+
+        self._write_request_body_example(writer, request_body, endpoint, method)
+        writer.write()
 
     def render_request_body_example(self, request_body, endpoint, method):
         """Render OAS operation's requestBody's example."""
 
+        return self._render(
+            self._write_request_body_example, request_body, endpoint, method
+        )
+
+    def _write_request_body_example(self, writer, request_body, endpoint, method):
         content_type, example = next(
             _iterexamples(
                 request_body["content"],
-                self._request_example_preference,
-                self._generate_example_from_schema,
+                self._config.request_example_priorities,
+                self._config.generate_examples_from_schemas,
+                self._config.budget,
+                self._external_examples,
+                self._base_uri,
             ),
             (None, None),
         )
 
         if content_type and example:
-            example = example["value"]
+            writer.write(".. sourcecode:: http")
+            writer.write()
+
+            with writer.indented():
+                writer.write(f"{method.upper()} {endpoint} HTTP/1.1")
+                writer.write(f"Content-Type: {content_type}")
+                writer.write()
+                self._write_example(
+                    writer, example["value"], not example.get("generated")
+                )
 
-            if not isinstance(example, str):
-                example = json.dumps(example, indent=2)
+    def _write_example(self, writer, example, cache=True):
+        """Write an example value at current indentation."""
 
-            yield ".. sourcecode:: http"
-            yield ""
-            yield f"   {method.upper()} {endpoint} HTTP/1.1"
-            yield f"   Content-Type: {content_type}"
-            yield ""
-            yield from indented(example.splitlines())
+        if isinstance(example, str):
+            writer.writelines(example.splitlines())
+        else:
+            writer.writeraw(_json.getlines(example, 2, writer.prefix, cache))
 
     def render_responses(self, responses):
         """Render OAS operation's responses."""
 
-        if self._json_schema_description:
-            for status_code, response in responses.items():
-                if _is_2xx_status(status_code):
-                    for content_type, content in response.get("content", {}).items():
-                        if _is_json_mimetype(content_type) and content.get("schema"):
-                            yield from self.render_json_schema_description(
-                                content["schema"], "res"
-                            )
-                            yield ""
-                            break
-                    break
+        return self._render(self._write_responses, responses)
+
+    def _write_responses(self, writer, responses):
+        if self._config.json_schema_description:
+            schema = _get_response_json_schema(responses)
+            if schema is not None:
+                self._write_json_schema_description(writer, schema, "res")
+                writer.write()
 
         for status_code, response in responses.items():
             # Due to the way how YAML spec is parsed, status code may be
             # infered as integer. In order to spare some cycles on type
             # guessing going on, let's ensure it's always string at this point.
-            yield from self.render_response(str(status_code), response)
+            self._write_response(writer, str(status_code), response)
 
     def render_response(self, status_code, response):
         """Render OAS operation's response."""
 
-        yield f":statuscode {status_code}:"
-        yield from indented(
-            self._convert_markup(response["description"]).strip().splitlines()
-        )
+        return self._render(self._write_response, status_code, response)
 
-        if "content" in response and status_code in self._response_examples_for:
-            yield ""
-            yield from indented(
-                self.render_response_example(response["content"], status_code)
-            )
+    def _write_response(self, writer, status_code, response):
+        writer.write(f":statuscode {status_code}:")
+        self._write_markup(writer, response["description"])
+
+        if "content" in response and status_code in self._config.response_examples_for:
+            writer.write()
+            with writer.indented():
+                self._write_response_example(writer, response["content"], status_code)
 
         if "headers" in response:
-            yield ""
+            writer.write()
 
             for header_name, header_value in response["headers"].items():
                 # According to OpenAPI v3 specification, if a response header
@@ -424,14 +950,10 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
                 if header_name.lower() == "content-type":
                     continue
 
-                yield f":resheader {header_name}:"
+                writer.write(f":resheader {header_name}:")
 
                 if header_value.get("description"):
-                    yield from indented(
-                        self._convert_markup(header_value["description"])
-                        .strip()
-                        .splitlines()
-                    )
+                    self._write_markup(writer, header_value["description"])
 
                 schema = header_value.get("schema", {})
                 if "content" in header_value:
@@ -443,9 +965,14 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
                 markers = _get_markers_from_object(header_value, schema)
                 if markers:
                     markers = ", ".join(markers)
-                    yield f":resheadertype {header_name}: {markers}"
+                    writer.write(f":resheadertype {header_name}: {markers}")
 
     def render_response_example(self, media_type, status_code):
+        """Render OAS operation's response's example."""
+
+        return self._render(self._write_response_example, media_type, status_code)
+
+    def _write_response_example(self, writer, media_type, status_code):
         # OpenAPI 3.0 spec may contain more than one response media type, and
         # each media type may contain more than one example. Rendering all
         # invariants normally is not an option because the result will be hard
@@ -456,18 +983,16 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
         content_type, example = next(
             _iterexamples(
                 media_type,
-                self._response_example_preference,
-                self._generate_example_from_schema,
+                self._config.response_example_priorities,
+                self._config.generate_examples_from_schemas,
+                self._config.budget,
+                self._external_examples,
+                self._base_uri,
             ),
             (None, None),
         )
 
         if content_type and example:
-            example = example["value"]
-
-            if not isinstance(example, str):
-                example = json.dumps(example, indent=2)
-
             # According to OpenAPI v3 spec, status code may be a special value
             # - "default". It's not quite clear what to render in this case.
             # One possible option is to avoid rendering status code at all.
@@ -486,91 +1011,109 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
                 status_code = status_code.replace("XX", "00")
                 status_text = http.client.responses.get(int(status_code), "-")
 
-            yield ".. sourcecode:: http"
-            yield ""
-            yield f"   HTTP/1.1 {status_code} {status_text}"
-            yield f"   Content-Type: {content_type}"
-            yield ""
-            yield from indented(example.splitlines())
+            writer.write(".. sourcecode:: http")
+            writer.write()
+
+            with writer.indented():
+                writer.write(f"HTTP/1.1 {status_code} {status_text}")
+                writer.write(f"Content-Type: {content_type}")
+                writer.write()
+                self._write_example(
+                    writer, example["value"], not example.get("generated")
+                )
 
     def render_json_schema_description(self, schema, req_or_res):
         """Render JSON schema's description."""
 
-        def _resolve_combining_schema(schema):
-            if "oneOf" in schema:
-                # The part with merging is a vague one since I only found a
-                # single 'oneOf' example where such merging was assumed, and no
-                # explanations in the spec itself.
-                merged_schema = schema.copy()
-                merged_schema.update(merged_schema.pop("oneOf")[0])
-                return merged_schema
-
-            elif "anyOf" in schema:
-                # The part with merging is a vague one since I only found a
-                # single 'oneOf' example where such merging was assumed, and no
-                # explanations in the spec itself.
-                merged_schema = schema.copy()
-                merged_schema.update(merged_schema.pop("anyOf")[0])
-                return merged_schema
-
-            elif "allOf" in schema:
-                # Since the item is represented by all schemas from the array,
-                # the best we can do is to render them all at once
-                # sequentially. Please note, the only way the end result will
-                # ever make sense is when all schemas from the array are of
-                # object type.
-                merged_schema = schema.copy()
-                for item in merged_schema.pop("allOf"):
-                    merged_schema = _merge_mappings(merged_schema, copy.deepcopy(item))
-                return merged_schema
-
-            elif "not" in schema:
-                # Eh.. do nothing because I have no idea what can we do.
-                return {}
-
-            return schema
-
-        def _traverse_schema(schema, name, is_required=False):
-            schema_type = _get_schema_type(schema)
-
-            if {"oneOf", "anyOf", "allOf"} & schema.keys():
-                # Since an item can represented by either or any schema from
-                # the array of schema in case of `oneOf` and `anyOf`
-                # respectively, the best we can do for them is to render the
-                # first found variant. In other words, we are going to traverse
-                # only a single schema variant and leave the rest out. This is
-                # by design and it was decided so in order to keep produced
-                # description clear and simple.
-                yield from _traverse_schema(_resolve_combining_schema(schema), name)
-
-            elif "not" in schema:
-                yield name, {}, is_required
-
-            elif schema_type == "object":
+        return self._render(self._write_json_schema_description, schema, req_or_res)
+
+    def _traverse_schema(self, schema, name, is_required=False, depth=0):
+        """Iterate over fields of a JSON schema to describe."""
+
+        # Shared schemas are described on their own, so there's no need to
+        # expand them over and over again. A reference is enough.
+        if name and id(schema) in self._schema_names:
+            yield name, schema, is_required
+            return
+
+        schema_type = _get_schema_type(schema)
+
+        if {"oneOf", "anyOf", "allOf"} & schema.keys():
+            # Since an item can represented by either or any schema from
+            # the array of schema in case of `oneOf` and `anyOf`
+            # respectively, the best we can do for them is to render the
+            # first found variant. In other words, we are going to traverse
+            # only a single schema variant and leave the rest out. This is
+            # by design and it was decided so in order to keep produced
+            # description clear and simple.
+            yield from self._traverse_schema(
+                _resolve_combining_schema(schema), name, depth=depth
+            )
+
+        elif "not" in schema:
+            yield name, {}, is_required
+
+        elif schema_type == "object":
+            if name:
+                yield name, schema, is_required
+
+            if self._config.budget.is_too_deep(depth):
+                yield f"{name}{schema_utils.TRUNCATED}", _TRUNCATED_SCHEMA, False
+                return
+
+            required = set(schema.get("required", []))
+
+            for i, (key, value) in enumerate(schema.get("properties", {}).items()):
+                if self._config.budget.is_too_many_properties(i):
+                    yield f"{name}{schema_utils.TRUNCATED}", _TRUNCATED_SCHEMA, False
+                    break
+
+                # In case of the first recursion call, when 'name' is an
+                # empty string, we should go with 'key' only in order to
+                # avoid leading dot at the beginning.
+                yield from self._traverse_schema(
+                    value,
+                    f"{name}.{key}" if name else key,
+                    is_required=key in required,
+                    depth=depth + 1,
+                )
+
+        elif schema_type == "array":
+            if self._config.budget.is_too_deep(depth):
                 if name:
                     yield name, schema, is_required
+                yield f"{name}{schema_utils.TRUNCATED}", _TRUNCATED_SCHEMA, False
+                return
 
-                required = set(schema.get("required", []))
+            yield from self._traverse_schema(
+                schema["items"], f"{name}[]", depth=depth + 1
+            )
 
-                for key, value in schema.get("properties", {}).items():
-                    # In case of the first recursion call, when 'name' is an
-                    # empty string, we should go with 'key' only in order to
-                    # avoid leading dot at the beginning.
-                    yield from _traverse_schema(
-                        value,
-                        f"{name}.{key}" if name else key,
-                        is_required=key in required,
-                    )
+        elif "enum" in schema:
+            yield name, schema, is_required
 
-            elif schema_type == "array":
-                yield from _traverse_schema(schema["items"], f"{name}[]")
+        elif schema_type is not None:
+            yield name, schema, is_required
 
-            elif "enum" in schema:
-                yield name, schema, is_required
+    def _get_markers(self, schema, is_required):
+        """Retrieve markers of a described JSON schema field."""
 
-            elif schema_type is not None:
-                yield name, schema, is_required
+        if schema is _TRUNCATED_SCHEMA:
+            markers = ["truncated"]
+        elif id(schema) in self._schema_names:
+            name = self._schema_names[id(schema)]
+            markers = [f":ref:`{name} <{_get_schema_label(self._schemas_key, name)}>`"]
+        else:
+            markers = _get_markers_from_object({}, schema)
+
+        if is_required:
+            markers.append("required")
+        return markers
 
+    def _write_json_schema_description(self, writer, schema, req_or_res):
+        # Combining schemas are resolved into new objects, so a shared schema
+        # has to be looked up before that.
+        shared_schema = schema
         schema = _resolve_combining_schema(schema)
         schema_type = _get_schema_type(schema)
 
@@ -602,26 +1145,114 @@ class HttpdomainRenderer(abc.RestructuredTextRenderer):
         # we're about to render is an array, there's no need to render that
         # array in the first place.
         if schema_type == "array":
-            schema = schema["items"]
+            schema = shared_schema = schema["items"]
 
             # Even if a root element is an array, items it contain must not be
             # of a primitive types.
             if _get_schema_type(schema) not in {"object", "array"}:
                 return
 
-        for name, schema, is_required in _traverse_schema(schema, ""):
-            yield f":{directive} {name}:"
+        # A shared schema on root level has no field to be rendered as, so
+        # let's mention it in a generic field.
+        if id(shared_schema) in self._schema_names:
+            title = {"req": "Request", "res": "Response"}[req_or_res]
+            kind = "Object" if schema_type == "object" else "Array of Objects"
+            markers = ", ".join(self._get_markers(shared_schema, False))
+            writer.write(f":{title} JSON {kind}: {markers}")
+            return
 
-            if schema.get("description"):
-                yield from indented(
-                    self._convert_markup(schema["description"]).strip().splitlines()
-                )
+        for name, schema, is_required in self._traverse_schema(schema, ""):
+            writer.write(f":{directive} {name}:")
 
-            markers = _get_markers_from_object({}, schema)
+            # Shared schemas are described elsewhere, including their
+            # descriptions.
+            if schema.get("description") and id(schema) not in self._schema_names:
+                self._write_markup(writer, schema["description"])
 
-            if is_required:
-                markers.append("required")
+            markers = self._get_markers(schema, is_required)
 
             if markers:
                 markers = ", ".join(markers)
-                yield f":{typedirective} {name}: {markers}"
+                writer.write(f":{typedirective} {name}: {markers}")
+
+    def render_schemas(self, paths):
+        """Render shared schemas used by given OAS paths items."""
+
+        return self._render(self._write_schemas, paths)
+
+    def _write_schemas(self, writer, paths):
+        if not self._config.json_schema_description:
+            return
+
+        # Only schemas that are referenced from rendered operations, either
+        # directly or through other shared schemas, are worth rendering.
+        pending = []
+        for _, _, operation in self._iteroperations(paths):
+            if "requestBody" in operation:
+                pending.append(_get_json_schema(operation["requestBody"]["content"]))
+            pending.append(_get_response_json_schema(operation["responses"]))
+
+        used = set()
+        seen = set()
+        while pending:
+            node = pending.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+
+            if id(node) in self._schema_names:
+                used.add(id(node))
+
+            if isinstance(node, collections.abc.Mapping):
+                pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
+
+        # Schemas are rendered in the order they are defined in the spec, so
+        # the output is stable no matter what order operations are in.
+        for name, schema in self._shared_schemas.items():
+            if id(schema) in used:
+                self._write_schema(writer, name, schema)
+
+    def render_schema(self, name, schema):
+        """Render a shared JSON schema."""
+
+        return self._render(self._write_schema, name, schema)
+
+    def _write_schema(self, writer, name, schema):
+        writer.write(f".. _{_get_schema_label(self._schemas_key, name)}:")
+        writer.write()
+        writer.write(f".. rubric:: {name}")
+        writer.write()
+
+        if schema.get("description"):
+            writer.writelines(
+                self._convert_markup(schema["description"]).strip().splitlines()
+            )
+            writer.write()
+
+        markers = _get_markers_from_object({}, schema)
+        if markers:
+            writer.write(f"({', '.join(markers)})")
+            writer.write()
+
+        # Only objects and arrays have fields to be described, and the rest
+        # is fully described by the markers above.
+        resolved = _resolve_combining_schema(schema)
+        if _get_schema_type(resolved) not in {"object", "array"}:
+            return
+
+        for field, field_schema, is_required in self._traverse_schema(resolved, ""):
+            markers = self._get_markers(field_schema, is_required)
+            writer.write(
+                f":{field}: ({', '.join(markers)})" if markers else f":{field}:"
+            )
+
+            if (
+                field_schema.get("description")
+                and id(field_schema) not in self._schema_names
+            ):
+                writer.write()
+                self._write_markup(writer, field_schema["description"])
+
+        writer.write()
@@ -27,12 +27,22 @@ class HttpdomainOldRenderer(abc.RestructuredTextRenderer):
         "group": directives.flag,
         # Markup format to render OpenAPI descriptions.
         "format": str,
+        # Limits of generated examples. Examples are truncated once they are
+        # reached.
+        "max-properties": directives.nonnegative_int,
+        "max-depth": directives.nonnegative_int,
+        "max-items": directives.nonnegative_int,
+        "max-example-bytes": directives.nonnegative_int,
     }
 
     def __init__(self, state, options):
         self._state = state
         self._options = options
 
+        # Markup of operations from previous renders, if set. It makes sense
+        # when the same spec is rendered over and over again as it's edited.
+        self.render_cache = None
+
     def render_restructuredtext_markup(self, spec):
         # OpenAPI spec may contain JSON references, common properties, etc.
         # Trying to render the spec "As Is" will require to put multiple if-s
@@ -52,4 +62,6 @@ class HttpdomainOldRenderer(abc.RestructuredTextRenderer):
         else:
             raise ValueError("Unsupported OpenAPI version (%s)" % spec_version)
 
-        yield from openapihttpdomain(spec, **self._options)
+        yield from openapihttpdomain(
+            spec, render_cache=self.render_cache, **self._options
+        )
@@ -6,6 +6,8 @@ from docutils import nodes
 from docutils.statemachine import ViewList
 from sphinx.util.nodes import nested_parse_with_titles
 
+from sphinxcontrib.openapi import _instrumentation
+
 
 class Renderer(metaclass=abc.ABCMeta):
     """Base class for OpenAPI renderers."""
@@ -37,10 +39,12 @@ class RestructuredTextRenderer(Renderer):
 
     def render(self, spec):
         viewlist = ViewList()
-        for line in self.render_restructuredtext_markup(spec):
-            viewlist.append(line, "<openapi>")
+        with _instrumentation.phase("markup"):
+            for line in self.render_restructuredtext_markup(spec):
+                viewlist.append(line, "<openapi>")
 
         node = nodes.section()
         node.document = self._state.document
-        nested_parse_with_titles(self._state, viewlist, node)
+        with _instrumentation.phase("parse"):
+            nested_parse_with_titles(self._state, viewlist, node)
         return node.children
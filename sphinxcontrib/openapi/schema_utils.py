@@ -1,5 +1,9 @@
 """OpenAPI schema utility functions."""
 
+import dataclasses
+import datetime
+import json
+import os
 from io import StringIO
 
 _DEFAULT_EXAMPLES = {
@@ -12,8 +16,6 @@ _DEFAULT_EXAMPLES = {
 
 
 _DEFAULT_STRING_EXAMPLES = {
-    "date": "2020-01-01",
-    "date-time": "2020-01-01T01:01:01Z",
     "password": "********",
     "byte": "QG1pY2hhZWxncmFoYW1ldmFucw==",
     "ipv4": "127.0.0.1",
@@ -21,7 +23,172 @@ _DEFAULT_STRING_EXAMPLES = {
 }
 
 
-def example_from_schema(schema):
+# Generated examples must be the same from build to build, otherwise Sphinx
+# considers rendered documents changed even if their specs aren't. That's why
+# 'date' and 'date-time' examples are derived from a fixed moment in time
+# rather than from the current one.
+_DEFAULT_EXAMPLE_DATETIME = datetime.datetime(
+    2020, 1, 1, 1, 1, 1, tzinfo=datetime.timezone.utc
+)
+_example_datetime = None
+
+
+def set_example_datetime(value):
+    """Set a moment in time 'date' and 'date-time' examples are derived from.
+
+    The value may be either a :class:`datetime.datetime` instance or a string
+    in ISO 8601 format. Naive values are assumed to be in UTC. If 'None' is
+    passed, the value of ``SOURCE_DATE_EPOCH`` environment variable is used,
+    if set, or a fixed default moment otherwise.
+    """
+
+    global _example_datetime
+
+    if isinstance(value, str):
+        # 'fromisoformat' does not accept 'Z' designator before Python 3.11.
+        if value.endswith(("Z", "z")):
+            value = value[:-1] + "+00:00"
+        value = datetime.datetime.fromisoformat(value)
+
+    if value is not None:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        value = value.astimezone(datetime.timezone.utc)
+
+    _example_datetime = value
+
+
+def _get_example_datetime():
+    if _example_datetime is not None:
+        return _example_datetime
+
+    # https://reproducible-builds.org/specs/source-date-epoch/
+    if os.environ.get("SOURCE_DATE_EPOCH"):
+        return datetime.datetime.fromtimestamp(
+            int(os.environ["SOURCE_DATE_EPOCH"]), tz=datetime.timezone.utc
+        )
+
+    return _DEFAULT_EXAMPLE_DATETIME
+
+
+def get_example_date():
+    """Return an example value for 'date' format."""
+
+    return _get_example_datetime().date().isoformat()
+
+
+def get_example_datetime():
+    """Return an example value for 'date-time' format."""
+
+    return _get_example_datetime().strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# A marker of generated content that has been left out due to a budget.
+TRUNCATED = "..."
+
+# Renderer options that set budgets, mapped to the corresponding fields.
+BUDGET_OPTIONS = {
+    "max-properties": "max_properties",
+    "max-depth": "max_depth",
+    "max-items": "max_items",
+    "max-example-bytes": "max_example_bytes",
+    "max-example-lines": "max_example_lines",
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Budget:
+    """Size limits of examples and schema descriptions.
+
+    Generators check the limits as they go, and stop once a limit is reached
+    leaving a :data:`TRUNCATED` marker in place of what's left out. Each
+    limit is either a non-negative number or 'None' for no limit at all.
+    External examples are read till the byte and line limits are reached.
+    """
+
+    # A number of properties of an object.
+    max_properties: int = None
+    # A number of nested objects and arrays.
+    max_depth: int = None
+    # A number of items of an array.
+    max_items: int = None
+    # An approximate size of a JSON example, or an exact size of an external
+    # one.
+    max_example_bytes: int = None
+    # A number of lines of an external example.
+    max_example_lines: int = None
+
+    @classmethod
+    def from_options(cls, options):
+        """Return a budget set by given renderer options."""
+
+        return cls(
+            **{field: options.get(option) for option, field in BUDGET_OPTIONS.items()}
+        )
+
+    def is_too_deep(self, depth):
+        """Return 'True' if objects and arrays at 'depth' are out of budget."""
+
+        return self.max_depth is not None and depth >= self.max_depth
+
+    def is_too_many_properties(self, count):
+        """Return 'True' if 'count' properties are out of budget."""
+
+        return self.max_properties is not None and count >= self.max_properties
+
+    def is_too_many_items(self, count):
+        """Return 'True' if 'count' items are out of budget."""
+
+        return self.max_items is not None and count >= self.max_items
+
+
+class _Spending:
+    """Tracks a budget spent on a single generated example."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self._bytes_left = budget.max_example_bytes
+
+    @property
+    def is_exhausted(self):
+        return self._bytes_left is not None and self._bytes_left <= 0
+
+    def spend(self, value):
+        """Spend the budget on a given part of an example, and return it."""
+
+        if self._bytes_left is not None:
+            # The size is approximate since the example is going to be
+            # serialized with indentation, but it's good enough to keep
+            # examples within reasonable limits.
+            self._bytes_left -= len(json.dumps(value, default=str))
+        return value
+
+    def spend_string(self, value):
+        """Spend the budget on a string, truncating it if needed."""
+
+        if self._bytes_left is not None and len(value) > self._bytes_left:
+            value = value[: max(self._bytes_left, 0)] + TRUNCATED
+        return self.spend(value)
+
+
+_UNLIMITED = Budget()
+
+
+def get_spending(budget=None):
+    """Return a tracker of a budget spent on generating a single example."""
+
+    return _Spending(budget or _UNLIMITED)
+
+
+def _get_string_example(format_):
+    if format_ == "date":
+        return get_example_date()
+    elif format_ == "date-time":
+        return get_example_datetime()
+    return _DEFAULT_STRING_EXAMPLES.get(format_, _DEFAULT_EXAMPLES["string"])
+
+
+def example_from_schema(schema, budget=None):
     """
     Generates an example request/response body from the provided schema.
 
@@ -48,38 +215,80 @@ def example_from_schema(schema):
     ...     "name": "John Smith",
     ...     "tag": "string"
     ... }
+
+    If a :class:`Budget` is passed, the example is generated within its
+    limits, and what doesn't fit is replaced with :data:`TRUNCATED`.
     """
+    return _example_from_schema(schema, get_spending(budget), 0)
+
+
+def _example_from_schema(schema, spending, depth):
+    if spending.is_exhausted:
+        return TRUNCATED
+
     # If an example was provided then we use that
     if "example" in schema:
-        return schema["example"]
+        return spending.spend(schema["example"])
 
     elif "oneOf" in schema:
-        return example_from_schema(schema["oneOf"][0])
+        return _example_from_schema(schema["oneOf"][0], spending, depth)
 
     elif "anyOf" in schema:
-        return example_from_schema(schema["anyOf"][0])
+        return _example_from_schema(schema["anyOf"][0], spending, depth)
 
     elif "allOf" in schema:
         # Combine schema examples
         example = {}
+        other_example = None
         for sub_schema in schema["allOf"]:
-            example.update(example_from_schema(sub_schema))
+            sub_example = _example_from_schema(sub_schema, spending, depth)
+            if isinstance(sub_example, dict):
+                example.update(sub_example)
+            elif sub_example == TRUNCATED and (
+                spending.is_exhausted or spending.budget.is_too_deep(depth)
+            ):
+                # A sub-schema that doesn't fit the budget is truncated, and
+                # so is the rest of them.
+                if not example:
+                    return TRUNCATED
+                example[TRUNCATED] = TRUNCATED
+                break
+            elif other_example is None:
+                # Examples other than objects cannot be merged, so the first
+                # one is used unless there are objects to merge.
+                other_example = sub_example
+
+        if not example and other_example is not None:
+            return other_example
         return example
 
     elif "enum" in schema:
-        return schema["enum"][0]
+        return spending.spend(schema["enum"][0])
 
     elif "type" not in schema:
         # Any type
-        return _DEFAULT_EXAMPLES["integer"]
+        return spending.spend(_DEFAULT_EXAMPLES["integer"])
 
     elif schema["type"] == "object" or "properties" in schema:
+        if spending.budget.is_too_deep(depth):
+            return TRUNCATED
+
         example = {}
         for prop, prop_schema in schema.get("properties", {}).items():
-            example[prop] = example_from_schema(prop_schema)
+            if spending.is_exhausted or spending.budget.is_too_many_properties(
+                len(example)
+            ):
+                example[TRUNCATED] = TRUNCATED
+                break
+            example[spending.spend(prop)] = _example_from_schema(
+                prop_schema, spending, depth + 1
+            )
         return example
 
     elif schema["type"] == "array":
+        if spending.budget.is_too_deep(depth):
+            return TRUNCATED
+
         items = schema["items"]
         min_length = schema.get("minItems", 0)
         max_length = schema.get("maxItems", max(min_length, 2))
@@ -88,6 +297,9 @@ def example_from_schema(schema):
         gen_length = min(2, max_length) if min_length <= 2 else min_length
 
         example_items = []
+        # A number of example items whose size has been spent already, so
+        # they are not counted once again when they are added.
+        spent = 0
         if items == {}:
             # Any-type arrays
             example_items.extend(_DEFAULT_EXAMPLES.values())
@@ -95,15 +307,23 @@ def example_from_schema(schema):
             # Mixed-type arrays
             example_items.append(_DEFAULT_EXAMPLES[sorted(items["oneOf"])[0]])
         else:
-            example_items.append(example_from_schema(items))
+            example_items.append(_example_from_schema(items, spending, depth + 1))
+            spent = 1
 
         # Generate array containing example_items and satisfying min_length and max_length
-        return [example_items[i % len(example_items)] for i in range(gen_length)]
+        example = []
+        for i in range(gen_length):
+            if spending.is_exhausted or spending.budget.is_too_many_items(i):
+                example.append(TRUNCATED)
+                break
+            example_item = example_items[i % len(example_items)]
+            if i >= spent:
+                spending.spend(example_item)
+            example.append(example_item)
+        return example
 
     elif schema["type"] == "string":
-        example_string = _DEFAULT_STRING_EXAMPLES.get(
-            schema.get("format", None), _DEFAULT_EXAMPLES["string"]
-        )
+        example_string = _get_string_example(schema.get("format", None))
         min_length = schema.get("minLength", 0)
         max_length = schema.get("maxLength", max(min_length, len(example_string)))
         gen_length = (
@@ -113,13 +333,16 @@ def example_from_schema(schema):
         )
         assert 0 <= min_length <= max_length
         if min_length <= len(example_string) <= max_length:
-            return example_string
+            return spending.spend_string(example_string)
         else:
+            # Long strings are cut short before they are even generated.
+            if spending.budget.max_example_bytes is not None:
+                gen_length = min(gen_length, spending.budget.max_example_bytes + 1)
             example_builder = StringIO()
             for i in range(gen_length):
                 example_builder.write(example_string[i % len(example_string)])
             example_builder.seek(0)
-            return example_builder.read()
+            return spending.spend_string(example_builder.read())
 
     elif schema["type"] in ("integer", "number"):
         example = _DEFAULT_EXAMPLES[schema["type"]]
@@ -130,7 +353,9 @@ def example_from_schema(schema):
             example = schema["minimum"] + 1
         elif "maximum" in schema and example >= schema["maximum"]:
             example = schema["maximum"] - 1
-        return float(example) if schema["type"] == "number" else int(example)
+        return spending.spend(
+            float(example) if schema["type"] == "number" else int(example)
+        )
 
     else:
-        return _DEFAULT_EXAMPLES[schema["type"]]
+        return spending.spend(_DEFAULT_EXAMPLES[schema["type"]])
@@ -0,0 +1,140 @@
+/*
+ * Look operations up in the search index written by sphinxcontrib-openapi.
+ *
+ * The index is loaded lazily: the manifest on the first lookup, and a shard
+ * once a query needs it. Keys within a shard are sorted, so keys starting
+ * with a query are found by binary search.
+ *
+ * Usage:
+ *
+ *   OpenAPISearch.lookup("pets").then((operations) => ...);
+ *
+ * or, with no code at all, an input bound to a list of results:
+ *
+ *   <input data-openapi-search="results">
+ *   <ul id="results"></ul>
+ */
+(function () {
+  "use strict";
+
+  // The script is served from '_static', and so is the index.
+  const indexUrl = new URL("openapi-search/", document.currentScript.src);
+  const rootUrl = new URL("../", document.currentScript.src);
+
+  let manifest = null;
+  const shards = new Map();
+
+  function fetchJSON(url) {
+    return fetch(url).then((response) => {
+      if (!response.ok) {
+        throw new Error(`Cannot fetch ${url}: ${response.status}`);
+      }
+      return response.json();
+    });
+  }
+
+  function getManifest() {
+    if (manifest === null) {
+      manifest = fetchJSON(new URL("index.json", indexUrl));
+    }
+    return manifest;
+  }
+
+  function getShard(number) {
+    if (!shards.has(number)) {
+      shards.set(number, fetchJSON(new URL(`${number}.json`, indexUrl)));
+    }
+    return shards.get(number);
+  }
+
+  function lowerBound(keys, query) {
+    let lo = 0;
+    let hi = keys.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (keys[mid] < query) {
+        lo = mid + 1;
+      } else {
+        hi = mid;
+      }
+    }
+    return lo;
+  }
+
+  function lookupWord(word) {
+    return getManifest().then((index) => {
+      const prefix = word.slice(0, index.prefixLength);
+      const numbers = Object.keys(index.shards)
+        .filter((key) => key.startsWith(prefix))
+        .map((key) => index.shards[key]);
+
+      return Promise.all(numbers.map(getShard)).then((loaded) => {
+        const found = new Map();
+        for (const shard of loaded) {
+          for (
+            let i = lowerBound(shard.keys, word);
+            i < shard.keys.length && shard.keys[i].startsWith(word);
+            i++
+          ) {
+            for (const j of shard.postings[i]) {
+              const [method, path, operationId, summary, uri] =
+                shard.operations[j];
+              const url = new URL(uri, rootUrl).href;
+              found.set(url, { method, path, operationId, summary, url });
+            }
+          }
+        }
+        return found;
+      });
+    });
+  }
+
+  function lookup(query, limit = 50) {
+    const words = query.toLowerCase().split(/\s+/).filter(Boolean);
+    if (!words.length) {
+      return Promise.resolve([]);
+    }
+
+    // Operations must match each word of a query.
+    return Promise.all(words.map(lookupWord)).then((found) => {
+      const [first, ...rest] = found;
+      return Array.from(first.values())
+        .filter((operation) => rest.every((other) => other.has(operation.url)))
+        .slice(0, limit);
+    });
+  }
+
+  function bind(input) {
+    const results = document.getElementById(input.dataset.openapiSearch);
+    let pending = 0;
+
+    input.addEventListener("input", () => {
+      const current = ++pending;
+      lookup(input.value).then((operations) => {
+        // Lookups may complete out of order, and only the latest counts.
+        if (current !== pending) {
+          return;
+        }
+        results.replaceChildren(
+          ...operations.map((operation) => {
+            const item = document.createElement("li");
+            const link = document.createElement("a");
+            link.href = operation.url;
+            link.textContent = `${operation.method.toUpperCase()} ${operation.path}`;
+            item.append(link);
+            if (operation.summary) {
+              item.append(` — ${operation.summary}`);
+            }
+            return item;
+          })
+        );
+      });
+    });
+  }
+
+  window.OpenAPISearch = { lookup };
+
+  document.addEventListener("DOMContentLoaded", () => {
+    document.querySelectorAll("input[data-openapi-search]").forEach(bind);
+  });
+})();
@@ -10,24 +10,162 @@
 
 from __future__ import unicode_literals
 
+import codecs
 import collections
 import collections.abc
+import copy
+import functools
+import json
 
 from contextlib import closing
 import jsonschema
 import yaml
 import sphinx_mdinclude
 
-from urllib.parse import urlsplit
-from urllib.request import urlopen
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.request import url2pathname, urlopen
 
 import os.path
 
+from sphinxcontrib.openapi import _fetch, _hashing, _instrumentation
+
+
+# The extension's own data about specs (e.g. whether a spec is normalized),
+# keyed by spec identity. It's kept next to specs rather than inside them, so
+# it doesn't show up once a spec is dumped, diffed or validated. Specs are
+# kept along with their data to ensure their identities are not reused by
+# other objects, and the least recently used ones are dropped.
+_SPEC_DATA_SIZE = 256
+_SPEC_DATA = collections.OrderedDict()
+
+# Path item properties that are operations.
+HTTP_METHODS = frozenset(
+    ['get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace'])
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_file(path, mtime, size, encoding='utf-8'):
+    # Both modification time and size are part of the cache key, so a file
+    # is parsed again once it's changed.
+    _instrumentation.count('parse_file')
+
+    with open(path, 'rt', encoding=encoding) as stream:
+        # JSON is a subset of YAML, so files of other extensions are parsed
+        # as YAML. JSON parser is used for JSON files only because it's way
+        # faster.
+        if os.path.splitext(path)[1] == '.json':
+            return json.load(stream)
+        return yaml.safe_load(stream)
+
+
+def load_file(path, encoding='utf-8'):
+    """Load a local spec file.
+
+    Parsed files are cached process-wide, so a file that is referenced from
+    many specs (e.g. shared schemas) is parsed once. Since loaded documents
+    are modified in-place during resolving, each call returns a copy.
+    """
+
+    stat = os.stat(path)
+    return copy.deepcopy(
+        _parse_file(path, stat.st_mtime_ns, stat.st_size, encoding))
+
+
+# A size of chunks text files are read by, so a limited part of a large file
+# is read without reading the whole file.
+_CHUNK_SIZE = 64 * 1024
+
+
+def _find_cutoff(data, max_bytes=None, max_lines=None):
+    """Return a position to cut given data off at, or 'None' to keep it all."""
+
+    cutoff = None
+    if max_bytes is not None and len(data) > max_bytes:
+        cutoff = max_bytes
+
+    if max_lines is not None:
+        position = -1
+        for _ in range(max_lines):
+            position = data.find(b'\n', position + 1)
+            if position == -1:
+                break
+        else:
+            # The last line is cut off without its line break, and nothing
+            # is cut off if there's nothing past the line break.
+            if len(data) > position + 1:
+                position = max(position, 0)
+                cutoff = position if cutoff is None else min(cutoff, position)
+
+    return cutoff
+
+
+def _decode(data, cutoff):
+    if cutoff is None:
+        return bytes(data).decode('utf-8', errors='replace'), False
+
+    # Data may be cut off in the middle of a multibyte character, and an
+    # incremental decoder leaves its incomplete bytes out.
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    return decoder.decode(bytes(data[:cutoff])), True
+
+
+@functools.lru_cache(maxsize=128)
+def _read_text(path, mtime, size, max_bytes, max_lines):
+    # Both modification time and size are part of the cache key, so a file
+    # is read again once it's changed.
+    _instrumentation.count('read_text')
+
+    data = bytearray()
+    newlines = 0
+    with open(path, 'rb') as stream:
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            data += chunk
+            newlines += chunk.count(b'\n')
+
+            # Once there's more than allowed, the rest of a file is of no
+            # interest.
+            if not chunk:
+                break
+            if max_bytes is not None and len(data) > max_bytes:
+                break
+            if max_lines is not None and (
+                    newlines > max_lines
+                    or (newlines == max_lines and not data.endswith(b'\n'))):
+                break
+
+    return _decode(data, _find_cutoff(data, max_bytes, max_lines))
+
+
+def read_text(path, max_bytes=None, max_lines=None):
+    """Read a local UTF-8 text file, up to a given number of bytes and lines.
+
+    Returns the text along with whether it's been cut off. A file is read
+    by chunks till limits are exceeded, so a small part of a large file is
+    read quickly and without loading the whole file into memory. Read texts
+    are cached process-wide.
+    """
+
+    stat = os.stat(path)
+    return _read_text(path, stat.st_mtime_ns, stat.st_size, max_bytes, max_lines)
+
+
+def truncate_text(text, max_bytes=None, max_lines=None):
+    """Truncate a text the same way :func:`read_text` does."""
+
+    data = text.encode('utf-8')
+    cutoff = _find_cutoff(data, max_bytes, max_lines)
+    if cutoff is None:
+        return text, False
+    return _decode(data, cutoff)
+
 
 class OpenApiRefResolver(jsonschema.RefResolver):
     """
     Overrides resolve_remote to support both YAML and JSON
     OpenAPI schemas.
+
+    Every local file loaded by the resolver is memorized in ``local_files``.
     """
 
     try:
@@ -36,14 +174,23 @@ class OpenApiRefResolver(jsonschema.RefResolver):
     except ImportError:
         _requests = None
 
+    def __init__(self, *args, **kwargs):
+        super(OpenApiRefResolver, self).__init__(*args, **kwargs)
+        self.local_files = set()
+
     def resolve_remote(self, uri):
         scheme, _, path, _, _ = urlsplit(uri)
         _, extension = os.path.splitext(path)
 
-        if extension not in [".yml", ".yaml"] or scheme in self.handlers:
+        if scheme == u"file" and scheme not in self.handlers:
+            path = url2pathname(path)
+            result = load_file(path)
+            self.local_files.add(path)
+
+        elif extension not in [".yml", ".yaml"] or scheme in self.handlers:
             return super(OpenApiRefResolver, self).resolve_remote(uri)
 
-        if scheme in [u"http", u"https"] and self._requests:
+        elif scheme in [u"http", u"https"] and self._requests:
             response = self._requests.get(uri)
             result = yaml.safe_load(response.content)
         else:
@@ -57,7 +204,55 @@ class OpenApiRefResolver(jsonschema.RefResolver):
         return result
 
 
-def _resolve_refs(uri, spec):
+def _iterremoterefs(uri, node):
+    """Yield URLs of remote documents a given document refers to."""
+
+    # It's a walk over the whole document, so only containers are put on the
+    # stack, and most references are local ones that are not worth resolving
+    # to tell that.
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get('$ref')
+            if isinstance(ref, str) and not ref.startswith('#'):
+                url, _ = urldefrag(urljoin(uri, ref))
+                if urlsplit(url).scheme in ('http', 'https'):
+                    yield url
+            values = node.values()
+        else:
+            values = node
+        stack.extend(
+            value for value in values if isinstance(value, (dict, list)))
+
+
+def _fetch_remote_refs(uri, spec, resolver):
+    """Fetch remote documents a given spec refers to, concurrently.
+
+    Remote documents may refer to other remote documents, so they are
+    fetched in rounds until there's nothing left to fetch. Fetched documents
+    are put into the resolver's store, so the resolver never fetches them
+    on its own, one at a time. Documents that fail to be fetched are left to
+    the resolver, which reports the failure.
+    """
+
+    documents = [(uri, spec)]
+    while documents:
+        urls = {
+            url
+            for base_uri, document in documents
+            for url in _iterremoterefs(base_uri, document)
+            if url not in resolver.store
+        }
+
+        documents = []
+        for url, result in _fetch.fetch_all(sorted(urls)).items():
+            if not isinstance(result, Exception):
+                resolver.store[url] = yaml.safe_load(result)
+                documents.append((url, resolver.store[url]))
+
+
+def _resolve_refs(uri, spec, resolver=None):
     """Resolve JSON references in a given dictionary.
 
     OpenAPI spec may contain JSON references to its nodes or external
@@ -71,11 +266,12 @@ def _resolve_refs(uri, spec):
     the function.
     """
 
-    resolver = OpenApiRefResolver(uri, spec)
+    resolver = resolver or OpenApiRefResolver(uri, spec)
 
     def _do_resolve(node, seen=[]):
         if isinstance(node, collections.abc.Mapping) and '$ref' in node:
             ref = node['$ref']
+            _instrumentation.count('resolve_ref')
             with resolver.resolving(ref) as resolved:
                 if ref in seen:
                     return {type: 'object'}  # return a distinct object for recursive data type
@@ -91,12 +287,104 @@ def _resolve_refs(uri, spec):
     return _do_resolve(spec)
 
 
+def get_digest(node):
+    """Return a content digest of a given spec node.
+
+    See :mod:`sphinxcontrib.openapi._hashing` for details.
+    """
+
+    return _hashing.Hashes().digest(node)
+
+
+def index_operations(paths, hashes=None):
+    """Return hex digests of operations keyed by endpoint and HTTP method.
+
+    Operations are indexed in the order they are defined in. Hashes may be
+    passed in to share them with other subtrees of the same spec.
+    """
+
+    hashes = hashes if hashes is not None else _hashing.Hashes()
+    index = {}
+
+    for endpoint, path in paths.items():
+        for method, operation in path.items():
+            if method.lower() in HTTP_METHODS:
+                index[endpoint, method] = hashes.digest(operation)
+    return index
+
+
+def _get_spec_data(spec, create=False):
+    """Return the extension's own data about a given spec."""
+
+    entry = _SPEC_DATA.get(id(spec))
+    if entry is not None and entry[0] is spec:
+        _SPEC_DATA.move_to_end(id(spec))
+        return entry[1]
+    if not create:
+        return {}
+
+    _SPEC_DATA[id(spec)] = (spec, {})
+    if len(_SPEC_DATA) > _SPEC_DATA_SIZE:
+        _SPEC_DATA.popitem(last=False)
+    return _SPEC_DATA[id(spec)][1]
+
+
+def get_local_files(spec):
+    """Return local files a given normalized spec has references to."""
+
+    return _get_spec_data(spec).get('files', [])
+
+
+def add_local_files(spec, files):
+    """Add local files to the ones a given normalized spec depends on."""
+
+    if files:
+        data = _get_spec_data(spec, create=True)
+        data['files'] = sorted(set(data.get('files', [])).union(files))
+
+
+def is_normalized(spec):
+    """Return 'True' if a given spec has been normalized already."""
+
+    return _get_spec_data(spec).get('normalized', False)
+
+
+def get_validation_level(spec):
+    """Return a level a given spec has been validated at, or 'None'."""
+
+    return _get_spec_data(spec).get('validated')
+
+
+def set_validation_level(spec, level):
+    """Mark a given spec as valid at a given validation level."""
+
+    _get_spec_data(spec, create=True)['validated'] = level
+
+
 def normalize_spec(spec, **options):
+    """Normalize a given spec in-place.
+
+    Normalization is idempotent, and a normalized spec is marked as such, so
+    normalizing it again is a no-op. That's important since the same spec is
+    usually passed through a few stages of the rendering pipeline, and
+    resolving references is an expensive operation.
+    """
+
+    if is_normalized(spec):
+        return spec
+
+    with _instrumentation.phase('normalize'):
+        return _normalize_spec(spec, **options)
+
+
+def _normalize_spec(spec, **options):
     # OpenAPI spec may contain JSON references, so we need resolve them
     # before we access the actual values trying to build an httpdomain
     # markup. Since JSON references may be relative, it's crucial to
     # pass a document URI in order to properly resolve them.
-    spec = _resolve_refs(options.get('uri', ''), spec)
+    resolver = OpenApiRefResolver(options.get('uri', ''), spec)
+    _fetch_remote_refs(options.get('uri', ''), spec, resolver)
+    spec = _resolve_refs(options.get('uri', ''), spec, resolver)
 
     # OpenAPI spec may contain common endpoint's parameters top-level.
     # In order to do not place if-s around the code to handle special
@@ -104,9 +392,20 @@ def normalize_spec(spec, **options):
     # endpoints definitions.
     for endpoint in spec.get('paths', {}).values():
         parameters = endpoint.pop('parameters', [])
-        for method in endpoint.values():
-            method.setdefault('parameters', [])
-            method['parameters'].extend(parameters)
+        for method, operation in endpoint.items():
+            if method not in HTTP_METHODS:
+                continue
+            operation.setdefault('parameters', [])
+            operation['parameters'].extend(parameters)
+
+    # Local files a spec has references to are its dependencies, so let's
+    # memorize them in order to be able to track their changes.
+    _get_spec_data(spec, create=True).update(
+        normalized=True,
+        files=sorted(resolver.local_files),
+    )
+    _instrumentation.count('normalize_spec')
+    return spec
 
 
 def get_text_converter(options):
@@ -117,3 +416,125 @@ def get_text_converter(options):
 
     # No conversion needed.
     return lambda s: s
+
+
+class MarkupWriter(object):
+    """Accumulate lines of reStructuredText markup.
+
+    The writer keeps track of current indentation, so nested blocks are
+    written in place rather than re-indented line by line on their way up.
+    Indentation prefix is built once per level, and blank lines are never
+    indented. Use ``indented()`` in a ``with`` statement to write a nested
+    block::
+
+        writer.write('.. http:get:: /')
+        with writer.indented():
+            writer.write(':statuscode 200:')
+    """
+
+    def __init__(self, indent=3):
+        self.lines = []
+        self._indent = ' ' * indent
+        self._prefix = ''
+        self._prefixes = []
+
+    def push(self, indent=None):
+        """Increase indentation by a given number of spaces."""
+        self._prefixes.append(self._prefix)
+        self._prefix += self._indent if indent is None else ' ' * indent
+
+    def pop(self):
+        """Restore indentation that was used before the last push."""
+        self._prefix = self._prefixes.pop()
+
+    def indented(self, indent=None):
+        """Increase indentation till the end of a 'with' block."""
+        # Rendering enters nested blocks a lot, and generator-based context
+        # managers are way too heavy for that. So the writer is a context
+        # manager that restores indentation on exit by itself.
+        self.push(indent)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.pop()
+
+    def write(self, line=''):
+        """Write a line at current indentation."""
+        self.lines.append(self._prefix + line if line else '')
+
+    def writelines(self, lines):
+        """Write lines at current indentation."""
+        prefix = self._prefix
+        self.lines.extend([prefix + line if line else '' for line in lines])
+
+    @property
+    def prefix(self):
+        """Indentation prefix of lines written at this point."""
+        return self._prefix
+
+    def writeraw(self, lines):
+        """Write lines that are indented already (e.g. using 'prefix')."""
+        self.lines.extend(lines)
+
+    def getvalue(self):
+        """Return written markup as a text."""
+        return '\n'.join(self.lines)
+
+
+class RenderCache(object):
+    """Rendered markup of operations.
+
+    A spec that is rendered over and over again while being edited usually
+    has a few operations changed between renders. The cache keeps markup of
+    operations keyed by their content, so unchanged operations are not
+    rendered again. Since operations are rendered with options, a cache must
+    not be shared by renders with different options.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._used = {}
+        self._hashes = _hashing.Hashes()
+        self.hits = 0
+        self.misses = 0
+
+    def write(self, writer, write, endpoint, method, operation, *args, **kwargs):
+        """Write an operation, rendering it by 'write' if it's not cached."""
+        key = (endpoint, method, self._hashes.digest(operation))
+        lines = self._used.get(key) or self._entries.get(key)
+
+        if lines is None:
+            self.misses += 1
+            operation_writer = MarkupWriter()
+            write(operation_writer, endpoint, method, operation, *args, **kwargs)
+            lines = operation_writer.lines
+        else:
+            self.hits += 1
+
+        self._used[key] = lines
+        writer.writelines(lines)
+
+    def collect(self):
+        """Drop operations that haven't been written since the last call.
+
+        It's supposed to be called once a spec is rendered, so the cache
+        keeps operations of the latest version of the spec only.
+        """
+        self._entries, self._used = self._used, {}
+        # Hashes are memoized by node identity, and the next version of the
+        # spec is a whole new set of nodes.
+        self._hashes = _hashing.Hashes()
+
+
+def write_operation(writer, render_cache, write, endpoint, method, operation,
+                    *args, **kwargs):
+    """Write an operation by 'write', through a render cache if passed."""
+    _instrumentation.count('write_operation')
+    if render_cache is None:
+        write(writer, endpoint, method, operation, *args, **kwargs)
+    else:
+        render_cache.write(
+            writer, write, endpoint, method, operation, *args, **kwargs)
@@ -45,10 +45,13 @@ def run_sphinx(tmpdir):
     src = tmpdir.ensure('src', dir=True)
     out = tmpdir.ensure('out', dir=True)
 
-    def run(spec, options={}):
+    def run(spec, options={}, conf={}, directive='openapi'):
         options_raw = '\n'.join([
             '   %s' % _format_option_raw(key, val)
             for key, val in options.items()])
+        conf_raw = '\n'.join([
+            '%s = %r' % (key, val)
+            for key, val in conf.items()])
 
         src.join('conf.py').write_text(
             textwrap.dedent('''
@@ -60,11 +63,11 @@ def run_sphinx(tmpdir):
                 extensions = ['sphinxcontrib.openapi']
                 source_suffix = '.rst'
                 master_doc = 'index'
-            '''),
+            ''') + conf_raw,
             encoding='utf-8')
 
         src.join('index.rst').write_text(
-            '.. openapi:: %s\n%s' % (spec, options_raw),
+            '.. %s:: %s\n%s' % (directive, spec, options_raw),
             encoding='utf-8')
 
         Sphinx(
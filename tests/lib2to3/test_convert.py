@@ -442,3 +442,123 @@ def test_vendor_extensions(oas_fragment):
                   description: a response description
         x-vendor-ext: vendor-ext
         """)
+
+
+def test_definitions(oas_fragment):
+    spec = oas_fragment("""
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: 1.0
+        paths:
+          /test:
+            get:
+              produces: [application/json]
+              responses:
+                '200':
+                  description: a response description
+                  schema:
+                    type: object
+        definitions:
+          Test:
+            type: object
+        """)
+    spec["paths"]["/test"]["get"]["responses"]["200"]["schema"] = spec["definitions"][
+        "Test"
+    ]
+
+    converted = lib2to3.convert(spec)
+    assert converted["components"] == {"schemas": {"Test": {"type": "object"}}}
+
+    # Resolved references are the very same objects, and so must be their
+    # converted counterparts.
+    response = converted["paths"]["/test"]["get"]["responses"]["200"]
+    assert (
+        response["content"]["application/json"]["schema"]
+        is converted["components"]["schemas"]["Test"]
+    )
+
+
+def test_selected_paths(oas_fragment):
+    converted = lib2to3.convert(
+        oas_fragment("""
+            swagger: "2.0"
+            info:
+              title: An example spec
+              version: 1.0
+            paths:
+              /foo:
+                get:
+                  schemes:
+                    - https
+                  responses:
+                    '200':
+                      description: a response description
+              /bar:
+                get:
+                  schemes:
+                    - http
+                  responses:
+                    '200':
+                      description: a response description
+              x-vendor-ext: vendor-ext
+            """),
+        paths=["/foo"],
+    )
+    assert converted == oas_fragment("""
+        openapi: 3.0.3
+        info:
+          title: An example spec
+          version: 1.0
+        paths:
+          /foo:
+            get:
+              responses:
+                '200':
+                  description: a response description
+          x-vendor-ext: vendor-ext
+        servers:
+          - url: "https://"
+        """)
+
+
+def test_cached(oas_fragment):
+    spec = """
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: 1.0
+        paths:
+          /test:
+            get:
+              responses:
+                '200':
+                  description: a response description
+        """
+
+    converted = lib2to3.convert(oas_fragment(spec))
+    assert lib2to3.convert(oas_fragment(spec)) is converted
+    assert lib2to3.convert(oas_fragment(spec), paths=["/test"]) is not converted
+
+
+def test_cached_invalidated_on_change(oas_fragment):
+    spec = oas_fragment("""
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: 1.0
+        paths:
+          /test:
+            get:
+              responses:
+                '200':
+                  description: a response description
+        """)
+
+    converted = lib2to3.convert(spec)
+    spec["paths"]["/test"]["get"]["summary"] = "an operation summary"
+
+    assert lib2to3.convert(spec) is not converted
+    assert lib2to3.convert(spec)["paths"]["/test"]["get"]["summary"] == (
+        "an operation summary"
+    )
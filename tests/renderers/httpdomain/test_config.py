@@ -0,0 +1,75 @@
+"""OpenAPI spec renderer: precompiled config."""
+
+from sphinxcontrib.openapi import renderers
+
+
+def test_config_interned(fakestate):
+    """Renderers with the same options share the same config."""
+
+    renderer_a = renderers.HttpdomainRenderer(
+        fakestate,
+        {
+            "uri": "file:///a.yaml",
+            "http-methods-order": ["head", "get"],
+            "example-preference": ["application/json"],
+        },
+    )
+    renderer_b = renderers.HttpdomainRenderer(
+        fakestate,
+        {
+            "example-preference": ["application/json"],
+            "http-methods-order": ["head", "get"],
+            "uri": "file:///b.yaml",
+        },
+    )
+
+    assert renderer_a._config is renderer_b._config
+    assert hash(renderer_a._config) == hash(renderer_b._config)
+
+
+def test_config_distinct(fakestate):
+    """Renderers with different options have different configs."""
+
+    renderer_a = renderers.HttpdomainRenderer(fakestate, {})
+    renderer_b = renderers.HttpdomainRenderer(
+        fakestate, {"generate-examples-from-schemas": None}
+    )
+
+    assert renderer_a._config != renderer_b._config
+
+
+def test_config_renderer_defaults(fakestate):
+    """Defaults come from the renderer class."""
+
+    class Renderer(renderers.HttpdomainRenderer):
+        _response_examples_for = {"200"}
+        _request_parameters_order = ["query"]
+
+    renderer_a = renderers.HttpdomainRenderer(fakestate, {})
+    renderer_b = Renderer(fakestate, {})
+
+    assert renderer_a._config.response_examples_for == {"200", "201", "202", "2XX"}
+    assert renderer_b._config.response_examples_for == {"200"}
+    assert renderer_b._config.request_parameters_order == ("query",)
+
+
+def test_config_precompiled(fakestate):
+    """Orders are precompiled into priority maps."""
+
+    renderer = renderers.HttpdomainRenderer(
+        fakestate,
+        {
+            "http-methods-order": ["HEAD", "Get"],
+            "request-parameters-order": ["query", "path"],
+            "example-preference": ["text/plain", "application/json"],
+            "response-example-preference": ["application/json"],
+        },
+    )
+
+    assert renderer._config.http_methods_priorities == {"head": 0, "get": 1}
+    assert renderer._config.request_parameters_priorities == {"query": 0, "path": 1}
+    assert renderer._config.request_example_priorities == {
+        "text/plain": 0,
+        "application/json": 1,
+    }
+    assert renderer._config.response_example_priorities == {"application/json": 0}
@@ -1232,3 +1232,69 @@ def test_render_json_schema_description_enum_wo_type(
         :{directive} root:
         :{typedirective} root: enum
         """.rstrip())
+
+
+@pytest.mark.parametrize(
+    ["options", "expected"],
+    [
+        pytest.param(
+            {"max-properties": 1},
+            """\
+            :resjson prop_a:
+            :resjsonobj prop_a: object
+            :resjson prop_a.eggs:
+            :resjsonobj prop_a.eggs: object
+            :resjson prop_a.eggs.spam:
+            :resjsonobj prop_a.eggs.spam: string
+            :resjson prop_a.eggs...:
+            :resjsonobj prop_a.eggs...: truncated
+            :resjson ...:
+            :resjsonobj ...: truncated
+            """,
+            id="max-properties",
+        ),
+        pytest.param(
+            {"max-depth": 2},
+            """\
+            :resjson prop_a:
+            :resjsonobj prop_a: object
+            :resjson prop_a.eggs:
+            :resjsonobj prop_a.eggs: object
+            :resjson prop_a.eggs...:
+            :resjsonobj prop_a.eggs...: truncated
+            :resjson prop_b:
+            :resjsonobj prop_b: number
+            """,
+            id="max-depth",
+        ),
+    ],
+)
+def test_render_json_schema_description_budget(
+    fakestate, oas_fragment, options, expected
+):
+    """JSON schema description is truncated when out of budget."""
+
+    testrenderer = renderers.HttpdomainRenderer(fakestate, options)
+
+    markup = textify(
+        testrenderer.render_json_schema_description(
+            oas_fragment("""
+                type: object
+                properties:
+                  prop_a:
+                    type: object
+                    properties:
+                      eggs:
+                        type: object
+                        properties:
+                          spam:
+                            type: string
+                          ham:
+                            type: string
+                  prop_b:
+                    type: number
+                """),
+            "res",
+        )
+    )
+    assert markup == textwrap.dedent(expected).rstrip()
@@ -1,7 +1,10 @@
 """OpenAPI spec renderer: render_paths."""
 
+import copy
 import textwrap
 
+import pytest
+
 from sphinxcontrib.openapi import renderers
 
 
@@ -200,6 +203,43 @@ def test_render_paths_parameters_common(testrenderer, oas_fragment):
         """)
 
 
+def test_render_paths_parameters_common_unchanged(fakestate, oas_fragment):
+    """Paths definition is left unchanged, so it may be rendered again."""
+
+    paths = oas_fragment("""
+                /evidences/{evidenceId}:
+                  summary: Ignored
+                  get:
+                    responses:
+                      '200':
+                        description: An evidence.
+                  put:
+                    responses:
+                      '200':
+                        description: An evidence.
+                  parameters:
+                    - name: evidenceId
+                      in: path
+                      required: true
+                      schema:
+                        type: string
+                """)
+    expected = copy.deepcopy(paths)
+
+    for method in ("get", "put"):
+        testrenderer = renderers.HttpdomainRenderer(fakestate, {"methods": [method]})
+        markup = textify(testrenderer.render_paths(paths))
+        assert markup == textwrap.dedent(f"""\
+            .. http:{method}:: /evidences/{{evidenceId}}
+
+               :param evidenceId:
+               :paramtype evidenceId: string, required
+               :statuscode 200:
+                  An evidence.
+            """)
+    assert paths == expected
+
+
 def test_render_paths_parameters_common_prepend(testrenderer, oas_fragment):
     """Paths definition with common parameters is rendered."""
 
@@ -386,3 +426,87 @@ def test_render_paths_methods_order_insensitive(fakestate, oas_fragment):
            :statuscode 201:
               An evidence created.
         """)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_render_paths_workers(fakestate, oas_fragment, executor):
+    """Paths rendered concurrently preserve the order of operations."""
+
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate,
+        {
+            "http-methods-order": ["post", "get"],
+            "workers": 2,
+            "executor": executor,
+        },
+    )
+    markup = textify(testrenderer.render_paths(oas_fragment("""
+                /evidences/{evidenceId}:
+                  parameters:
+                    - name: evidenceId
+                      in: path
+                      required: true
+                      schema:
+                        type: string
+                  get:
+                    summary: Retrieve an evidence by ID.
+                    responses:
+                      '200':
+                        description: An evidence.
+                  delete:
+                    summary: Delete an evidence by ID.
+                    responses:
+                      '204':
+                        description: An evidence deleted.
+                /evidences:
+                  get:
+                    summary: Retrieve evidences.
+                    responses:
+                      '200':
+                        description: A list of evidences.
+                  post:
+                    summary: Create an evidence.
+                    responses:
+                      '201':
+                        description: An evidence created.
+                """)))
+    assert markup == textwrap.dedent("""\
+        .. http:get:: /evidences/{evidenceId}
+
+           **Retrieve an evidence by ID.**
+
+           :param evidenceId:
+           :paramtype evidenceId: string, required
+           :statuscode 200:
+              An evidence.
+
+        .. http:delete:: /evidences/{evidenceId}
+
+           **Delete an evidence by ID.**
+
+           :param evidenceId:
+           :paramtype evidenceId: string, required
+           :statuscode 204:
+              An evidence deleted.
+
+        .. http:post:: /evidences
+
+           **Create an evidence.**
+
+           :statuscode 201:
+              An evidence created.
+
+        .. http:get:: /evidences
+
+           **Retrieve evidences.**
+
+           :statuscode 200:
+              A list of evidences.
+        """)
+
+
+def test_render_paths_workers_empty(fakestate):
+    """Empty paths are rendered concurrently."""
+
+    testrenderer = renderers.HttpdomainRenderer(fakestate, {"workers": 2})
+    assert textify(testrenderer.render_paths({})) == ""
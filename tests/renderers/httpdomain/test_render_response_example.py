@@ -6,7 +6,7 @@ import textwrap
 import pytest
 import responses
 
-from sphinxcontrib.openapi import renderers
+from sphinxcontrib.openapi import _json, renderers
 
 if sys.version_info[:2] >= (3, 13):
     http_422_description = "Unprocessable Content"
@@ -418,6 +418,118 @@ def test_render_response_example_external_errored_next_media_type(
         """.rstrip())
 
 
+@pytest.mark.parametrize(
+    ["uri", "external_value"],
+    [
+        pytest.param("{spec}", "examples/test.json", id="relative"),
+        pytest.param("", "file://{example}", id="file"),
+    ],
+)
+def test_render_response_example_external_local(
+    fakestate, oas_fragment, tmp_path, uri, external_value
+):
+    """Path response's example can be read from a local file."""
+
+    tmp_path.joinpath("examples").mkdir()
+    example = tmp_path.joinpath("examples", "test.json")
+    example.write_text('{"foo": "bar", "baz": 42}', encoding="utf-8")
+    spec = tmp_path.joinpath("openapi.yml")
+
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate, {"uri": uri.format(spec=spec.as_uri())}
+    )
+    markup = textify(
+        testrenderer.render_response_example(
+            oas_fragment(f"""
+                application/json:
+                  examples:
+                    test:
+                      externalValue: {external_value.format(example=example)}
+                """),
+            "200",
+        )
+    )
+    assert markup == textwrap.dedent("""\
+        .. sourcecode:: http
+
+           HTTP/1.1 200 OK
+           Content-Type: application/json
+
+           {"foo": "bar", "baz": 42}
+        """.rstrip())
+
+
+@pytest.mark.parametrize(
+    ["options"],
+    [
+        pytest.param({"max-example-lines": 2}, id="max-example-lines"),
+        pytest.param({"max-example-bytes": 17}, id="max-example-bytes"),
+    ],
+)
+def test_render_response_example_external_truncated(
+    fakestate, oas_fragment, tmp_path, options
+):
+    """Path response's external example is truncated by a budget."""
+
+    tmp_path.joinpath("test.json").write_text(
+        '{\n  "foo": "bar",\n  "baz": 42\n}\n', encoding="utf-8"
+    )
+
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate, dict(options, uri=tmp_path.joinpath("openapi.yml").as_uri())
+    )
+    markup = textify(
+        testrenderer.render_response_example(
+            oas_fragment("""
+                application/json:
+                  examples:
+                    test:
+                      externalValue: test.json
+                """),
+            "200",
+        )
+    )
+    assert markup == textwrap.dedent("""\
+        .. sourcecode:: http
+
+           HTTP/1.1 200 OK
+           Content-Type: application/json
+
+           {
+             "foo": "bar",
+           ...
+        """.rstrip())
+
+
+def test_render_response_example_external_not_supported(
+    testrenderer, oas_fragment, caplog
+):
+    """Path response's example with not supported protocol is skipped."""
+
+    markup = textify(
+        testrenderer.render_response_example(
+            oas_fragment("""
+                application/json:
+                  examples:
+                    test:
+                      externalValue: ftp://example.com/json/examples/test.json
+                    fallback:
+                      value: '{"spam": 42}'
+                """),
+            "200",
+        )
+    )
+    assert markup == textwrap.dedent("""\
+        .. sourcecode:: http
+
+           HTTP/1.1 200 OK
+           Content-Type: application/json
+
+           {"spam": 42}
+        """.rstrip())
+    assert "Not supported protocol in 'externalValue'" in caplog.text
+
+
 def test_render_response_example_content_type(testrenderer, oas_fragment):
     """Path response's example can render something other than application/json."""
 
@@ -460,6 +572,32 @@ def test_render_response_example_noop(testrenderer, oas_fragment):
     assert markup == ""
 
 
+def test_render_response_example_generated_not_cached(fakestate, oas_fragment):
+    """Generated examples are new every time, so they are not cached."""
+
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate, {"generate-examples-from-schemas": True}
+    )
+    _json.set_backend("json")
+
+    markup = textify(
+        testrenderer.render_response_example(
+            oas_fragment("""
+                application/json:
+                  schema:
+                    type: object
+                    properties:
+                      foo:
+                        type: string
+                """),
+            "200",
+        )
+    )
+
+    assert '"foo": "string"' in markup
+    assert not _json._cache
+
+
 @pytest.mark.parametrize(
     ["status_code", "status_text"],
     [
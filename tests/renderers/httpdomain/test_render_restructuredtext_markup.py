@@ -1,8 +1,11 @@
 """OpenAPI spec renderer: render_restructuredtext_markup."""
 
+import copy
 import textwrap
 
-from sphinxcontrib.openapi import renderers
+import pytest
+
+from sphinxcontrib.openapi import renderers, utils
 
 
 def textify(generator):
@@ -495,3 +498,214 @@ def test_oas3_response_example_2xx(testrenderer, oas_fragment):
            :statuscode 404:
               resource not found
         """)
+
+
+def test_oas2_paths(fakestate, oas_fragment):
+    """Only selected paths are rendered."""
+
+    testrenderer = renderers.HttpdomainRenderer(fakestate, {"paths": ["/bar", "/foo"]})
+    markup = textify(testrenderer.render_restructuredtext_markup(oas_fragment("""
+                swagger: "2.0"
+                info:
+                  title: An example spec
+                  version: 1.0
+                paths:
+                  /foo:
+                    get:
+                      responses:
+                        '200':
+                          description: foo
+                  /bar:
+                    get:
+                      responses:
+                        '200':
+                          description: bar
+                  /baz:
+                    get:
+                      responses:
+                        '200':
+                          description: baz
+                """)))
+    assert markup == textwrap.dedent("""\
+        .. http:get:: /bar
+
+           :statuscode 200:
+              bar
+
+        .. http:get:: /foo
+
+           :statuscode 200:
+              foo
+        """)
+
+
+def test_oas3_paths_invalid(fakestate, oas_fragment):
+    """Selected paths must be defined in the spec."""
+
+    testrenderer = renderers.HttpdomainRenderer(fakestate, {"paths": ["/foo", "/bar"]})
+
+    with pytest.raises(ValueError) as excinfo:
+        textify(testrenderer.render_restructuredtext_markup(oas_fragment("""
+                openapi: 3.0.3
+                info:
+                  title: An example spec
+                  version: 1.0
+                paths:
+                  /foo:
+                    get:
+                      responses:
+                        '200':
+                          description: foo
+                """)))
+
+    assert str(excinfo.value) == "One or more paths are not defined in the spec: /bar."
+
+
+def test_oas3_external_examples(fakestate, oas_fragment, tmp_path):
+    """Local external examples are read beforehand, and tracked as files."""
+
+    example = tmp_path.joinpath("example.json")
+    spec = oas_fragment("""
+            openapi: 3.0.3
+            info:
+              title: An example spec
+              version: 1.0
+            paths:
+              /foo:
+                get:
+                  responses:
+                    '200':
+                      description: ok
+                      content:
+                        application/json:
+                          examples:
+                            foo:
+                              externalValue: example.json
+            """)
+    options = {"uri": tmp_path.joinpath("openapi.yml").as_uri()}
+
+    # The same spec is rendered over and over again, as it is when specs are
+    # cached, and changes of local files are picked up.
+    for value in ('{"foo": 1}', '{"foo": 22}'):
+        example.write_text(value, encoding="utf-8")
+        testrenderer = renderers.HttpdomainRenderer(fakestate, options)
+        markup = textify(testrenderer.render_restructuredtext_markup(spec))
+        assert value in markup
+
+    assert utils.get_local_files(spec) == [str(example)]
+
+
+def test_oas3_external_examples_budget(fakestate, oas_fragment, tmp_path):
+    """Examples truncated by a budget do not leak into other renders."""
+
+    tmp_path.joinpath("example.txt").write_text("foo\nbar\nbaz", encoding="utf-8")
+    spec = oas_fragment("""
+            openapi: 3.0.3
+            info:
+              title: An example spec
+              version: 1.0
+            paths:
+              /foo:
+                get:
+                  responses:
+                    '200':
+                      description: ok
+                      content:
+                        text/plain:
+                          examples:
+                            foo:
+                              externalValue: example.txt
+            """)
+    pristine = copy.deepcopy(spec)
+    uri = tmp_path.joinpath("openapi.yml").as_uri()
+
+    for options, expected in [
+        ({"uri": uri, "max-example-lines": 1}, "foo\n...\n"),
+        ({"uri": uri}, "foo\nbar\nbaz\n"),
+    ]:
+        testrenderer = renderers.HttpdomainRenderer(fakestate, options)
+        markup = textify(testrenderer.render_restructuredtext_markup(spec))
+        assert markup.endswith(
+            "Content-Type: text/plain\n\n" + textwrap.indent(expected, " " * 9)
+        )
+
+    examples = spec["paths"]["/foo"]["get"]["responses"]["200"]["content"]
+    assert examples == pristine["paths"]["/foo"]["get"]["responses"]["200"]["content"]
+
+
+def test_oas3_methods(fakestate, oas_fragment):
+    """Only selected HTTP methods are rendered."""
+
+    testrenderer = renderers.HttpdomainRenderer(fakestate, {"methods": ["POST"]})
+    markup = textify(testrenderer.render_restructuredtext_markup(oas_fragment("""
+                openapi: 3.0.3
+                info:
+                  title: An example spec
+                  version: 1.0
+                paths:
+                  /foo:
+                    get:
+                      responses:
+                        '200':
+                          description: foo
+                    post:
+                      responses:
+                        '201':
+                          description: created
+                """)))
+    assert markup == textwrap.dedent("""\
+        .. http:post:: /foo
+
+           :statuscode 201:
+              created
+        """)
+
+
+def test_oas2_rendered_twice(fakestate, oas_fragment):
+    """A converted OAS 2 spec is shared by renders, yet none changes it."""
+
+    spec = oas_fragment("""
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: 1.0
+        paths:
+          /{username}:
+            parameters:
+              - in: path
+                name: username
+                required: true
+                type: string
+            get:
+              responses:
+                '200':
+                  description: a user
+            delete:
+              responses:
+                '204':
+                  description: a user is deleted
+        """)
+
+    def render(methods=None):
+        options = {"methods": methods} if methods else {}
+        testrenderer = renderers.HttpdomainRenderer(fakestate, options)
+        return textify(testrenderer.render_restructuredtext_markup(spec))
+
+    markup = render()
+    assert render(["get"]) + "\n" + render(["delete"]) == markup
+    assert render() == markup
+    assert markup == textwrap.dedent("""\
+        .. http:get:: /{username}
+
+           :param username:
+           :paramtype username: string, required
+           :statuscode 200:
+              a user
+
+        .. http:delete:: /{username}
+
+           :param username:
+           :paramtype username: string, required
+           :statuscode 204:
+              a user is deleted
+        """)
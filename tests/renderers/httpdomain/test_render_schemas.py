@@ -0,0 +1,236 @@
+"""OpenAPI spec renderer: shared schemas."""
+
+import textwrap
+import types
+
+import pytest
+
+from sphinxcontrib.openapi import renderers
+from sphinxcontrib.openapi.renderers import _httpdomain
+
+# A key of shared schemas rendered with neither a document nor a spec URI.
+KEY = _httpdomain._get_schemas_key(None, "")
+
+
+def textify(generator):
+    return "\n".join(generator)
+
+
+@pytest.fixture(scope="function")
+def sharedrenderer(fakestate):
+    return renderers.HttpdomainRenderer(fakestate, {"shared-schemas": True})
+
+
+@pytest.fixture(scope="function")
+def petstore(oas_fragment):
+    return oas_fragment("""
+        openapi: "3.0.0"
+        info:
+          title: An example spec
+          version: "1.0"
+        paths:
+          /pets:
+            post:
+              requestBody:
+                content:
+                  application/json:
+                    schema:
+                      $ref: "#/components/schemas/Pet"
+              responses:
+                '201':
+                  description: Created.
+                  content:
+                    application/json:
+                      schema:
+                        type: object
+                        properties:
+                          pet:
+                            $ref: "#/components/schemas/Pet"
+                          owners:
+                            type: array
+                            items:
+                              $ref: "#/components/schemas/Owner"
+                        required: [pet]
+        components:
+          schemas:
+            Unused:
+              type: object
+              properties:
+                spam:
+                  type: string
+            Owner:
+              type: object
+              description: Owns pets.
+              properties:
+                name:
+                  type: string
+            Pet:
+              type: object
+              properties:
+                id:
+                  type: integer
+                  format: int64
+                  description: Pet identifier.
+                tag:
+                  $ref: "#/components/schemas/Tag"
+              required: [id]
+            Tag:
+              type: string
+              enum: [cat, dog]
+        """)
+
+
+def test_render_schemas(sharedrenderer, petstore):
+    """Shared schemas are rendered once, and referenced from operations."""
+
+    markup = textify(sharedrenderer.render_restructuredtext_markup(petstore))
+    assert markup == textwrap.dedent(f"""\
+        .. http:post:: /pets
+
+           :Request JSON Object: :ref:`Pet <openapi-schema-{KEY}-Pet>`
+
+
+           :resjson pet:
+           :resjsonobj pet: :ref:`Pet <openapi-schema-{KEY}-Pet>`, required
+           :resjson owners[]:
+           :resjsonobj owners[]: :ref:`Owner <openapi-schema-{KEY}-Owner>`
+
+           :statuscode 201:
+              Created.
+
+
+        .. _openapi-schema-{KEY}-Owner:
+
+        .. rubric:: Owner
+
+        Owns pets.
+
+        (object)
+
+        :name: (string)
+
+        .. _openapi-schema-{KEY}-Pet:
+
+        .. rubric:: Pet
+
+        (object)
+
+        :id: (integer:int64, required)
+
+           Pet identifier.
+        :tag: (:ref:`Tag <openapi-schema-{KEY}-Tag>`)
+
+        .. _openapi-schema-{KEY}-Tag:
+
+        .. rubric:: Tag
+
+        (string:enum)
+        """)
+
+
+def _get_state(docname):
+    env = types.SimpleNamespace(docname=docname)
+    return types.SimpleNamespace(
+        document=types.SimpleNamespace(settings=types.SimpleNamespace(env=env))
+    )
+
+
+def test_render_schemas_labels(petstore):
+    """Labels are unique to a spec and a document it's rendered in."""
+
+    labels = set()
+    for docname, uri in [
+        ("index", "file:///a.yml"),
+        ("index", "file:///b.yml"),
+        ("pets", "file:///a.yml"),
+    ]:
+        testrenderer = renderers.HttpdomainRenderer(
+            _get_state(docname), {"shared-schemas": True, "uri": uri}
+        )
+        markup = textify(testrenderer.render_restructuredtext_markup(petstore))
+        labels.update(
+            line for line in markup.splitlines() if line.startswith(".. _openapi")
+        )
+
+    assert len(labels) == 9
+
+
+def test_render_schemas_disabled(testrenderer, petstore):
+    """Shared schemas are expanded unless asked otherwise."""
+
+    markup = textify(testrenderer.render_restructuredtext_markup(petstore))
+    assert "openapi-schema" not in markup
+    assert ":reqjson id:" in markup
+    assert ":resjson pet.id:" in markup
+
+
+def test_render_schemas_no_json_schema_description(fakestate, petstore):
+    """Shared schemas are not rendered if JSON schemas aren't described."""
+
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate, {"shared-schemas": True, "no-json-schema-description": True}
+    )
+
+    markup = textify(testrenderer.render_restructuredtext_markup(petstore))
+    assert "openapi-schema" not in markup
+
+
+def test_render_schemas_oas2(sharedrenderer, oas_fragment):
+    """Shared schemas of OAS 2 come from definitions."""
+
+    markup = textify(sharedrenderer.render_restructuredtext_markup(oas_fragment("""
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: "1.0"
+        paths:
+          /pets:
+            get:
+              produces: [application/json]
+              responses:
+                '200':
+                  description: Pets.
+                  schema:
+                    type: array
+                    items:
+                      $ref: "#/definitions/Pet"
+        definitions:
+          Pet:
+            type: object
+            properties:
+              name:
+                type: string
+        """)))
+    assert markup == textwrap.dedent(f"""\
+        .. http:get:: /pets
+
+           :Response JSON Array of Objects: :ref:`Pet <openapi-schema-{KEY}-Pet>`
+
+           :statuscode 200:
+              Pets.
+
+
+        .. _openapi-schema-{KEY}-Pet:
+
+        .. rubric:: Pet
+
+        (object)
+
+        :name: (string)
+        """)
+
+
+def test_render_schemas_process_workers(fakestate, petstore):
+    """Shared schemas are referenced when rendered in worker processes."""
+
+    expected = textify(
+        renderers.HttpdomainRenderer(
+            fakestate, {"shared-schemas": True}
+        ).render_restructuredtext_markup(petstore)
+    )
+    testrenderer = renderers.HttpdomainRenderer(
+        fakestate, {"shared-schemas": True, "workers": 2, "executor": "process"}
+    )
+
+    markup = textify(testrenderer.render_restructuredtext_markup(petstore))
+    assert markup == expected
@@ -0,0 +1,161 @@
+"""Tests cost analysis of specs."""
+
+import copy
+import json
+import textwrap
+
+import yaml
+
+from sphinxcontrib.openapi import _analyze, utils
+from sphinxcontrib.openapi.__main__ import main
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /pets:
+        get:
+          tags: [pets]
+          summary: List pets
+          responses:
+            '200':
+              description: ok
+              content:
+                application/json:
+                  schema:
+                    type: array
+                    items:
+                      $ref: '#/components/schemas/Pet'
+        post:
+          tags: [pets]
+          summary: Create a pet
+          requestBody:
+            content:
+              application/json:
+                schema:
+                  $ref: '#/components/schemas/Pet'
+                example: {name: Rex}
+          responses:
+            '201':
+              description: created
+      /nodes:
+        get:
+          summary: List nodes
+          responses:
+            '200':
+              description: ok
+              content:
+                application/json:
+                  schema:
+                    $ref: '#/components/schemas/Node'
+    components:
+      schemas:
+        Pet:
+          type: object
+          properties:
+            name:
+              type: string
+            owner:
+              $ref: '#/components/schemas/Owner'
+        Owner:
+          type: object
+          properties:
+            name:
+              type: string
+        Node:
+          type: object
+          properties:
+            children:
+              type: array
+              items:
+                $ref: '#/components/schemas/Node/properties/children/items'
+            parent:
+              $ref: '#/components/schemas/Tree'
+        Tree:
+          type: object
+          properties:
+            root:
+              $ref: '#/components/schemas/Node'
+""")
+
+
+def _analyze_spec(**options):
+    raw = yaml.safe_load(_SPEC)
+    spec = utils.normalize_spec(copy.deepcopy(raw))
+    return _analyze.analyze(raw, spec, **options)
+
+
+def test_analyze_counts():
+    report = _analyze_spec()
+
+    assert report["operations"] == 3
+    assert report["nodes"]["resolved"] > report["nodes"]["raw"]
+    assert report["nodes"]["blowup"] == (
+        report["nodes"]["resolved"] / report["nodes"]["raw"]
+    )
+    assert report["max_schema_depth"] == {"depth": 4, "operation": "GET /pets"}
+
+
+def test_analyze_refs():
+    report = _analyze_spec()
+
+    assert report["refs"]["total"] == 7
+    fan_in = {entry["ref"]: entry["count"] for entry in report["refs"]["fan_in"]}
+    fan_out = {entry["referrer"]: entry["count"] for entry in report["refs"]["fan_out"]}
+    assert fan_in["#/components/schemas/Pet"] == 2
+    assert fan_out["#/components/schemas/Node"] == 2
+    assert fan_out["GET /pets"] == 1
+
+    # References to a part of a schema are references to the schema.
+    assert report["recursive_schemas"] == [
+        "#/components/schemas/Node",
+        "#/components/schemas/Tree",
+    ]
+
+
+def test_analyze_examples():
+    report = _analyze_spec(top=2)
+
+    # The request body of 'POST /pets' has an example, so nothing is
+    # generated for it.
+    assert [
+        (example["operation"], example["status"], example["media_type"])
+        for example in report["largest_examples"]
+    ] == [
+        ("GET /pets", "200", "application/json"),
+        ("GET /nodes", "200", "application/json"),
+    ]
+
+
+def test_analyze_render():
+    report = _analyze_spec()
+    render = report["render"]
+
+    assert sorted(render["tags"]) == ["default", "pets"]
+    assert render["tags"]["pets"]["operations"] == 2
+    assert sum(tag["lines"] for tag in render["tags"].values()) <= render["lines"]
+    assert {operation["operation"] for operation in render["slowest"]} == {
+        "GET /pets",
+        "POST /pets",
+        "GET /nodes",
+    }
+    assert all(0 <= operation["share"] <= 1 for operation in render["slowest"])
+
+
+def test_analyze_examples_option():
+    lines = _analyze_spec()["render"]["lines"]
+    assert _analyze_spec(examples=True)["render"]["lines"] > lines
+
+
+def test_main(tmpdir):
+    spec = tmpdir.join("spec.yml")
+    spec.write_text(_SPEC, encoding="utf-8")
+    output = tmpdir.join("report.json")
+
+    main(["analyze", "-n", "1", "-o", output.strpath, spec.strpath])
+
+    report = json.loads(output.read_text("utf-8"))
+    assert report["operations"] == 3
+    assert len(report["render"]["slowest"]) == 1
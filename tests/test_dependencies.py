@@ -0,0 +1,121 @@
+"""Tests tracking of spec dependencies."""
+
+import io
+import os
+import textwrap
+import time
+
+import pytest
+
+from sphinx.application import Sphinx
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /resources:
+        get:
+          summary: {summary}
+          responses:
+            '200':
+              description: ok
+""")
+
+
+@pytest.fixture(scope="function")
+def build(tmpdir):
+    src = tmpdir.ensure("src", dir=True)
+    out = tmpdir.ensure("out", dir=True)
+
+    src.join("index.rst").write_text(".. openapi:: spec.yml\n", encoding="utf-8")
+    src.join("other.rst").write_text("Other\n=====\n", encoding="utf-8")
+
+    def build(dependency_check):
+        src.join("conf.py").write_text(
+            textwrap.dedent("""
+            extensions = ['sphinxcontrib.openapi']
+            master_doc = 'index'
+            exclude_patterns = ['*.yml']
+            openapi_dependency_check = %r
+        """ % dependency_check),
+            encoding="utf-8",
+        )
+
+        status = io.StringIO()
+        Sphinx(
+            srcdir=src.strpath,
+            confdir=src.strpath,
+            outdir=out.strpath,
+            doctreedir=out.join(".doctrees").strpath,
+            buildername="html",
+            status=status,
+        ).build()
+        return status.getvalue()
+
+    def write_spec(summary, mtime, name="spec.yml"):
+        # Sphinx considers a dependency changed if it's been modified after
+        # the document was read, hence the times are in the future.
+        mtime = time.time() + mtime
+        spec = src.join(name)
+        spec.write_text(_SPEC.format(summary=summary), encoding="utf-8")
+        os.utime(spec.strpath, (mtime, mtime))
+
+    yield build, write_spec
+
+
+@pytest.mark.parametrize(
+    "dependency_check, expected",
+    [
+        ("mtime", "0 added, 1 changed, 0 removed"),
+        ("content", "0 added, 0 changed, 0 removed"),
+    ],
+)
+def test_spec_touched(build, dependency_check, expected):
+    build, write_spec = build
+
+    write_spec("Resources", 100)
+    assert "2 added, 0 changed, 0 removed" in build(dependency_check)
+
+    write_spec("Resources", 200)
+    assert expected in build(dependency_check)
+
+
+@pytest.mark.parametrize("dependency_check", ["mtime", "content"])
+def test_spec_changed(build, dependency_check):
+    build, write_spec = build
+
+    write_spec("Resources", 100)
+    assert "2 added, 0 changed, 0 removed" in build(dependency_check)
+
+    write_spec("Other resources", 200)
+    assert "0 added, 1 changed, 0 removed" in build(dependency_check)
+
+
+_SPEC_WITH_REF = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /resources:
+        $ref: 'paths.yml#/paths/~1resources'
+""")
+
+
+@pytest.mark.parametrize("dependency_check", ["mtime", "content"])
+def test_referenced_file_changed(tmpdir, build, dependency_check):
+    build, write_spec = build
+    tmpdir.join("src", "spec.yml").write_text(_SPEC_WITH_REF, encoding="utf-8")
+
+    write_spec("Resources", 100, name="paths.yml")
+    assert "2 added, 0 changed, 0 removed" in build(dependency_check)
+
+    write_spec("Resources", 200, name="paths.yml")
+    assert "0 added, %d changed, 0 removed" % (dependency_check == "mtime") in build(
+        dependency_check
+    )
+
+    write_spec("Other resources", 300, name="paths.yml")
+    assert "0 added, 1 changed, 0 removed" in build(dependency_check)
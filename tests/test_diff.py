@@ -0,0 +1,249 @@
+"""Tests structural diff of specs."""
+
+import copy
+import textwrap
+
+import pytest
+import yaml
+
+from sphinxcontrib.openapi import _diff, _hashing, renderers, utils
+from sphinxcontrib.openapi.__main__ import main
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /pets:
+        get:
+          summary: List pets
+          parameters:
+            - name: limit
+              in: query
+              schema:
+                type: integer
+          responses:
+            '200':
+              description: ok
+              content:
+                application/json:
+                  schema:
+                    type: array
+                    items:
+                      $ref: '#/components/schemas/Pet'
+        post:
+          summary: Create a pet
+          responses:
+            '201':
+              description: created
+      /pets/{petId}:
+        get:
+          summary: Show a pet
+          parameters:
+            - name: petId
+              in: path
+              required: true
+              schema:
+                type: string
+          responses:
+            '200':
+              description: ok
+    components:
+      schemas:
+        Pet:
+          type: object
+          properties:
+            name:
+              type: string
+        Error:
+          type: object
+""")
+
+
+@pytest.fixture(scope="function")
+def old():
+    return yaml.safe_load(_SPEC)
+
+
+@pytest.fixture(scope="function")
+def new(old):
+    new = copy.deepcopy(old)
+    new["paths"]["/pets"]["get"]["parameters"].append(
+        {"name": "offset", "in": "query", "schema": {"type": "integer"}}
+    )
+    new["paths"]["/pets"]["get"]["responses"]["404"] = {"description": "nope"}
+    new["paths"]["/pets"]["get"]["summary"] = "List all pets"
+    del new["paths"]["/pets"]["post"]
+    new["paths"]["/owners"] = {
+        "get": {"summary": "List owners", "responses": {"200": {"description": "ok"}}}
+    }
+    new["components"]["schemas"]["Pet"]["properties"]["age"] = {"type": "integer"}
+    new["components"]["schemas"]["Owner"] = {"type": "object"}
+    del new["components"]["schemas"]["Error"]
+    return new
+
+
+def test_diff_specs(old, new):
+    changes = _diff.diff_specs(utils.normalize_spec(old), utils.normalize_spec(new))
+
+    assert changes.operations == _diff.Changes(
+        added=(("/owners", "get"),),
+        removed=(("/pets", "post"),),
+        changed=(("/pets", "get"),),
+    )
+    assert changes.operation_changes == {
+        ("/pets", "get"): _diff.OperationChanges(
+            parameters=_diff.Changes(added=(("offset", "query"),)),
+            # The response refers to a changed schema.
+            responses=_diff.Changes(added=("404",), changed=("200",)),
+            properties=("summary",),
+        )
+    }
+    assert changes.schemas == _diff.Changes(
+        added=("Owner",), removed=("Error",), changed=("Pet",)
+    )
+
+
+def test_diff_specs_unchanged(old):
+    new = copy.deepcopy(old)
+    changes = _diff.diff_specs(utils.normalize_spec(old), utils.normalize_spec(new))
+
+    assert not changes
+    assert changes == _diff.SpecChanges()
+
+
+def test_diff_specs_prunes_unchanged(old, new, monkeypatch):
+    old, new = utils.normalize_spec(old), utils.normalize_spec(new)
+    digests = []
+
+    def digest(self, node, digest=_hashing.Hashes.digest):
+        digests.append(node)
+        return digest(self, node)
+
+    monkeypatch.setattr(_hashing.Hashes, "digest", digest)
+    _diff.diff_specs(old, new)
+
+    # The unchanged operation is compared as a whole, and nothing within it
+    # is looked into.
+    assert any(node is old["paths"]["/pets/{petId}"]["get"] for node in digests)
+    assert not any(
+        node is old["paths"]["/pets/{petId}"]["get"]["responses"] for node in digests
+    )
+
+
+def test_diff_specs_oas2():
+    old = {
+        "swagger": "2.0",
+        "info": {"title": "An example spec", "version": "1.0"},
+        "paths": {"/pets": {"get": {"responses": {"200": {"description": "ok"}}}}},
+        "definitions": {"Pet": {"type": "object"}},
+    }
+    new = copy.deepcopy(old)
+    new["definitions"]["Pet"]["properties"] = {"name": {"type": "string"}}
+
+    changes = _diff.diff_specs(utils.normalize_spec(old), utils.normalize_spec(new))
+
+    assert changes.operations == _diff.Changes()
+    assert changes.schemas == _diff.Changes(changed=("Pet",))
+
+
+def test_render_changelog(old, new):
+    renderer = renderers.HttpdomainRenderer(None, {})
+    markup = "\n".join(
+        _diff.render_changelog(
+            renderer, utils.normalize_spec(old), utils.normalize_spec(new)
+        )
+    )
+
+    assert markup == textwrap.dedent("""\
+        .. rubric:: Added operations
+
+        .. http:get:: /owners
+           :noindex:
+
+           **List owners**
+
+           :statuscode 200:
+              ok
+
+        .. rubric:: Removed operations
+
+        * ``POST /pets`` -- Create a pet
+
+        .. rubric:: Changed operations
+
+        ``GET /pets``:
+
+        * Added parameters: ``offset`` (query)
+        * Added responses: ``404``
+        * Changed responses: ``200``
+        * Changed properties: ``summary``
+
+        .. http:get:: /pets
+           :noindex:
+
+           **List all pets**
+
+           :queryparam limit:
+           :queryparamtype limit: integer
+           :queryparam offset:
+           :queryparamtype offset: integer
+           :resjsonarr name:
+           :resjsonarrtype name: string
+           :resjsonarr age:
+           :resjsonarrtype age: integer
+
+           :statuscode 200:
+              ok
+
+           :statuscode 404:
+              nope
+
+        .. rubric:: Schemas
+
+        * Added: ``Owner``
+        * Removed: ``Error``
+        * Changed: ``Pet``
+        """)
+
+
+def test_render_changelog_indented(old, new):
+    renderer = renderers.HttpdomainRenderer(None, {})
+    old, new = utils.normalize_spec(old), utils.normalize_spec(new)
+
+    writer = utils.MarkupWriter()
+    with writer.indented():
+        _diff._write_changelog(writer, renderer, old, new)
+
+    # Rendered operations are indented just like the rest of a changelog.
+    assert writer.lines == [
+        "   " + line if line else line
+        for line in _diff.render_changelog(renderer, old, new)
+    ]
+
+
+def test_render_changelog_unchanged(old):
+    renderer = renderers.HttpdomainRenderer(None, {})
+    spec = utils.normalize_spec(old)
+
+    assert _diff.render_changelog(renderer, spec, spec) == ["No changes.", ""]
+
+
+def test_changelog_command(tmpdir, old, new):
+    tmpdir.join("old.yml").write_text(yaml.safe_dump(old), encoding="utf-8")
+    tmpdir.join("new.yml").write_text(yaml.safe_dump(new), encoding="utf-8")
+
+    main(
+        [
+            "changelog",
+            "-o",
+            tmpdir.join("changelog.rst").strpath,
+            tmpdir.join("old.yml").strpath,
+            tmpdir.join("new.yml").strpath,
+        ]
+    )
+
+    changelog = tmpdir.join("changelog.rst").read_text("utf-8")
+    assert "* ``POST /pets`` -- Create a pet" in changelog
+    assert ".. http:get:: /owners" in changelog
@@ -0,0 +1,285 @@
+"""Tests concurrent fetching of remote documents."""
+
+import asyncio
+import http.server
+import textwrap
+import threading
+import time
+
+import pytest
+
+from sphinxcontrib.openapi import _fetch, renderers, utils
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+
+        try:
+            # Requests take a while, so concurrent ones overlap.
+            time.sleep(server.delay)
+
+            status, body = 404, "not found"
+            failures = server.failures.get(self.path, 0)
+            if failures:
+                server.failures[self.path] = failures - 1
+                status, body = 500, "oops"
+            elif self.path in server.documents:
+                status, body = 200, server.documents[self.path]
+
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(body.encode("utf-8"))
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="function")
+def server():
+    """A local HTTP server that serves documents it's given."""
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.documents = {}
+    server.failures = {}
+    server.requests = []
+    server.active = server.max_active = 0
+    server.delay = 0.05
+    server.url = "http://127.0.0.1:%d" % server.server_address[1]
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture(autouse=True)
+def settings():
+    """Reset fetcher settings."""
+
+    _fetch.configure(backoff=0)
+    yield
+    _fetch.configure()
+
+
+def test_fetch_all(server):
+    """URLs are fetched concurrently, with a limit of connections per host."""
+
+    urls = []
+    for i in range(12):
+        server.documents[f"/{i}"] = f"document {i}"
+        urls.append(f"{server.url}/{i}")
+
+    results = _fetch.fetch_all(urls, connections_per_host=3)
+
+    assert results == {url: f"document {i}" for i, url in enumerate(urls)}
+    assert server.max_active == 3
+
+
+def test_fetch_all_duplicates(server):
+    """Each URL is fetched once."""
+
+    server.documents["/a"] = "a"
+
+    results = _fetch.fetch_all([f"{server.url}/a", f"{server.url}/a"])
+
+    assert results == {f"{server.url}/a": "a"}
+    assert server.requests == ["/a"]
+
+
+def test_fetch_all_errors(server):
+    """Failed URLs are mapped to errors, without affecting other URLs."""
+
+    server.documents["/a"] = "a"
+
+    results = _fetch.fetch_all([f"{server.url}/a", f"{server.url}/missing"])
+
+    assert results[f"{server.url}/a"] == "a"
+    assert isinstance(results[f"{server.url}/missing"], Exception)
+
+
+def test_fetch_all_empty():
+    """Nothing is fetched."""
+
+    assert _fetch.fetch_all([]) == {}
+
+
+def test_fetch_retries(server):
+    """Server errors are retried."""
+
+    server.documents["/a"] = "a"
+    server.failures["/a"] = 2
+
+    assert _fetch.fetch(f"{server.url}/a", retries=2) == "a"
+    assert server.requests == ["/a"] * 3
+
+
+def test_fetch_retries_exhausted(server):
+    """The last error is raised once retries are exhausted."""
+
+    server.documents["/a"] = "a"
+    server.failures["/a"] = 2
+
+    with pytest.raises(Exception):
+        _fetch.fetch(f"{server.url}/a", retries=1)
+    assert server.requests == ["/a"] * 2
+
+
+def test_fetch_client_errors_not_retried(server):
+    """Client errors are not going to go away, so they are not retried."""
+
+    with pytest.raises(Exception):
+        _fetch.fetch(f"{server.url}/missing", retries=2)
+    assert server.requests == ["/missing"]
+
+
+def test_fetch_urllib(server, monkeypatch):
+    """Documents are fetched by the standard library if requests is missing."""
+
+    monkeypatch.setattr(_fetch, "requests", None)
+    server.documents["/a"] = "a"
+    server.failures["/b"] = 1
+
+    results = _fetch.fetch_all([f"{server.url}/a", f"{server.url}/b"], retries=0)
+
+    assert results[f"{server.url}/a"] == "a"
+    assert isinstance(results[f"{server.url}/b"], Exception)
+
+
+def test_fetch_custom_client():
+    """Any callable may fetch documents."""
+
+    assert _fetch.fetch("https://example.com/a", get=lambda url: url.upper()) == (
+        "HTTPS://EXAMPLE.COM/A"
+    )
+
+
+def test_fetch_in_event_loop(server):
+    """Documents are fetched even if an event loop is running already."""
+
+    server.documents["/a"] = "a"
+
+    async def main():
+        return _fetch.fetch(f"{server.url}/a")
+
+    assert asyncio.run(main()) == "a"
+
+
+def test_normalize_spec_remote_refs(server):
+    """Remote documents are fetched beforehand, along with their references."""
+
+    server.documents["/pet.yml"] = textwrap.dedent("""
+        type: object
+        properties:
+          owner:
+            $ref: 'person.yml'
+        """)
+    server.documents["/person.yml"] = "type: string\n"
+    server.documents["/error.yml"] = "type: integer\n"
+
+    spec = utils.normalize_spec(
+        {
+            "openapi": "3.0.3",
+            "info": {"title": "Pets", "version": "1.0"},
+            "paths": {
+                "/pets": {
+                    "get": {
+                        "responses": {
+                            "200": {"$ref": "#/components/responses/Pet"},
+                            "400": {
+                                "description": "error",
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"$ref": "error.yml"}
+                                    }
+                                },
+                            },
+                        }
+                    }
+                }
+            },
+            "components": {
+                "responses": {
+                    "Pet": {
+                        "description": "a pet",
+                        "content": {
+                            "application/json": {"schema": {"$ref": "pet.yml"}}
+                        },
+                    }
+                }
+            },
+        },
+        uri=f"{server.url}/openapi.yml",
+    )
+
+    responses = spec["paths"]["/pets"]["get"]["responses"]
+    assert responses["200"]["content"]["application/json"]["schema"] == {
+        "type": "object",
+        "properties": {"owner": {"type": "string"}},
+    }
+    assert responses["400"]["content"]["application/json"]["schema"] == {
+        "type": "integer"
+    }
+    assert sorted(server.requests) == ["/error.yml", "/person.yml", "/pet.yml"]
+    # The first two documents are fetched concurrently, and the last one is
+    # fetched once the document that refers to it is.
+    assert server.requests[-1] == "/person.yml"
+
+
+def test_render_external_examples(server, caplog):
+    """External examples are fetched beforehand, concurrently."""
+
+    server.delay = 0.2
+    server.documents["/a.json"] = '{"a": 1}'
+    server.documents["/b.json"] = '{"b": 2}'
+
+    spec = {
+        "openapi": "3.0.3",
+        "info": {"title": "Pets", "version": "1.0"},
+        "paths": {
+            f"/{name}": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "ok",
+                            "content": {
+                                "application/json": {
+                                    "examples": {
+                                        "example": {
+                                            "externalValue": (
+                                                f"{server.url}/{name}.json"
+                                            )
+                                        }
+                                    }
+                                }
+                            },
+                        }
+                    }
+                }
+            }
+            for name in ("a", "b", "missing")
+        },
+    }
+
+    renderer = renderers.HttpdomainRenderer(None, {})
+    text = "\n".join(renderer.render_restructuredtext_markup(spec))
+
+    assert '"a": 1' in text
+    assert '"b": 2' in text
+    assert server.max_active == 3
+    # A failed example is reported the same way it's reported on its own,
+    # and it's not fetched once again.
+    assert f"Cannot retrieve example from: '{server.url}/missing.json'" in caplog.text
+    assert sorted(server.requests) == ["/a.json", "/b.json", "/missing.json"]
@@ -0,0 +1,106 @@
+"""Tests content hashing of spec subtrees."""
+
+import os
+
+import pytest
+import yaml
+
+from sphinxcontrib.openapi import _hashing, utils
+
+_TESTSPECS = os.path.join(os.path.dirname(__file__), "testspecs")
+
+
+def test_digest_stable():
+    node = {"type": "object", "properties": {"id": {"type": "integer"}}}
+
+    assert _hashing.Hashes().digest(node) == _hashing.Hashes().digest(
+        {"type": "object", "properties": {"id": {"type": "integer"}}}
+    )
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        pytest.param({"b": 2, "a": 1}, id="keys-order"),
+        pytest.param({"a": 1, "b": "2"}, id="str"),
+        pytest.param({"a": 1, "b": 2.0}, id="float"),
+        pytest.param({"a": True, "b": 2}, id="bool"),
+        pytest.param({"a": 1, "b": [2]}, id="list"),
+        pytest.param({"a": 1}, id="missing"),
+        pytest.param([1, 2], id="mapping"),
+    ],
+)
+def test_digest_different(other):
+    assert _hashing.Hashes().digest({"a": 1, "b": 2}) != _hashing.Hashes().digest(other)
+
+
+def test_digest_scalar():
+    assert _hashing.Hashes().digest("1") != _hashing.Hashes().digest(1)
+
+
+def test_digest_shared_nodes_hashed_once():
+    shared = {"type": "string"}
+    spec = {"a": shared, "b": [shared, shared]}
+
+    hashes = _hashing.hash_spec(spec)
+
+    assert shared in hashes
+    assert len(hashes) == 3
+    assert hashes.digest(shared) == _hashing.Hashes().digest({"type": "string"})
+    assert hashes.digest(spec) == _hashing.Hashes().digest(
+        {"a": {"type": "string"}, "b": [{"type": "string"}, {"type": "string"}]}
+    )
+
+
+def test_digest_cycle():
+    node = {"type": "object", "properties": {}}
+    node["properties"]["children"] = {"type": "array", "items": node}
+
+    other = {"type": "object", "properties": {}}
+    other["properties"]["children"] = {"type": "array", "items": other}
+
+    hashes = _hashing.hash_spec({"schema": node})
+
+    assert hashes.digest(node) == _hashing.Hashes().digest(other)
+
+    # Nodes within the cycle are hashed relative to the node it's entered at,
+    # so they aren't memoized.
+    assert node in hashes
+    assert node["properties"] not in hashes
+    assert node["properties"]["children"] not in hashes
+
+
+def test_digest_cycle_differs():
+    node = {"type": "object", "properties": {}}
+    node["properties"]["child"] = node
+
+    other = {"type": "object", "properties": {}}
+    other["properties"]["child"] = other["properties"]
+
+    assert _hashing.Hashes().digest(node) != _hashing.Hashes().digest(other)
+
+
+def test_hash_spec_recursion():
+    path = os.path.join(_TESTSPECS, "v3.0", "api-with-recursion.yaml")
+    with open(path, encoding="utf-8") as stream:
+        spec = yaml.safe_load(stream)
+    utils.normalize_spec(spec)
+
+    hashes = _hashing.hash_spec(spec)
+
+    assert hashes.digest(spec) == utils.get_digest(spec)
+    assert hashes.digest(spec["paths"]["/"]) != hashes.digest(spec["paths"]["/v2"])
+
+
+def test_index_operations():
+    shared = {"responses": {"200": {"description": "ok"}}}
+    paths = {
+        "/a": {"get": shared, "post": {"responses": {}}, "summary": "A"},
+        "/b": {"get": shared},
+    }
+
+    index = utils.index_operations(paths)
+
+    assert list(index) == [("/a", "get"), ("/a", "post"), ("/b", "get")]
+    assert index["/a", "get"] == index["/b", "get"]
+    assert index["/a", "get"] != index["/a", "post"]
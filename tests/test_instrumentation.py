@@ -0,0 +1,95 @@
+"""Tests instrumentation of the rendering pipeline."""
+
+import os
+import tracemalloc
+from unittest import mock
+
+import py
+import pytest
+
+from sphinxcontrib.openapi import _instrumentation
+
+_MiB = 1024 * 1024
+
+
+@pytest.fixture(scope="function")
+def tracing():
+    def start(top_sites=0):
+        _instrumentation.start_tracing(top_sites)
+
+    yield start
+    _instrumentation.stop_tracing()
+
+
+def test_phase_not_traced():
+    with _instrumentation.phase("load", spec="spec.yml"):
+        pass
+
+    assert _instrumentation.pop_memory() == []
+
+
+def test_phase_nested(tracing):
+    tracing()
+
+    with _instrumentation.phase("render", spec="spec.yml"):
+        retained = bytearray(_MiB)
+        with _instrumentation.phase("load"):
+            freed = bytearray(4 * _MiB)
+            del freed
+        with _instrumentation.phase("parse"):
+            pass
+
+    outer, load, parse = _instrumentation.pop_memory()
+    assert _instrumentation.pop_memory() == []
+
+    assert (outer.spec, outer.name, outer.depth) == ("spec.yml", "render", 0)
+    assert (load.spec, load.name, load.depth) == ("spec.yml", "load", 1)
+    assert (parse.spec, parse.name, parse.depth) == ("spec.yml", "parse", 1)
+
+    # Nested phases reset the peak, and yet it's accounted to the outer phase.
+    assert load.peak >= 4 * _MiB
+    assert load.retained < _MiB
+    assert outer.peak >= 5 * _MiB
+    assert outer.retained >= _MiB
+    assert parse.peak < _MiB
+    del retained
+
+
+def test_phase_top_sites(tracing):
+    tracing(top_sites=1)
+
+    with _instrumentation.phase("load", spec="spec.yml"):
+        retained = bytearray(_MiB)
+
+    (memory,) = _instrumentation.pop_memory()
+    ((site, size),) = memory.sites
+    assert site.startswith(__file__)
+    assert size >= _MiB
+    del retained
+
+
+def test_trace_memory(tmpdir, run_sphinx):
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)), "examples", "v3.0", "petstore.yaml"
+    )
+    py.path.local(spec).copy(tmpdir.join("src", "test-spec.yml"))
+
+    with mock.patch.object(_instrumentation.logger, "info") as info:
+        run_sphinx("test-spec.yml", conf={"openapi_trace_memory": 2})
+
+    phases = [
+        call.args[1:4] for call in info.call_args_list if "memory of" in call.args[0]
+    ]
+    assert phases == [
+        ("test-spec.yml", "", "directive"),
+        ("test-spec.yml", "  ", "load"),
+        ("test-spec.yml", "  ", "markup"),
+        ("test-spec.yml", "    ", "normalize"),
+        ("test-spec.yml", "  ", "parse"),
+    ]
+
+    # Two allocation sites are reported per phase.
+    assert len(info.call_args_list) == 3 * len(phases)
+
+    # Memory is traced by the build only.
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,80 @@
+"""Serialization of JSON examples."""
+
+import json
+
+import pytest
+
+from sphinxcontrib.openapi import _json
+
+_EXAMPLE = {
+    "id": 1,
+    "name": "Tom",
+    "tags": ["cat", {"color": "grey", "weight": 4.5}],
+    "owner": None,
+    "empty": {},
+}
+
+
+@pytest.fixture(scope="function", params=["json", "orjson"])
+def backend(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+
+    _json.set_backend(request.param)
+    yield request.param
+    _json.set_backend("json")
+
+
+@pytest.mark.parametrize("indent", [2, 4])
+def test_dumps(backend, indent):
+    assert _json.dumps(_EXAMPLE, indent) == json.dumps(_EXAMPLE, indent=indent)
+
+
+@pytest.mark.parametrize("indent", [2, 4])
+def test_getlines(backend, indent):
+    lines = _json.getlines(_EXAMPLE, indent, prefix="   ")
+
+    assert lines == [
+        "   " + line for line in json.dumps(_EXAMPLE, indent=indent).splitlines()
+    ]
+
+
+def test_getlines_cached(backend):
+    lines = _json.getlines(_EXAMPLE, 2, prefix="   ")
+
+    assert _json.getlines(_EXAMPLE, 2, prefix="   ") is lines
+    assert _json.getlines(_EXAMPLE, 2, prefix="") is not lines
+    assert _json.getlines(_EXAMPLE, 4, prefix="   ") is not lines
+    assert _json.getlines(dict(_EXAMPLE), 2, prefix="   ") == lines
+
+
+def test_getlines_not_cached(backend):
+    example = dict(_EXAMPLE)
+    lines = _json.getlines(example, 2, prefix="   ", cache=False)
+
+    assert lines == _json.getlines(_EXAMPLE, 2, prefix="   ")
+    assert all(value is not example for value, _ in _json._cache.values())
+
+
+def test_orjson_fallback():
+    pytest.importorskip("orjson")
+
+    _json.set_backend("orjson")
+    try:
+        # orjson doesn't support integers that don't fit into 64 bits.
+        assert _json.dumps({"big": 2**64}, 2) == json.dumps({"big": 2**64}, indent=2)
+    finally:
+        _json.set_backend("json")
+
+
+def test_set_backend_callable():
+    _json.set_backend(lambda value, indent: "null")
+    try:
+        assert _json.getlines({}, 2, prefix="  ") == ["  null"]
+    finally:
+        _json.set_backend("json")
+
+
+def test_set_backend_invalid():
+    with pytest.raises(ValueError, match="invalid JSON serializer: 'yaml'"):
+        _json.set_backend("yaml")
@@ -19,6 +19,8 @@ import pytest
 from sphinxcontrib.openapi import renderers
 from sphinxcontrib.openapi import openapi20
 from sphinxcontrib.openapi import utils
+from sphinxcontrib.openapi import _instrumentation
+from sphinxcontrib.openapi import _json
 
 
 class TestOpenApi2HttpDomain(object):
@@ -1693,6 +1695,35 @@ class TestOpenApi3HttpDomain(object):
                   ok
         ''').lstrip()
 
+    @pytest.mark.parametrize('version', ['3.0.3', '3.1.0'])
+    def test_method_option_openapi3(self, version):
+        spec = {
+            'openapi': version,
+            'info': {'title': 'An example spec', 'version': '1.0'},
+            'paths': {
+                '/resource_a': {
+                    'get': {
+                        'description': 'resource a',
+                        'responses': {
+                            '200': {'description': 'ok'},
+                        }
+                    },
+                    'post': {
+                        'description': 'resource a',
+                        'responses': {
+                            '201': {'description': 'ok'},
+                        }
+                    },
+                },
+            },
+        }
+
+        renderer = renderers.HttpdomainOldRenderer(None, {'methods': ['post']})
+        text = '\n'.join(renderer.render_restructuredtext_markup(spec))
+
+        assert '.. http:post:: /resource_a' in text
+        assert '.. http:get::' not in text
+
 
 class TestResolveRefs(object):
 
@@ -1756,6 +1787,66 @@ class TestResolveRefs(object):
             },
         }
 
+    def test_ref_resolving_shared(self):
+        spec = utils._resolve_refs('', {
+            'foo': {'a': 13},
+            'bar': {'$ref': '#/foo'},
+            'baz': {'$ref': '#/foo'},
+        })
+
+        assert spec['bar'] is spec['foo']
+        assert spec['baz'] is spec['foo']
+
+    def test_relative_ref_resolving_local_files(self):
+        baseuri = 'file://%s' % os.path.abspath(__file__)
+        testdata = os.path.join(os.path.dirname(__file__), 'testdata')
+
+        spec = utils.normalize_spec({
+            'bar': {
+                '$ref': 'testdata/foo.json#/foo/b',
+            },
+            'baz': {
+                '$ref': 'testdata/foo.yaml#/foo',
+            }
+        }, uri=baseuri)
+
+        assert utils.get_local_files(spec) == [
+            os.path.join(testdata, 'foo.json'),
+            os.path.join(testdata, 'foo.yaml'),
+        ]
+
+    def test_relative_ref_resolving_other_extensions(self, tmpdir):
+        tmpdir.join('pet.schema').write_text(
+            'type: object\nproperties: {name: {type: string}}\n', 'utf-8')
+        tmpdir.join('tag.txt').write_text('{"type": "string"}', 'utf-8')
+        baseuri = 'file://%s' % tmpdir.join('openapi.yaml')
+
+        assert utils._resolve_refs(baseuri, {
+            'pet': {'$ref': 'pet.schema'},
+            'tag': {'$ref': 'tag.txt'},
+        }) == {
+            'pet': {'type': 'object', 'properties': {'name': {'type': 'string'}}},
+            'tag': {'type': 'string'},
+        }
+
+    def test_relative_ref_resolving_parsed_once(self):
+        baseuri = 'file://%s' % os.path.abspath(__file__)
+        utils._parse_file.cache_clear()
+        _instrumentation.reset()
+
+        for _ in range(3):
+            assert utils._resolve_refs(baseuri, {
+                'bar': {'$ref': 'testdata/foo.json#/foo/b'},
+                'baz': {'$ref': 'testdata/foo.yaml#/foo'},
+                'qux': {'$ref': 'testdata/foo.yaml#/foo/a'},
+            }) == {
+                'bar': {'c': True},
+                'baz': {'a': 17, 'b': 13},
+                'qux': 17,
+            }
+
+        assert _instrumentation.counters['parse_file'] == 2
+
     @mock.patch('requests.get')
     def test_relative_ref_resolving_remote(self, mock_get):
         baseuri = os.path.abspath(__file__)
@@ -1853,6 +1944,82 @@ class TestResolveRefs(object):
         ''').lstrip()
 
 
+class TestNormalizeSpec(object):
+
+    @pytest.fixture(autouse=True)
+    def counters(self):
+        _instrumentation.reset()
+        yield _instrumentation.counters
+        _instrumentation.reset()
+
+    def test_normalize_once(self, counters):
+        spec = {
+            'paths': {
+                '/resources/{kind}': {
+                    'summary': 'Resources of a given kind.',
+                    'parameters': [
+                        {'name': 'kind', 'in': 'path', 'type': 'string'},
+                    ],
+                    'get': {
+                        'parameters': [
+                            {'$ref': '#/parameters/limit'},
+                        ],
+                        'responses': {'200': {'description': 'ok'}},
+                    },
+                },
+            },
+            'parameters': {
+                'limit': {'name': 'limit', 'in': 'query', 'type': 'integer'},
+            },
+        }
+
+        assert not utils.is_normalized(spec)
+
+        utils.normalize_spec(spec)
+        utils.normalize_spec(spec)
+
+        assert utils.is_normalized(spec)
+        assert counters['normalize_spec'] == 1
+        # The extension's own data is kept next to the spec, not inside it.
+        assert list(spec) == ['paths', 'parameters']
+        assert spec['paths']['/resources/{kind}'] == {
+            'summary': 'Resources of a given kind.',
+            'get': {
+                'parameters': [
+                    {'name': 'limit', 'in': 'query', 'type': 'integer'},
+                    {'name': 'kind', 'in': 'path', 'type': 'string'},
+                ],
+                'responses': {'200': {'description': 'ok'}},
+            },
+        }
+
+    @pytest.mark.parametrize('renderer_cls', [
+        renderers.HttpdomainOldRenderer,
+        renderers.HttpdomainRenderer,
+    ])
+    @pytest.mark.parametrize('version', [
+        {'swagger': '2.0'},
+        {'openapi': '3.0.3'},
+        {'openapi': '3.1.0'},
+    ])
+    def test_render_normalize_once(self, counters, renderer_cls, version):
+        spec = dict(version, info={'title': 'An example spec', 'version': '1.0'})
+        spec['paths'] = {
+            '/resources': {
+                'get': {
+                    'responses': {'200': {'description': 'ok'}},
+                },
+            },
+        }
+
+        for _ in range(2):
+            renderer = renderer_cls(None, {})
+            text = '\n'.join(renderer.render_restructuredtext_markup(spec))
+            assert text.startswith('.. http:get:: /resources')
+
+        assert counters['normalize_spec'] == 1
+
+
 def test_openapi2_examples(tmpdir, run_sphinx):
     spec = os.path.join(
         os.path.abspath(os.path.dirname(__file__)),
@@ -1885,6 +2052,222 @@ def test_openapi3_examples(tmpdir, run_sphinx, render_examples):
         == render_examples
 
 
+@pytest.mark.parametrize('options, conf', [
+    ({'workers': 2}, {}),
+    ({}, {'openapi_render_workers': 2}),
+    ({}, {'openapi_render_workers': 2, 'openapi_render_executor': 'process'}),
+])
+def test_openapi3_render_workers(tmpdir, run_sphinx, options, conf):
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)),
+        'examples',
+        'v3.0',
+        'petstore.yaml')
+    py.path.local(spec).copy(tmpdir.join('src', 'test-spec.yml'))
+    run_sphinx(
+        'test-spec.yml',
+        options=options,
+        conf=conf,
+        directive='openapi:httpdomain')
+
+    rendered_html = tmpdir.join('out', 'index.html').read_text('utf-8')
+
+    assert rendered_html.index('/pets/') > rendered_html.index('/pets')
+
+
+@pytest.mark.parametrize('options, conf', [
+    ({'max-properties': 1}, {}),
+    ({}, {'openapi_max_properties': 1}),
+])
+@pytest.mark.parametrize('directive', ['openapi', 'openapi:httpdomain'])
+def test_openapi3_budget(tmpdir, run_sphinx, options, conf, directive):
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)),
+        'examples',
+        'v3.0',
+        'petstore.yaml')
+    py.path.local(spec).copy(tmpdir.join('src', 'test-spec.yml'))
+
+    if directive == 'openapi':
+        options = dict(options, examples=True)
+    else:
+        options = dict(options, **{'generate-examples-from-schemas': True})
+    run_sphinx('test-spec.yml', options=options, conf=conf, directive=directive)
+
+    rendered_html = tmpdir.join('out', 'index.html').read_text('utf-8')
+
+    # Pets have 'id', 'name' and 'tag' properties, and only the first one
+    # fits in the budget.
+    assert '&quot;id&quot;' in rendered_html
+    assert '&quot;name&quot;' not in rendered_html
+    assert '&quot;...&quot;' in rendered_html
+
+
+@pytest.mark.parametrize('directive', ['openapi', 'openapi:httpdomain'])
+def test_openapi3_json_serializer(tmpdir, run_sphinx, directive):
+    pytest.importorskip('orjson')
+
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)),
+        'examples',
+        'v3.0',
+        'petstore.yaml')
+    py.path.local(spec).copy(tmpdir.join('src', 'test-spec.yml'))
+
+    if directive == 'openapi':
+        options = {'examples': True}
+    else:
+        options = {'generate-examples-from-schemas': True}
+
+    rendered_html = {}
+    try:
+        for serializer in ('json', 'orjson'):
+            run_sphinx(
+                'test-spec.yml',
+                options=options,
+                conf={'openapi_json_serializer': serializer},
+                directive=directive)
+            rendered_html[serializer] = tmpdir.join(
+                'out', 'index.html').read_text('utf-8')
+            tmpdir.join('out').remove()
+    finally:
+        _json.set_backend('json')
+
+    assert rendered_html['json'] == rendered_html['orjson']
+
+
+@pytest.mark.parametrize('conf', [
+    {'openapi_max_example_lines': 2},
+    {'openapi_max_example_bytes': 12},
+])
+def test_openapi3_external_examples(tmpdir, run_sphinx, conf):
+    tmpdir.join('src', 'examples').ensure(dir=True)
+    tmpdir.join('src', 'examples', 'pets.json').write_text(
+        '[\n  "cat",\n  "dog"\n]\n', 'utf-8')
+    tmpdir.join('src', 'test-spec.yml').write_text(textwrap.dedent('''
+        openapi: 3.0.3
+        info:
+          title: Pets
+          version: "1.0"
+        paths:
+          /pets:
+            get:
+              responses:
+                '200':
+                  description: ok
+                  content:
+                    application/json:
+                      examples:
+                        pets:
+                          externalValue: examples/pets.json
+    '''), 'utf-8')
+    run_sphinx('test-spec.yml', conf=conf, directive='openapi:httpdomain')
+
+    rendered_html = tmpdir.join('out', 'index.html').read_text('utf-8')
+
+    assert '&quot;cat&quot;' in rendered_html
+    assert '&quot;dog&quot;' not in rendered_html
+
+
+class TestReadText(object):
+
+    @pytest.mark.parametrize('text, max_bytes, max_lines, expected', [
+        ('a\nb\nc\n', None, None, ('a\nb\nc\n', False)),
+        ('a\nb\nc\n', None, 2, ('a\nb', True)),
+        ('a\nb\nc', None, 2, ('a\nb', True)),
+        ('a\nb\n', None, 2, ('a\nb\n', False)),
+        ('a\nb', None, 2, ('a\nb', False)),
+        ('a\nb\n', None, 0, ('', True)),
+        ('', None, 0, ('', False)),
+        ('a\nb\nc\n', 3, None, ('a\nb', True)),
+        ('a\nb\nc\n', 6, None, ('a\nb\nc\n', False)),
+        ('a\nb\nc\n', 3, 1, ('a', True)),
+        # A multibyte character that doesn't fit is left out as a whole.
+        ('aé', 2, None, ('a', True)),
+    ])
+    def test_limits(self, tmpdir, text, max_bytes, max_lines, expected):
+        path = tmpdir.join('example.txt')
+        path.write_binary(text.encode('utf-8'))
+
+        assert utils.read_text(path.strpath, max_bytes, max_lines) == expected
+        assert utils.truncate_text(text, max_bytes, max_lines) == expected
+
+    def test_large_file(self, tmpdir, monkeypatch):
+        monkeypatch.setattr(utils, '_CHUNK_SIZE', 16)
+        path = tmpdir.join('example.txt')
+        path.write_text('line\n' * 1000, 'utf-8')
+
+        reads = []
+        real_open = open
+
+        def spy_open(*args, **kwargs):
+            stream = real_open(*args, **kwargs)
+            read = stream.read
+            stream = mock.Mock(wraps=stream)
+            stream.__enter__ = mock.Mock(return_value=stream)
+            stream.__exit__ = mock.Mock(return_value=False)
+            stream.read = lambda size: reads.append(size) or read(size)
+            return stream
+
+        monkeypatch.setattr('builtins.open', spy_open)
+        assert utils.read_text(path.strpath, max_lines=3) == (
+            'line\nline\nline', True)
+
+        # The file is read only as far as the limit goes, which is within the
+        # first chunk.
+        assert reads == [16]
+
+    def test_cached(self, tmpdir):
+        path = tmpdir.join('example.txt')
+        path.write_text('a\n', 'utf-8')
+        utils._read_text.cache_clear()
+        _instrumentation.reset()
+
+        for _ in range(3):
+            assert utils.read_text(path.strpath) == ('a\n', False)
+        assert _instrumentation.counters['read_text'] == 1
+
+        path.write_text('a\nb\n', 'utf-8')
+        assert utils.read_text(path.strpath) == ('a\nb\n', False)
+        assert _instrumentation.counters['read_text'] == 2
+
+
+class TestMarkupWriter(object):
+
+    def test_write(self):
+        writer = utils.MarkupWriter()
+        writer.write('.. http:get:: /')
+        with writer.indented():
+            writer.write(':statuscode 200:')
+            writer.push(2)
+            writer.writelines(['OK.', '', 'Really.'])
+            writer.pop()
+            writer.write()
+        writer.write('the end')
+
+        assert writer.lines == [
+            '.. http:get:: /',
+            '   :statuscode 200:',
+            '     OK.',
+            '',
+            '     Really.',
+            '',
+            'the end',
+        ]
+        assert writer.getvalue() == '\n'.join(writer.lines)
+
+    def test_indented_restored_on_error(self):
+        writer = utils.MarkupWriter(indent=2)
+
+        with pytest.raises(RuntimeError):
+            with writer.indented():
+                writer.write('a')
+                raise RuntimeError()
+        writer.write('b')
+
+        assert writer.lines == ['  a', 'b']
+
+
 class TestConvertJsonSchema(object):
     schema = {
         'type': 'object',
@@ -1982,3 +2365,52 @@ class TestConvertJsonSchema(object):
             :<json string name: The name of user (required)'''.strip('\n'))
 
         assert result == expected
+
+
+@pytest.mark.parametrize('directive, options', [
+    ('openapi', {'paths': '/pets/{petId}'}),
+    ('openapi', {'include': '/pets/.*'}),
+    ('openapi', {'exclude': '/pets/.*'}),
+    ('openapi:httpdomain', {'paths': '/pets/{petId}'}),
+])
+def test_openapi3_partial_loading(tmpdir, run_sphinx, directive, options):
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)),
+        'examples',
+        'v3.0',
+        'petstore.yaml')
+    py.path.local(spec).copy(tmpdir.join('src', 'test-spec.yml'))
+
+    rendered = []
+    for partial_loading in (False, True):
+        run_sphinx(
+            'test-spec.yml',
+            options=options,
+            conf={'openapi_partial_loading': partial_loading},
+            directive=directive)
+        rendered.append(tmpdir.join('out', 'index.html').read_text('utf-8'))
+
+    assert rendered[0] == rendered[1]
+
+
+def test_openapi_changelog(tmpdir, run_sphinx):
+    spec = os.path.join(
+        os.path.abspath(os.path.dirname(__file__)),
+        'examples',
+        'v3.0',
+        'petstore.yaml')
+    py.path.local(spec).copy(tmpdir.join('src', 'old.yml'))
+    py.path.local(spec).copy(tmpdir.join('src', 'new.yml'))
+
+    new = tmpdir.join('src', 'new.yml')
+    new.write_text(
+        new.read_text('utf-8').replace('summary: Create a pet', 'summary: Add a pet'),
+        encoding='utf-8')
+
+    run_sphinx('old.yml new.yml', directive='openapi-changelog')
+
+    rendered_html = tmpdir.join('out', 'index.html').read_text('utf-8')
+
+    assert 'Changed operations' in rendered_html
+    assert 'Add a pet' in rendered_html
+    assert 'List all pets' not in rendered_html
@@ -0,0 +1,285 @@
+"""Partial loading of specs."""
+
+import io
+import os
+import textwrap
+
+import pytest
+import yaml
+
+from sphinxcontrib.openapi import _partial
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /users:
+        get:
+          responses:
+            "200":
+              description: Users.
+              content:
+                application/json:
+                  schema:
+                    type: array
+                    items:
+                      $ref: "#/components/schemas/User"
+      /users/{id}:
+        parameters:
+          - $ref: "#/components/parameters/Id"
+        get:
+          responses:
+            "200":
+              $ref: "#/components/responses/User"
+      /groups:
+        get:
+          responses:
+            "200":
+              description: Groups.
+              content:
+                application/json:
+                  schema:
+                    $ref: "#/components/schemas/Group"
+    components:
+      schemas:
+        User:
+          type: object
+          properties:
+            address:
+              $ref: "#/components/schemas/Address"
+        Address:
+          type: string
+        Group:
+          type: object
+      parameters:
+        Id:
+          name: id
+          in: path
+          required: true
+          schema:
+            type: string
+      responses:
+        User:
+          description: A user.
+          content:
+            application/json:
+              schema:
+                $ref: "#/components/schemas/User"
+      securitySchemes:
+        token:
+          type: http
+          scheme: bearer
+    """)
+
+
+def _load(text, options, path=None):
+    return _partial.load(io.StringIO(text), _partial.get_path_selector(options), path)
+
+
+def _select(spec, paths, components):
+    spec = dict(spec, paths={path: spec["paths"][path] for path in paths})
+    spec["components"] = {
+        section: {name: entries[name] for name in components.get(section, [])}
+        for section, entries in spec["components"].items()
+    }
+    return spec
+
+
+@pytest.mark.parametrize(
+    ["options", "expected"],
+    [
+        pytest.param({}, None, id="no-selection"),
+        pytest.param({"exclude": []}, ["/a", "/a/b", "/b"], id="empty-exclude"),
+        pytest.param({"paths": ["/a", "/b"]}, ["/a", "/b"], id="paths"),
+        pytest.param({"include": ["/a"]}, ["/a", "/a/b"], id="include"),
+        pytest.param({"exclude": ["/a"]}, ["/b"], id="exclude"),
+        pytest.param(
+            {"paths": ["/b"], "include": ["/a/"]}, ["/a/b", "/b"], id="paths-include"
+        ),
+        pytest.param(
+            {"include": ["/a"], "exclude": ["/a/"]}, ["/a"], id="include-exclude"
+        ),
+    ],
+)
+def test_get_path_selector(options, expected):
+    """Path selection mirrors the one of renderers."""
+
+    is_selected = _partial.get_path_selector(options)
+
+    if expected is None:
+        assert is_selected is None
+    else:
+        assert [path for path in ["/a", "/a/b", "/b"] if is_selected(path)] == expected
+
+
+def test_load_no_selection():
+    """The whole spec is loaded if no selector is passed."""
+
+    assert _partial.load(io.StringIO(_SPEC)) == yaml.safe_load(_SPEC)
+
+
+def test_load_paths():
+    """Only selected paths and components reachable from them are loaded."""
+
+    assert _load(_SPEC, {"paths": ["/users"]}) == _select(
+        yaml.safe_load(_SPEC),
+        ["/users"],
+        {"schemas": ["User", "Address"], "securitySchemes": ["token"]},
+    )
+
+
+def test_load_paths_transitive():
+    """Components referenced from other components are loaded."""
+
+    assert _load(_SPEC, {"paths": ["/users/{id}"]}) == _select(
+        yaml.safe_load(_SPEC),
+        ["/users/{id}"],
+        {
+            "schemas": ["User", "Address"],
+            "parameters": ["Id"],
+            "responses": ["User"],
+            "securitySchemes": ["token"],
+        },
+    )
+
+
+def test_load_paths_oas2():
+    """Reusable sections of OpenAPI 2.0 specs are loaded partially."""
+
+    text = textwrap.dedent("""
+        swagger: "2.0"
+        info:
+          title: An example spec
+          version: "1.0"
+        paths:
+          /users:
+            get:
+              parameters:
+                - $ref: "#/parameters/Limit"
+              responses:
+                "200":
+                  description: Users.
+                  schema:
+                    $ref: "#/definitions/User"
+          /groups:
+            get:
+              responses:
+                "200":
+                  $ref: "#/responses/Groups"
+        definitions:
+          User:
+            type: object
+          Group:
+            type: object
+        parameters:
+          Limit:
+            name: limit
+            in: query
+            type: integer
+        responses:
+          Groups:
+            description: Groups.
+        """)
+
+    spec = yaml.safe_load(text)
+    del spec["paths"]["/groups"]
+    del spec["definitions"]["Group"]
+    spec["responses"] = {}
+
+    assert _load(text, {"exclude": ["/groups"]}) == spec
+
+
+def test_load_paths_missing():
+    """Paths that aren't defined in the spec are not loaded."""
+
+    spec = _load(_SPEC, {"paths": ["/users", "/unknown"]})
+
+    assert list(spec["paths"]) == ["/users"]
+
+
+def test_load_self_reference(tmpdir):
+    """References to the document by its path are followed."""
+
+    text = _SPEC.replace(
+        "#/components/schemas/User", "spec.yml#/components/schemas/User"
+    )
+    path = os.path.join(tmpdir.strpath, "spec.yml")
+
+    spec = _load(text, {"paths": ["/users"]}, path)
+
+    assert set(spec["components"]["schemas"]) == {"User", "Address"}
+
+
+def test_load_external_reference():
+    """References to other documents are left for the resolver."""
+
+    text = _SPEC.replace("#/components/schemas/User", "other.yml#/User")
+
+    spec = _load(text, {"paths": ["/users"]})
+
+    assert spec["components"]["schemas"] == {}
+    assert spec["components"]["securitySchemes"] != {}
+
+
+@pytest.mark.parametrize(
+    ["text"],
+    [
+        pytest.param(
+            _SPEC.replace("Groups.", "&groups Groups.").replace(
+                "scheme: bearer", "scheme: bearer\n      description: *groups"
+            ),
+            id="skipped-anchor",
+        ),
+        pytest.param(
+            _SPEC.replace("#/components/schemas/User", "#/paths/~1groups"),
+            id="skipped-path",
+        ),
+        pytest.param(
+            _SPEC.replace("#/components/schemas/User", "#/components/schemas/Unknown"),
+            id="unknown-component",
+        ),
+    ],
+)
+def test_load_fallback(text):
+    """The whole spec is loaded if partial loading is not reliable."""
+
+    assert _load(text, {"paths": ["/users"]}) == yaml.safe_load(text)
+
+
+def test_load_error():
+    """Errors are the same as the ones of regular loading."""
+
+    with pytest.raises(yaml.YAMLError) as excinfo:
+        _load(_SPEC + "\n  - foo: [bar", {"paths": ["/users"]})
+
+    with pytest.raises(yaml.YAMLError) as expected:
+        yaml.safe_load(io.StringIO(_SPEC + "\n  - foo: [bar"))
+
+    assert str(excinfo.value) == str(expected.value)
+
+
+@pytest.mark.parametrize(
+    ["options"],
+    [
+        pytest.param({}, id="full"),
+        pytest.param({"paths": ["/users", "/users/{id}"]}, id="partial"),
+    ],
+)
+def test_load_compact(options):
+    """Equal strings are shared when loading compactly."""
+
+    spec = _partial.load(
+        io.StringIO(_SPEC), _partial.get_path_selector(options), compact=True
+    )
+
+    assert spec == _load(_SPEC, options)
+
+    users = spec["paths"]["/users"]["get"]["responses"]["200"]
+    user = spec["components"]["responses"]["User"]
+
+    assert list(users)[1] is list(user)[1] == "content"
+    assert spec["components"]["schemas"]["Address"]["type"] is (
+        spec["components"]["parameters"]["Id"]["schema"]["type"]
+    )
@@ -1,5 +1,8 @@
+import datetime
+
 import pytest
 
+from sphinxcontrib.openapi import openapi30, openapi31, schema_utils
 from sphinxcontrib.openapi.schema_utils import example_from_schema
 
 
@@ -251,3 +254,249 @@ from sphinxcontrib.openapi.schema_utils import example_from_schema
 )
 def test_generate_example_from_schema(schema, expected):
     assert example_from_schema(schema) == expected
+
+
+@pytest.fixture(scope="function")
+def example_datetime():
+    yield schema_utils.set_example_datetime
+    schema_utils.set_example_datetime(None)
+
+
+@pytest.mark.parametrize(
+    ["value", "expected"],
+    [
+        pytest.param(
+            None,
+            {"date": "2020-01-01", "date-time": "2020-01-01T01:01:01Z"},
+            id="default",
+        ),
+        pytest.param(
+            "2024-02-29T10:20:30",
+            {"date": "2024-02-29", "date-time": "2024-02-29T10:20:30Z"},
+            id="naive",
+        ),
+        pytest.param(
+            "2024-02-29T10:20:30+02:00",
+            {"date": "2024-02-29", "date-time": "2024-02-29T08:20:30Z"},
+            id="aware",
+        ),
+        pytest.param(
+            "2024-02-29T10:20:30Z",
+            {"date": "2024-02-29", "date-time": "2024-02-29T10:20:30Z"},
+            id="utc",
+        ),
+        pytest.param(
+            datetime.datetime(2024, 2, 29, 10, 20, 30),
+            {"date": "2024-02-29", "date-time": "2024-02-29T10:20:30Z"},
+            id="datetime",
+        ),
+    ],
+)
+def test_example_datetime(example_datetime, value, expected):
+    example_datetime(value)
+
+    assert (
+        example_from_schema(
+            {
+                "type": "object",
+                "properties": {
+                    "date": {"type": "string", "format": "date"},
+                    "date-time": {"type": "string", "format": "date-time"},
+                },
+            }
+        )
+        == expected
+    )
+
+
+def test_example_datetime_source_date_epoch(example_datetime, monkeypatch):
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1709202030")
+
+    assert schema_utils.get_example_date() == "2024-02-29"
+    assert schema_utils.get_example_datetime() == "2024-02-29T10:20:30Z"
+
+    # Explicitly set value takes precedence over the environment variable.
+    example_datetime("2020-02-02T02:02:02Z")
+
+    assert schema_utils.get_example_date() == "2020-02-02"
+    assert schema_utils.get_example_datetime() == "2020-02-02T02:02:02Z"
+
+
+@pytest.mark.parametrize("module", [openapi30, openapi31])
+def test_example_datetime_shared(example_datetime, module):
+    example_datetime("2024-02-29T10:20:30Z")
+
+    assert module._parse_schema(
+        {
+            "type": "object",
+            "properties": {
+                "date": {"type": "string", "format": "date"},
+                "date-time": {"type": "string", "format": "date-time"},
+            },
+        },
+        method=None,
+    ) == {"date": "2024-02-29", "date-time": "2024-02-29T10:20:30Z"}
+
+
+@pytest.mark.parametrize(
+    ["schema", "expected"],
+    [
+        pytest.param(
+            {
+                "allOf": [
+                    {"type": "object", "properties": {"a": {"type": "string"}}},
+                    {"description": "x"},
+                ]
+            },
+            {"a": "string"},
+            id="object_and_any",
+        ),
+        pytest.param({"allOf": [{"type": "string"}]}, "string", id="string"),
+    ],
+)
+def test_generate_example_from_schema_all_of(schema, expected):
+    """Examples that are not objects are not mistaken for truncated ones."""
+
+    assert example_from_schema(schema) == expected
+
+
+_WIDE_SCHEMA = {
+    "type": "object",
+    "properties": {f"prop{i}": {"type": "integer"} for i in range(2000)},
+}
+
+_DEEP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "a": {
+            "type": "object",
+            "properties": {
+                "b": {"type": "object", "properties": {"c": {"type": "integer"}}},
+                "d": {"type": "array", "items": {"type": "integer"}},
+            },
+        },
+        "e": {"type": "integer"},
+    },
+}
+
+_ALL_OF_SCHEMA = {
+    "allOf": [
+        {"type": "object", "properties": {"name": {"type": "string"}}},
+        {"type": "object", "properties": {"tag": {"type": "string"}}},
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    ["schema", "budget", "expected"],
+    [
+        pytest.param(
+            _WIDE_SCHEMA,
+            schema_utils.Budget(max_properties=2),
+            {"prop0": 1, "prop1": 1, "...": "..."},
+            id="max_properties",
+        ),
+        pytest.param(
+            _DEEP_SCHEMA,
+            schema_utils.Budget(max_depth=2),
+            {"a": {"b": "...", "d": "..."}, "e": 1},
+            id="max_depth",
+        ),
+        pytest.param(
+            _DEEP_SCHEMA,
+            schema_utils.Budget(max_depth=0),
+            "...",
+            id="max_depth_root",
+        ),
+        pytest.param(
+            {"type": "array", "minItems": 5000, "items": {"type": "integer"}},
+            schema_utils.Budget(max_items=3),
+            [1, 1, 1, "..."],
+            id="max_items",
+        ),
+        pytest.param(
+            _WIDE_SCHEMA,
+            schema_utils.Budget(max_example_bytes=40),
+            {"prop0": 1, "prop1": 1, "prop2": 1, "prop3": 1, "prop4": 1, "...": "..."},
+            id="max_example_bytes",
+        ),
+        pytest.param(
+            {"type": "string", "minLength": 10**9},
+            schema_utils.Budget(max_example_bytes=10),
+            "stringstri...",
+            id="max_example_bytes_string",
+        ),
+        pytest.param(
+            {"type": "array", "minItems": 10, "items": {"type": "string"}},
+            schema_utils.Budget(max_example_bytes=40),
+            ["string"] * 5 + ["..."],
+            id="max_example_bytes_array",
+        ),
+        pytest.param(
+            _ALL_OF_SCHEMA,
+            schema_utils.Budget(max_depth=0),
+            "...",
+            id="max_depth_all_of",
+        ),
+        pytest.param(
+            _ALL_OF_SCHEMA,
+            schema_utils.Budget(max_example_bytes=10),
+            {"name": "string", "...": "..."},
+            id="max_example_bytes_all_of",
+        ),
+        pytest.param(
+            _WIDE_SCHEMA,
+            schema_utils.Budget(),
+            {f"prop{i}": 1 for i in range(2000)},
+            id="unlimited",
+        ),
+    ],
+)
+def test_generate_example_from_schema_budget(schema, budget, expected):
+    assert example_from_schema(schema, budget) == expected
+
+
+@pytest.mark.parametrize("module", [openapi30, openapi31])
+@pytest.mark.parametrize(
+    ["schema", "budget", "expected"],
+    [
+        pytest.param(
+            _WIDE_SCHEMA,
+            schema_utils.Budget(max_properties=2),
+            {"prop0": 1, "prop1": 1, "...": "..."},
+            id="max_properties",
+        ),
+        pytest.param(
+            _DEEP_SCHEMA,
+            schema_utils.Budget(max_depth=2),
+            {"a": {"b": "...", "d": "..."}, "e": 1},
+            id="max_depth",
+        ),
+        pytest.param(
+            {
+                "type": "array",
+                "items": {"oneOf": [{"type": "integer"}] * 5000},
+            },
+            schema_utils.Budget(max_items=3),
+            [1, 1, 1, "..."],
+            id="max_items",
+        ),
+        pytest.param(
+            _WIDE_SCHEMA,
+            schema_utils.Budget(max_example_bytes=40),
+            {"prop0": 1, "prop1": 1, "prop2": 1, "prop3": 1, "prop4": 1, "...": "..."},
+            id="max_example_bytes",
+        ),
+    ],
+)
+def test_parse_schema_budget(module, schema, budget, expected):
+    assert (
+        module._parse_schema(schema, None, schema_utils.get_spending(budget))
+        == expected
+    )
+
+
+def test_budget_from_options():
+    assert schema_utils.Budget.from_options(
+        {"max-properties": 1, "max-depth": 2, "max-items": None, "paths": ["/"]}
+    ) == schema_utils.Budget(max_properties=1, max_depth=2)
@@ -0,0 +1,166 @@
+"""Tests client-side search index of operations."""
+
+import json
+import textwrap
+
+import pytest
+
+from sphinx.application import Sphinx
+
+from sphinxcontrib.openapi import _search
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /pets:
+        get:
+          operationId: listPets
+          summary: List all pets
+          tags: [pets]
+          responses:
+            '200':
+              description: ok
+      /pets/{petId}:
+        get:
+          operationId: showPetById
+          summary: Info for a specific pet
+          tags: [pets]
+          responses:
+            '200':
+              description: ok
+      /users:
+        post:
+          operationId: createUser
+          summary: Create a user
+          responses:
+            '201':
+              description: created
+""")
+
+
+def _lookup(manifest, shards, word):
+    """Look a word up the way the browser script does."""
+
+    shard = shards[manifest["shards"][word[: manifest["prefixLength"]]]]
+    return sorted(
+        {
+            shard["operations"][i][4]
+            for key, postings in zip(shard["keys"], shard["postings"])
+            if key.startswith(word)
+            for i in postings
+        }
+    )
+
+
+def test_build_index():
+    manifest, shards = _search.build_index(
+        [
+            ("get", "/pets", "listPets", ["pets"], "List all pets", "a#1"),
+            ("post", "/users", "createUser", ["user-admin"], "Create a user", "b#2"),
+        ]
+    )
+
+    assert manifest["prefixLength"] == 2
+    assert len(shards) == len(set(manifest["shards"].values()))
+
+    for prefix, i in manifest["shards"].items():
+        assert shards[i]["keys"] == sorted(shards[i]["keys"])
+        assert all(key.startswith(prefix) for key in shards[i]["keys"])
+
+    assert _lookup(manifest, shards, "get") == ["a#1"]
+    assert _lookup(manifest, shards, "/pets") == ["a#1"]
+    assert _lookup(manifest, shards, "listpets") == ["a#1"]
+    assert _lookup(manifest, shards, "pe") == ["a#1"]
+    assert _lookup(manifest, shards, "admin") == ["b#2"]
+    assert _lookup(manifest, shards, "create") == ["b#2"]
+    assert _lookup(manifest, shards, "us") == ["b#2"]
+
+
+def test_build_index_operations_stored_once_per_shard():
+    manifest, shards = _search.build_index(
+        [("get", "/pets", "getPets", ["pets"], "Get pets", "a#1")]
+    )
+
+    shard = shards[manifest["shards"]["ge"]]
+    assert shard["keys"] == ["get", "getpets"]
+    assert shard["postings"] == [[0], [0]]
+    assert shard["operations"] == [["get", "/pets", "getPets", "Get pets", "a#1"]]
+
+
+def test_build_index_empty():
+    assert _search.build_index([]) == ({"prefixLength": 2, "shards": {}}, [])
+
+
+@pytest.fixture(scope="function")
+def build(tmpdir):
+    src = tmpdir.ensure("src", dir=True)
+    out = tmpdir.ensure("out", dir=True)
+
+    src.join("spec.yml").write_text(_SPEC, encoding="utf-8")
+    src.join("index.rst").write_text(
+        ".. openapi:: spec.yml\n   :paths:\n      /pets\n      /pets/{petId}\n",
+        encoding="utf-8",
+    )
+    src.join("users.rst").write_text(
+        "Users\n=====\n\n.. openapi:: spec.yml\n   :paths:\n      /users\n",
+        encoding="utf-8",
+    )
+
+    def build(search_index):
+        src.join("conf.py").write_text(
+            textwrap.dedent("""
+            extensions = ['sphinxcontrib.openapi']
+            master_doc = 'index'
+            exclude_patterns = ['*.yml']
+            openapi_search_index = %r
+        """ % search_index),
+            encoding="utf-8",
+        )
+
+        Sphinx(
+            srcdir=src.strpath,
+            confdir=src.strpath,
+            outdir=out.strpath,
+            doctreedir=out.join(".doctrees").strpath,
+            buildername="html",
+        ).build()
+
+        index_dir = out.join("_static", "openapi-search")
+        if not index_dir.check():
+            return None
+
+        manifest = json.loads(index_dir.join("index.json").read_text("utf-8"))
+        shards = [
+            json.loads(index_dir.join("%d.json" % i).read_text("utf-8"))
+            for i in range(len(set(manifest["shards"].values())))
+        ]
+        return manifest, shards
+
+    yield build, out
+
+
+def test_search_index(build):
+    build, out = build
+    manifest, shards = build(True)
+
+    assert out.join("_static", "openapi-search.js").check()
+    assert "openapi-search.js" in out.join("index.html").read_text("utf-8")
+
+    assert _lookup(manifest, shards, "pets") == [
+        "index.html#get--pets",
+        "index.html#get--pets-petId",
+    ]
+    assert _lookup(manifest, shards, "showpetbyid") == ["index.html#get--pets-petId"]
+    assert _lookup(manifest, shards, "post") == ["users.html#post--users"]
+    assert _lookup(manifest, shards, "user") == ["users.html#post--users"]
+
+
+def test_search_index_disabled(build):
+    build, out = build
+
+    assert build(False) is None
+    assert not out.join("_static", "openapi-search.js").check()
+    assert "openapi-search.js" not in out.join("index.html").read_text("utf-8")
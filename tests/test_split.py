@@ -0,0 +1,185 @@
+"""Tests generation of documents from split specs."""
+
+import io
+import textwrap
+
+import pytest
+
+from sphinx.application import Sphinx
+from sphinx.errors import ExtensionError
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    tags:
+      - name: pets
+        description: Everything about pets.
+    paths:
+      /pets:
+        get:
+          summary: {summary}
+          tags: [pets]
+          responses:
+            '200':
+              description: ok
+        post:
+          summary: Create a pet
+          tags: [pets]
+          responses:
+            '201':
+              description: created
+      /users:
+        get:
+          summary: List users
+          responses:
+            '200':
+              description: ok
+""")
+
+
+@pytest.fixture(scope="function")
+def build(tmpdir):
+    src = tmpdir.ensure("src", dir=True)
+    out = tmpdir.ensure("out", dir=True)
+
+    src.join("index.rst").write_text(
+        "Index\n=====\n\n.. toctree::\n\n   api/index\n", encoding="utf-8"
+    )
+
+    def build(by="operation", summary="List pets", parallel=0):
+        src.join("spec.yml").write_text(_SPEC.format(summary=summary), encoding="utf-8")
+        src.join("conf.py").write_text(
+            textwrap.dedent("""
+            extensions = ['sphinxcontrib.openapi']
+            master_doc = 'index'
+            openapi_split_specs = {
+                'api': {
+                    'spec': 'spec.yml',
+                    'by': %r,
+                    'options': {'examples': True},
+                },
+            }
+        """ % by),
+            encoding="utf-8",
+        )
+
+        status = io.StringIO()
+        Sphinx(
+            srcdir=src.strpath,
+            confdir=src.strpath,
+            outdir=out.strpath,
+            doctreedir=out.join(".doctrees").strpath,
+            buildername="html",
+            status=status,
+            parallel=parallel,
+        ).build()
+        return status.getvalue()
+
+    yield build, src, out
+
+
+def test_split_by_operation(build):
+    build, src, out = build
+    build()
+
+    assert sorted(path.basename for path in src.join("api").listdir()) == [
+        "get--pets.rst",
+        "get--users.rst",
+        "index.rst",
+        "post--pets.rst",
+    ]
+    assert src.join("api", "index.rst").read_text("utf-8").endswith(textwrap.dedent("""\
+            An example spec
+            ===============
+
+            .. toctree::
+               :maxdepth: 1
+
+               get--pets
+               post--pets
+               get--users
+        """))
+    assert (
+        src.join("api", "post--pets.rst")
+        .read_text("utf-8")
+        .endswith(textwrap.dedent("""\
+            POST /pets
+            ==========
+
+            .. openapi:: /spec.yml
+               :paths:
+                  /pets
+               :methods:
+                  post
+               :examples:
+        """))
+    )
+
+    rendered_html = out.join("api", "post--pets.html").read_text("utf-8")
+    assert "Create a pet" in rendered_html
+    assert "List pets" not in rendered_html
+
+
+def test_split_by_tag(build):
+    build, src, out = build
+    build(by="tag")
+
+    assert sorted(path.basename for path in src.join("api").listdir()) == [
+        "default.rst",
+        "index.rst",
+        "pets.rst",
+    ]
+
+    rendered_html = out.join("api", "pets.html").read_text("utf-8")
+    assert "Everything about pets." in rendered_html
+    assert "List pets" in rendered_html
+    assert "Create a pet" in rendered_html
+    assert "List users" not in rendered_html
+
+
+def test_split_changed_operation(build):
+    build, src, out = build
+
+    assert "5 added, 0 changed, 0 removed" in build()
+    assert "0 added, 0 changed, 0 removed" in build()
+
+    # Only the document of the changed operation is read again, even though
+    # the spec file has changed.
+    assert "0 added, 1 changed, 0 removed" in build(summary="List all pets")
+    assert "List all pets" in out.join("api", "get--pets.html").read_text("utf-8")
+
+
+def test_split_removed_documents(build):
+    build, src, out = build
+    src.ensure("api", dir=True).join("notes.rst").write_text(
+        "Notes\n=====\n", encoding="utf-8"
+    )
+
+    build(by="operation")
+    build(by="tag")
+
+    # Documents generated before are removed, while the ones written by hand
+    # are left alone.
+    assert sorted(path.basename for path in src.join("api").listdir()) == [
+        "default.rst",
+        "index.rst",
+        "notes.rst",
+        "pets.rst",
+    ]
+
+
+def test_split_parallel(build):
+    build, src, out = build
+    build(parallel=2)
+
+    for name in ["get--pets", "post--pets", "get--users"]:
+        assert out.join("api", name + ".html").check()
+
+
+def test_split_invalid(build):
+    build, src, out = build
+
+    with pytest.raises(ExtensionError, match="must be split by one of: operation, tag"):
+        build(by="path")
@@ -0,0 +1,345 @@
+"""Tests validation of specs."""
+
+import os
+import textwrap
+
+import py
+import pytest
+import yaml
+
+from sphinxcontrib.openapi import _instrumentation, _validate, utils
+
+# A meta-schema that tells only whether the spec has a title.
+_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "required": ["info"],
+    "properties": {
+        "info": {
+            "type": "object",
+            "required": ["title"],
+            "properties": {"title": {"type": "string"}},
+        },
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def schemas():
+    """Reset meta-schemas."""
+
+    yield
+    _validate.set_schemas({})
+
+
+def _load(text):
+    return yaml.safe_load(textwrap.dedent(text))
+
+
+def test_valid(testspec):
+    """Test specs are structurally valid."""
+
+    _, spec = testspec
+    assert _validate.validate(spec) == []
+
+
+@pytest.mark.parametrize(
+    ["text", "errors"],
+    [
+        pytest.param(
+            """
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            """,
+            [("/", "'paths' is a required property")],
+            id="paths-required",
+        ),
+        pytest.param(
+            """
+            openapi: 3.1.0
+            info: {title: Pets, version: "1.0"}
+            webhooks: {}
+            """,
+            [],
+            id="paths-optional",
+        ),
+        pytest.param(
+            """
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets: [get]
+            """,
+            [("/paths/~1pets", "['get'] is not of type 'object'")],
+            id="path-item",
+        ),
+        pytest.param(
+            """
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets:
+                get:
+                  summary: 42
+            """,
+            [
+                ("/paths/~1pets/get/summary", "42 is not of type 'string'"),
+                ("/paths/~1pets/get", "'responses' is a required property"),
+            ],
+            id="operation",
+        ),
+        pytest.param(
+            """
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets:
+                parameters:
+                  - $ref: '#/components/parameters/limit'
+                  - in: query
+                get:
+                  parameters:
+                    - name: kind
+                      in: query
+                      schema: string
+                  responses: {}
+            """,
+            [
+                ("/paths/~1pets/parameters/1", "'name' is a required property"),
+                (
+                    "/paths/~1pets/parameters/1",
+                    "'schema' or 'content' is a required property",
+                ),
+                (
+                    "/paths/~1pets/get/parameters/0/schema",
+                    "'string' is not of type 'object'",
+                ),
+            ],
+            id="parameters",
+        ),
+        pytest.param(
+            """
+            swagger: "2.0"
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets:
+                post:
+                  parameters:
+                    - name: pet
+                      in: body
+                  responses:
+                    '201':
+                      description: created
+                      schema: object
+            """,
+            [
+                ("/paths/~1pets/post/parameters/0", "'schema' is a required property"),
+                (
+                    "/paths/~1pets/post/responses/201/schema",
+                    "'object' is not of type 'object'",
+                ),
+            ],
+            id="oas2",
+        ),
+        pytest.param(
+            """
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets:
+                post:
+                  requestBody:
+                    description: a pet
+                  responses:
+                    '201':
+                      description: created
+                      content:
+                        application/json:
+                          examples: [{value: 42}]
+            """,
+            [
+                ("/paths/~1pets/post/requestBody", "'content' is a required property"),
+                (
+                    "/paths/~1pets/post/responses/201/content/application~1json/examples",
+                    "[{'value': 42}] is not of type 'object'",
+                ),
+            ],
+            id="bodies",
+        ),
+        pytest.param(
+            """
+            openapi: 2.0.0
+            info: {title: Pets, version: "1.0"}
+            paths: {}
+            """,
+            [("/", "neither 'swagger: \"2.0\"' nor 'openapi: 3.0.x/3.1.x' is set")],
+            id="version",
+        ),
+    ],
+)
+def test_structural(text, errors):
+    """Structural errors are reported along with where they are."""
+
+    assert _validate.validate(_load(text)) == errors
+
+
+def test_full():
+    """Specs are validated against meta-schemas of their versions."""
+
+    _validate.set_schemas({"3.0": _SCHEMA})
+    spec = _load("""
+        openapi: 3.0.3
+        info: {version: "1.0"}
+        paths:
+          /pets:
+            get: {}
+        """)
+
+    assert _validate.validate(spec, "full") == [
+        ("/paths/~1pets/get", "'responses' is a required property"),
+        ("/info", "'title' is a required property"),
+    ]
+
+
+def test_full_cached():
+    """Specs of the same content are validated once."""
+
+    _validate.set_schemas({"3.0": _SCHEMA})
+    _instrumentation.reset()
+
+    for title in ("Pets", "Pets", "Cats"):
+        spec = _load(f"""
+            openapi: 3.0.3
+            info: {{title: {title}, version: "1.0"}}
+            paths: {{}}
+            """)
+        assert _validate.validate(spec, "full") == []
+
+    assert _instrumentation.counters["validate_spec"] == 2
+
+
+def test_full_normalized():
+    """The extension's own data is not a part of a spec."""
+
+    _validate.set_schemas(
+        {
+            "3.0": dict(
+                _SCHEMA,
+                additionalProperties=False,
+                patternProperties={"^(openapi|info|paths)$": {}},
+            )
+        }
+    )
+    spec = utils.normalize_spec(_load("""
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths: {}
+            """))
+
+    assert utils.is_normalized(spec)
+    assert _validate.validate(spec, "full") == []
+
+
+def test_full_bundled():
+    """Meta-schemas of openapi-spec-validator are used, if installed."""
+
+    pytest.importorskip("openapi_spec_validator")
+    spec = _load("""
+        openapi: 3.0.3
+        info: {title: Pets, version: "1.0"}
+        paths:
+          /pets/{kind}:
+            get:
+              parameters:
+                - name: kind
+                  in: path
+                  schema: {type: string}
+              responses:
+                '200':
+                  description: ok
+        """)
+
+    assert _validate.validate(spec, "full") != []
+
+    spec["paths"]["/pets/{kind}"]["get"]["parameters"][0]["required"] = True
+    assert _validate.validate(spec, "full") == []
+
+
+def test_full_no_schema(monkeypatch, caplog):
+    """Specs are validated structurally if there's no meta-schema."""
+
+    monkeypatch.setattr(_validate, "_bundled_schemas", None)
+    spec = _load("""
+        openapi: 3.0.3
+        paths: {}
+        """)
+
+    assert _validate.validate(spec, "full") == []
+    assert "no meta-schema of OpenAPI 3.0" in caplog.text
+
+
+def test_unknown_level():
+    """Only known levels are accepted."""
+
+    with pytest.raises(ValueError, match="Unknown validation level 'partial'"):
+        _validate.validate({}, "partial")
+
+
+def test_check():
+    """Errors are raised, and valid specs are marked as such."""
+
+    spec = _load("""
+        openapi: 3.0.3
+        info: {title: Pets, version: "1.0"}
+        paths:
+          /pets:
+            get: {}
+        """)
+
+    with pytest.raises(ValueError) as excinfo:
+        _validate.check(spec, "structural", "pets.yml")
+    assert str(excinfo.value) == (
+        "pets.yml is not a valid OpenAPI spec:\n"
+        "  /paths/~1pets/get: 'responses' is a required property"
+    )
+
+    spec["paths"]["/pets"]["get"]["responses"] = {}
+    _validate.check(spec, "structural", "pets.yml")
+    assert utils.get_validation_level(spec) == "structural"
+
+    # Validation is off.
+    _validate.check({}, False, "pets.yml")
+
+
+def test_check_many_errors():
+    """Only a few errors are reported."""
+
+    spec = {"openapi": "3.0.3", "paths": {f"/{i}": {"get": {}} for i in range(12)}}
+
+    with pytest.raises(ValueError) as excinfo:
+        _validate.check(spec, "structural", "pets.yml")
+    assert str(excinfo.value).splitlines()[-1] == "  ... and 2 more"
+
+
+@pytest.mark.parametrize("level", ["structural", "full"])
+def test_directive(tmpdir, run_sphinx, level):
+    """Invalid specs are reported before they are rendered."""
+
+    spec = os.path.join(os.path.dirname(__file__), "testspecs", "v3.0", "petstore.yaml")
+    py.path.local(spec).copy(tmpdir.join("src", "test-spec.yml"))
+    run_sphinx("test-spec.yml", conf={"openapi_validate": level})
+
+    tmpdir.join("src", "test-spec.yml").write_text(
+        textwrap.dedent("""
+            openapi: 3.0.3
+            info: {title: Pets, version: "1.0"}
+            paths:
+              /pets:
+                get:
+                  parameters: [{in: query}]
+                  responses: {}
+            """),
+        "utf-8",
+    )
+    with pytest.raises(ValueError, match="test-spec.yml is not a valid OpenAPI spec"):
+        run_sphinx("test-spec.yml", conf={"openapi_validate": level})
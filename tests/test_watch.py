@@ -0,0 +1,167 @@
+"""Tests re-rendering of specs on changes."""
+
+import os
+import textwrap
+
+from sphinxcontrib.openapi import _watch, renderers, utils
+from sphinxcontrib.openapi.__main__ import _render_changes, main
+
+_SPEC = textwrap.dedent("""
+    openapi: 3.0.3
+    info:
+      title: An example spec
+      version: "1.0"
+    paths:
+      /pets:
+        get:
+          summary: {summary}
+          responses:
+            '200':
+              description: ok
+              content:
+                application/json:
+                  schema:
+                    $ref: 'pet.yml'
+        post:
+          summary: Create a pet
+          responses:
+            '201':
+              description: created
+""")
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    # Bump modification time explicitly, since file systems may have coarse
+    # timestamps.
+    os.utime(path.strpath, ns=(mtime, mtime))
+
+
+def _make_spec(summary="List pets"):
+    return utils.normalize_spec(
+        {
+            "openapi": "3.0.3",
+            "info": {"title": "An example spec", "version": "1.0"},
+            "paths": {
+                "/pets": {
+                    "get": {
+                        "summary": summary,
+                        "responses": {"200": {"description": "ok"}},
+                    },
+                    "post": {
+                        "summary": "Create a pet",
+                        "responses": {"201": {"description": "created"}},
+                    },
+                },
+            },
+        }
+    )
+
+
+def test_render_cache_reuses_unchanged_operations():
+    renderer = renderers.HttpdomainOldRenderer(None, {})
+    renderer.render_cache = utils.RenderCache()
+
+    markup = list(renderer.render_restructuredtext_markup(_make_spec()))
+    renderer.render_cache.collect()
+    assert (renderer.render_cache.hits, renderer.render_cache.misses) == (0, 2)
+
+    # A whole new spec with one operation changed.
+    changed = list(renderer.render_restructuredtext_markup(_make_spec("Pets")))
+    renderer.render_cache.collect()
+    assert (renderer.render_cache.hits, renderer.render_cache.misses) == (1, 3)
+
+    assert changed == list(
+        renderers.HttpdomainOldRenderer(None, {}).render_restructuredtext_markup(
+            _make_spec("Pets")
+        )
+    )
+    assert changed != markup
+
+
+def test_watch_renders_on_changes(tmpdir):
+    spec = tmpdir.join("spec.yml")
+    _write(spec, "a", 10**9)
+    calls = []
+
+    def render():
+        calls.append(spec.read_text("utf-8"))
+        if len(calls) == 1:
+            _write(spec, "b", 2 * 10**9)
+        return [spec.strpath]
+
+    _watch.watch(
+        render, paths=[spec.strpath], interval=0, is_running=lambda: len(calls) < 2
+    )
+
+    # The spec is changed while it's rendered the first time, and the change
+    # is not missed.
+    assert calls == ["a", "b"]
+
+
+def test_watch_survives_errors(tmpdir):
+    spec = tmpdir.join("spec.yml")
+    _write(spec, "a", 10**9)
+    calls = []
+
+    def render():
+        calls.append(spec.read_text("utf-8"))
+        if len(calls) == 1:
+            _write(spec, "b", 2 * 10**9)
+            raise ValueError("invalid spec")
+        return [spec.strpath]
+
+    _watch.watch(
+        render, paths=[spec.strpath], interval=0, is_running=lambda: len(calls) < 2
+    )
+    assert calls == ["a", "b"]
+
+
+def test_watch_stops(tmpdir):
+    calls = []
+
+    def render():
+        calls.append(None)
+        return []
+
+    _watch.watch(render, interval=0, is_running=lambda: False)
+    assert calls == [None]
+
+
+def test_render_changes(tmpdir):
+    spec = tmpdir.join("spec.yml")
+    _write(spec, _SPEC.format(summary="List pets"), 10**9)
+    _write(tmpdir.join("pet.yml"), "type: object\n", 10**9)
+
+    class Options:
+        input = spec.strpath
+        encoding = "utf-8"
+        output = tmpdir.join("out.rst").open("w+", encoding="utf-8")
+
+    openapi_options = {"uri": "file://%s" % spec.strpath}
+    state = {}
+
+    paths = _render_changes(Options, openapi_options, state)
+    assert sorted(paths) == [tmpdir.join("pet.yml").strpath, spec.strpath]
+    assert "List pets" in tmpdir.join("out.rst").read_text("utf-8")
+
+    _write(spec, _SPEC.format(summary="Pets"), 2 * 10**9)
+    _render_changes(Options, openapi_options, state)
+    Options.output.close()
+
+    # The output is rewritten rather than appended to, and only the changed
+    # operation is rendered again.
+    rendered = tmpdir.join("out.rst").read_text("utf-8")
+    assert "Pets" in rendered
+    assert "List pets" not in rendered
+    assert rendered.count(".. http:post:: /pets") == 1
+    assert state["renderer"].render_cache.hits == 1
+
+
+def test_main(tmpdir):
+    spec = tmpdir.join("spec.yml")
+    spec.write_text(_SPEC.format(summary="List pets"), encoding="utf-8")
+    tmpdir.join("pet.yml").write_text("type: object\n", encoding="utf-8")
+
+    main(["-i", spec.strpath, "-o", tmpdir.join("out.rst").strpath])
+    assert ".. http:get:: /pets" in tmpdir.join("out.rst").read_text("utf-8")